@@ -0,0 +1,45 @@
+import tracemalloc
+
+import pytest
+
+from decks import DECKS, load_deck
+
+
+@pytest.fixture(scope='session', params=DECKS)
+def deck(request):
+    return load_deck(request.param)
+
+
+def run_benchmark(benchmark, function, setup=None, rounds=5):
+    """Time function and record its peak memory. Every group builds its own
+    surface cache, so each round starts cold.
+
+    Parameters
+    ----------
+    benchmark : pytest_benchmark fixture
+    function : callable
+        function to time, called with the value returned by setup if given
+    setup : callable, optional
+        untimed preparation, run before each round, by default None
+    rounds : int, optional
+        number of timed rounds, by default 5
+
+    Returns
+    -------
+    object
+        value returned by the last call of function
+    """
+
+    def _setup():
+        if setup is None:
+            return (), {}
+        return (setup(),), {}
+
+    args, kwargs = _setup()
+    tracemalloc.start()
+    function(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    benchmark.extra_info['peak_memory_mib'] = peak / 2**20
+
+    return benchmark.pedantic(function, setup=_setup, rounds=rounds, iterations=1)
@@ -0,0 +1,28 @@
+"""Import the reference decks of reactors/ as modules"""
+import importlib.util
+import sys
+from pathlib import Path
+
+REACTORS = Path(__file__).resolve().parents[1] / 'reactors'
+
+DECKS = ('arc_class', 'iter_class')
+
+
+def load_deck(name):
+    """Import reactors/<name>/openmc_model.py as a module. Both decks import
+    their own component_nodes, so it is removed from sys.modules before and
+    after loading each of them."""
+
+    deck_dir = REACTORS / name
+    sys.path.insert(0, str(deck_dir))
+    sys.modules.pop('component_nodes', None)
+    try:
+        spec = importlib.util.spec_from_file_location(
+            f'{name}_openmc_model', deck_dir / 'openmc_model.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(deck_dir))
+        sys.modules.pop('component_nodes', None)
+
+    return module
@@ -0,0 +1,76 @@
+"""Build-time benchmarks of the reactor decks in reactors/
+
+Run with ``pytest benchmarks --benchmark-only`` and compare against a
+saved run with ``--benchmark-autosave`` / ``--benchmark-compare``.
+"""
+import openmc
+
+import tokamak_radiation_environment as tre
+from conftest import run_benchmark
+
+
+def test_core_group(benchmark, deck):
+    run_benchmark(benchmark, lambda: tre.components.core_group(**deck.core_parameters))
+
+
+def test_pfcoil_group(benchmark, deck):
+
+    def build():
+        return [tre.components.pfcoil_group(**parameters)
+                for parameters in deck.pfcoil_parameters.values()]
+
+    run_benchmark(benchmark, build)
+
+
+def test_tfcoil_group(benchmark, deck):
+    run_benchmark(benchmark, lambda: tre.components.tfcoil_group(**deck.tfcoil_parameters))
+
+
+def test_cells(benchmark, deck):
+
+    def cells(components):
+        return [component.cell for component in components.values()]
+
+    run_benchmark(benchmark, cells, setup=deck.build_components)
+
+
+def test_enclosure(benchmark, deck):
+
+    def setup():
+        reactor = deck.build_reactor()
+        reactor.cells
+        return reactor
+
+    run_benchmark(benchmark, lambda reactor: reactor.root_cell, setup=setup)
+
+
+def test_geometry(benchmark, deck):
+
+    def setup():
+        return deck.build_reactor().root_cell
+
+    def geometry(root_cell):
+        geometry = openmc.Geometry(root=[root_cell])
+        geometry.merge_surfaces = True
+        return geometry
+
+    run_benchmark(benchmark, geometry, setup=setup)
+
+
+def test_export_xml(benchmark, deck, tmp_path):
+
+    def setup():
+        return deck.build_reactor().geometry
+
+    run_benchmark(benchmark, lambda geometry: geometry.export_to_xml(
+        tmp_path / 'geometry.xml'), setup=setup)
+
+
+def test_build_model(benchmark, deck, tmp_path):
+
+    def build():
+        model = deck.build_model()
+        model.export_to_model_xml(tmp_path / 'model.xml')
+        return model
+
+    run_benchmark(benchmark, build)
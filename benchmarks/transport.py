@@ -0,0 +1,141 @@
+"""Transport throughput benchmark of the reference decks in reactors/
+
+Each deck is run at a fixed number of particles and batches, with and
+without weight windows and for several thread counts. Particles/sec, the
+figure of merit of the TF coil tallies and the parallel efficiency are
+appended to a JSON history file, so that runs of different package
+versions can be compared.
+
+    python benchmarks/transport.py --particles 10000 --batches 10 --threads 1 2 4 8
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+from pathlib import Path
+
+import openmc
+
+import tokamak_radiation_environment as tre
+from decks import DECKS, REACTORS, load_deck
+
+HISTORY = Path(__file__).resolve().parent / 'transport_history.json'
+
+WEIGHT_WINDOWS = 'weight_windows.cadis.wwinp'
+
+TALLY_IDS = (3, 4)
+
+
+def _git_commit():
+
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REACTORS, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def fom_summary(statepoint, tally_id: int):
+    """Minimum, median and maximum figure of merit over the scored bins"""
+
+    fom = tre.results.tally_fom(statepoint, tally_id)['fom'].dropna()
+
+    if fom.empty:
+        return {'min': None, 'median': None, 'max': None}
+
+    return {'min': float(fom.min()), 'median': float(fom.median()), 'max': float(fom.max())}
+
+
+def run_case(deck, particles: int, batches: int, threads: int, weight_windows=None):
+    """Run a deck once and measure its transport throughput
+
+    Parameters
+    ----------
+    deck : module
+        deck loaded with decks.load_deck
+    particles : int
+        particles per batch
+    batches : int
+        number of batches
+    threads : int
+        number of OpenMP threads
+    weight_windows : str, optional
+        path to the weight windows wwinp file, by default None
+
+    Returns
+    -------
+    dict
+        particles/sec and figure of merit of the TF coil tallies
+    """
+
+    model = deck.build_model(weight_windows=weight_windows)
+    model.settings.particles = particles
+    model.settings.batches = batches
+    model.settings.statepoint = {'batches': [batches]}
+
+    with tempfile.TemporaryDirectory() as cwd:
+        statepoint = model.run(cwd=cwd, threads=threads, output=False)
+        with openmc.StatePoint(statepoint) as sp:
+            time = tre.results.simulation_time(sp)
+            fom = {tally_id: fom_summary(sp, tally_id) for tally_id in TALLY_IDS}
+
+    return {'particles_per_second': particles * batches / time,
+            'simulation_time': time,
+            'fom': fom}
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--decks', nargs='+', default=DECKS, choices=DECKS)
+    parser.add_argument('--particles', type=int, default=10000)
+    parser.add_argument('--batches', type=int, default=10)
+    parser.add_argument('--threads', type=int, nargs='+',
+                        default=sorted({1, 2, 4, 8, os.cpu_count()}))
+    parser.add_argument('--history', type=Path, default=HISTORY)
+    args = parser.parse_args(argv)
+
+    record = {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+              'version': tre.__version__,
+              'openmc_version': openmc.__version__,
+              'commit': _git_commit(),
+              'host': platform.node(),
+              'cpu_count': os.cpu_count(),
+              'particles': args.particles,
+              'batches': args.batches,
+              'cases': []}
+
+    for name in args.decks:
+        deck = load_deck(name)
+
+        ww_file = REACTORS / name / WEIGHT_WINDOWS
+        ww_modes = [None, ww_file] if ww_file.exists() else [None]
+
+        for weight_windows in ww_modes:
+            serial_rate = None
+            for threads in sorted(args.threads):
+                case = run_case(deck, args.particles, args.batches, threads,
+                                weight_windows=str(weight_windows) if weight_windows else None)
+
+                rate = case['particles_per_second']
+                if threads == 1:
+                    serial_rate = rate
+                case['parallel_efficiency'] = rate / \
+                    (threads * serial_rate) if serial_rate else None
+
+                case.update(deck=name, weight_windows=bool(weight_windows), threads=threads)
+                record['cases'].append(case)
+
+                print(f"{name:12s} ww={bool(weight_windows)!s:5s} threads={threads:3d} "
+                      f"{rate:12.1f} particles/s")
+
+    history = json.loads(args.history.read_text()) if args.history.exists() else []
+    history.append(record)
+    args.history.write_text(json.dumps(history, indent=2))
+
+
+if __name__ == '__main__':
+    main()
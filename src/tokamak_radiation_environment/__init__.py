@@ -1,4 +1,18 @@
+import tokamak_radiation_environment.activation
 import tokamak_radiation_environment.components
+import tokamak_radiation_environment.export
+import tokamak_radiation_environment.folding
+import tokamak_radiation_environment.launcher
 import tokamak_radiation_environment.materials
+import tokamak_radiation_environment.mesh
+import tokamak_radiation_environment.mgxs
+import tokamak_radiation_environment.optimization
+import tokamak_radiation_environment.radial_build
+import tokamak_radiation_environment.reactor
+import tokamak_radiation_environment.response
+import tokamak_radiation_environment.restart
+import tokamak_radiation_environment.results
+import tokamak_radiation_environment.spectra
+import tokamak_radiation_environment.tallies
 
 __version__ = '0.0.1-dev'
@@ -0,0 +1,160 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import openmc
+from tokamak_radiation_environment.results import source_rate
+
+# magnet and vacuum vessel cells of the reactor decks
+activation_patterns = ('*magnet*', 'vessel_*')
+
+
+def microxs_and_flux(model: openmc.Model, cells: dict, chain_file=None, energies='CASMO-70', **kwargs):
+    """One-group cross sections and flux of each cell from a single
+    transport run of the model
+
+    Parameters
+    ----------
+    model : openmc.Model
+        model whose geometry contains the cells
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.select(*activation_patterns)
+    chain_file : str, optional
+        depletion chain, by default openmc.config['chain_file']
+    energies : str or iterable of float, optional
+        group structure of the flux, by default 'CASMO-70'
+    **kwargs
+        passed to openmc.deplete.get_microxs_and_flux
+
+    Returns
+    -------
+    dict
+        component name -> (flux, openmc.deplete.MicroXS), flux in
+        particle-cm per source particle
+    """
+
+    # imported here, openmc.deplete loads the openmc shared library
+    import openmc.deplete
+
+    names = list(cells)
+    fluxes, micros = openmc.deplete.get_microxs_and_flux(
+        model, [cells[name] for name in names], chain_file=chain_file, energies=energies, **kwargs)
+
+    return {name: (flux, micro) for name, flux, micro in zip(names, fluxes, micros)}
+
+
+def _deplete(name, material, flux, micro, directory, timesteps, source_rates, chain_file,
+             timestep_units, integrator):
+    """Deplete one cell with the independent operator"""
+
+    import openmc.deplete
+
+    operator = openmc.deplete.IndependentOperator(
+        openmc.Materials([material]), [flux], [micro], chain_file=chain_file,
+        normalization_mode='source-rate')
+
+    path = Path(directory) / f"{name}.h5"
+    integrator_class = getattr(openmc.deplete, integrator)
+    integrator_class(operator, timesteps, source_rates=source_rates,
+                     timestep_units=timestep_units).integrate(path=str(path))
+
+    return path
+
+
+def deplete(cells: dict, volumes: dict, timesteps, microxs: dict, directory='activation',
+            source_rates=None, fusion_power: float = 500e6, chain_file=None, timestep_units: str = 'd',
+            integrator: str = 'PredictorIntegrator', max_workers: int = None):
+    """Activation of each cell with the independent depletion operator, from
+    the one-group cross sections and flux computed once by
+    microxs_and_flux. Cells are depleted in parallel processes, no
+    transport solve is needed per timestep.
+
+    Parameters
+    ----------
+    cells : dict
+        component name -> openmc.Cell filled with a material
+    volumes : dict
+        component name -> volume of the cell (cm3)
+    timesteps : iterable of float
+        depletion time steps, in timestep_units
+    microxs : dict
+        component name -> (flux, MicroXS), as returned by microxs_and_flux
+    directory : str or pathlib.Path, optional
+        directory of the <name>.h5 depletion results, by default 'activation'
+    source_rates : iterable of float, optional
+        neutron source rate (n/s) of each time step, zero for cooling steps,
+        by default the source rate of the fusion power for all time steps
+    fusion_power : float, optional
+        fusion power (W) used when source_rates is not given, by default 500e6
+    chain_file : str, optional
+        depletion chain, by default openmc.config['chain_file']
+    timestep_units : str, optional
+        units of the time steps, by default 'd'
+    integrator : str, optional
+        name of the openmc.deplete integrator, by default 'PredictorIntegrator'
+    max_workers : int, optional
+        number of processes, by default the number of cores
+
+    Returns
+    -------
+    dict
+        component name -> path to the openmc.deplete.Results file
+    """
+
+    timesteps = list(timesteps)
+    if source_rates is None:
+        source_rates = [source_rate(fusion_power)] * len(timesteps)
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for name, cell in cells.items():
+            # materials are shared between components, each cell is depleted
+            # with its own copy
+            material = cell.fill.clone()
+            material.name = name
+            material.depletable = True
+            material.volume = volumes[name]
+
+            flux, micro = microxs[name]
+            futures[name] = executor.submit(_deplete, name, material, flux, micro, directory,
+                                            timesteps, source_rates, chain_file, timestep_units,
+                                            integrator)
+
+        return {name: future.result() for name, future in futures.items()}
+
+
+def activation(model: openmc.Model, reactor, volumes: dict, timesteps, patterns=activation_patterns,
+               directory='activation', **kwargs):
+    """Activation of the magnet and vessel components: one transport run for
+    the cross sections and fluxes, then independent depletion of every
+    selected cell in parallel
+
+    Parameters
+    ----------
+    model : openmc.Model
+        model built from the reactor geometry
+    reactor : tokamak_radiation_environment.reactor.Reactor
+        reactor whose cells are depleted
+    volumes : dict
+        component name -> volume of the cell (cm3)
+    timesteps : iterable of float
+        depletion time steps, in days by default
+    patterns : iterable of str, optional
+        component name patterns of the cells to deplete, by default the
+        magnets and the vacuum vessel layers
+    directory : str or pathlib.Path, optional
+        directory of the depletion results, by default 'activation'
+    **kwargs
+        passed to deplete
+
+    Returns
+    -------
+    dict
+        component name -> path to the openmc.deplete.Results file
+    """
+
+    cells = reactor.select(*patterns)
+    microxs = microxs_and_flux(model, cells, chain_file=kwargs.get('chain_file'))
+
+    return deplete(cells, volumes, timesteps, microxs, directory=directory, **kwargs)
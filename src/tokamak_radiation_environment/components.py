@@ -1,10 +1,143 @@
 from abc import ABC
+import math
 import typing
 import openmc
 
 
-def _add_boundaries(region, angle):
-    """Include two reflective surfaces perpendicular to the xy plane
+def _sector_planes(angle, boundary_type='reflective'):
+    """Two planes perpendicular to the xy plane bounding the toroidal
+    sector
+
+    Parameters
+    ----------
+    angle : tuple of two floats
+        The first float is the angle in deg to cut with respect the x axis
+        The second float is the angle in deg to finish the cut
+    boundary_type : str, optional
+        'reflective' or 'periodic', by default 'reflective'
+
+    Returns
+    -------
+    tuple of two openmc.Plane
+        lower and upper bounds of the sector
+    """
+
+    lower_bound = openmc.YPlane(
+        y0=0, boundary_type=boundary_type).rotate([0, 0, angle[0]])
+    upper_bound = openmc.YPlane(
+        y0=0, boundary_type=boundary_type).rotate([0, 0, angle[1]])
+
+    if boundary_type == 'periodic':
+        lower_bound.periodic_surface = upper_bound
+
+    return lower_bound, upper_bound
+
+
+def _toroidal_planes(half_width: float, rotation_angle: float = 0):
+    """Planes bounding a TF coil layer in the toroidal direction"""
+
+    lower_bound = openmc.YPlane(
+        y0=-half_width).rotate((0, 0, rotation_angle))
+    upper_bound = openmc.YPlane(
+        y0=half_width).rotate((0, 0, rotation_angle))
+
+    return lower_bound, upper_bound
+
+
+def _midplane_bound(rotation_angle: float = 0):
+    """Plane containing the z axis and perpendicular to the TF coil midplane"""
+
+    return openmc.XPlane(x0=0).rotate((0, 0, rotation_angle))
+
+
+class SurfaceCache:
+    """Surfaces shared among the components of a single model. A component
+    uses the cache of the component it wraps, so that the surfaces it
+    shares with its neighbours (e.g. the sector planes) are created once per
+    model and released together with the components.
+    """
+
+    def __init__(self):
+        self._surfaces = {}
+
+    def _get(self, key, factory, *args):
+        """Surface stored under key, created by factory(*args) the first
+        time it is requested"""
+
+        if key not in self._surfaces:
+            self._surfaces[key] = factory(*args)
+
+        return self._surfaces[key]
+
+    def sector_planes(self, angle, boundary_type='reflective'):
+        """Planes bounding the toroidal sector, see _sector_planes"""
+
+        angle = tuple(float(a) for a in angle)
+
+        return self._get(('sector', angle, boundary_type), _sector_planes, angle, boundary_type)
+
+    def toroidal_planes(self, half_width: float, rotation_angle: float = 0):
+        """Planes bounding a TF coil layer in the toroidal direction"""
+
+        half_width, rotation_angle = float(half_width), float(rotation_angle)
+
+        return self._get(('toroidal', half_width, rotation_angle), _toroidal_planes, half_width, rotation_angle)
+
+    def midplane_bound(self, rotation_angle: float = 0):
+        """Plane containing the z axis and perpendicular to the TF coil
+        midplane"""
+
+        rotation_angle = float(rotation_angle)
+
+        return self._get(('midplane', rotation_angle), _midplane_bound, rotation_angle)
+
+    def polygon(self, nodes, offset: float = 0., basis: str = "rz"):
+        """openmc.model.Polygon described by the nodes and offset by the
+        given value, created once per (nodes, offset, basis)
+
+        Parameters
+        ----------
+        nodes : iterable of tuples
+            (r,z) coordinates describing a closed polygon
+        offset : float, optional
+            offset (cm), outwards if positive, inwards if negative, by default 0.
+        basis : str, optional
+            basis of the polygon, by default "rz"
+
+        Returns
+        -------
+        openmc.model.Polygon
+        """
+
+        nodes = tuple(tuple(float(x) for x in node) for node in nodes)
+        polygon = self._get(('polygon', nodes, basis), openmc.model.Polygon, nodes, basis)
+
+        return self.offset(polygon, offset)
+
+    def offset(self, polygon, offset: float):
+        """Offset of an openmc.model.Polygon, created once per (polygon, offset)
+
+        Parameters
+        ----------
+        polygon : openmc.model.Polygon
+            polygon to offset
+        offset : float
+            offset (cm), outwards if positive, inwards if negative
+
+        Returns
+        -------
+        openmc.model.Polygon
+        """
+
+        offset = float(offset)
+        if not offset:
+            return polygon
+
+        return self._get(('offset', polygon, offset), polygon.offset, offset)
+
+
+def _add_boundaries(region, angle, boundary_type='reflective', surface_cache=None):
+    """Include two reflective or periodic surfaces perpendicular to the xy plane
     in order to slice the tokamak according to the values given in the
     angle argument. The initial region has to be axysymmetric around z.
     The result is an openmc.Region that is symmetric 
@@ -17,6 +150,12 @@ def _add_boundaries(region, angle):
     angle : tuple of two floats
         The first float is the angle in deg to cut with respect the x axis
         The second float is the angle in deg to finish the cut
+    boundary_type : str, optional
+        'reflective' or 'periodic'. Periodic surfaces are paired with each
+        other (rotational periodicity around z), by default 'reflective'
+    surface_cache : SurfaceCache, optional
+        cache holding the sector planes of the model, by default None (new
+        planes are created)
 
     Returns
     -------
@@ -25,16 +164,113 @@ def _add_boundaries(region, angle):
     """
 
     if angle:
-        _lower_bound = openmc.YPlane(
-            y0=0, boundary_type='reflective').rotate([0, 0, angle[0]])
-        _upper_bound = openmc.YPlane(
-            y0=0, boundary_type='reflective').rotate([0, 0, angle[1]])
+        if surface_cache is None:
+            _lower_bound, _upper_bound = _sector_planes(angle, boundary_type)
+        else:
+            _lower_bound, _upper_bound = surface_cache.sector_planes(angle, boundary_type)
 
         region = region & +(_lower_bound) & -(_upper_bound)
 
     return region
 
 
+def sector_cell(cells, bounding_region, angle=None, boundary_type: str = 'reflective'):
+    """Place the component cells in a universe and fill a single toroidal
+    sector cell with it. The components have to be built without angle so
+    that the sector boundaries are applied only once, to the sector cell,
+    instead of being intersected with every component region. The space
+    not occupied by the components is filled with a void cell.
+
+    Parameters
+    ----------
+    cells : iterable of openmc.Cell
+        Component cells to place in the sector
+    bounding_region : openmc.Region
+        Outer region of the model (e.g. the inside of a vacuum sphere)
+    angle : tuple of two floats, optional
+        The first float is the angle in deg to cut with respect the x axis
+        The second float is the angle in deg to finish the cut, by default None
+    boundary_type : str, optional
+        boundary condition of the two surfaces slicing the tokamak, either
+        'reflective' or 'periodic', by default 'reflective'
+
+    Returns
+    -------
+    openmc.Cell
+        Root cell filled with the universe of the components
+    """
+
+    cells = list(cells)
+
+    void_region = openmc.Intersection([~(cell.region) for cell in cells])
+    void_cell = openmc.Cell(region=void_region, fill=None)
+
+    universe = openmc.Universe(cells=cells + [void_cell])
+
+    region = _add_boundaries(bounding_region, angle, boundary_type)
+
+    return openmc.Cell(region=region, fill=universe)
+
+
+def sector_angle(n_tf_coils: int, half: bool = False, boundary_type: str = 'reflective'):
+    """Toroidal sector subtended by a single TF coil, centered on the coil
+    midplane (xz plane). The full sector (360/N deg) repeats itself around
+    the torus and can be sliced with periodic boundaries. The half sector
+    (180/N deg) is the mirror image of its neighbour and can only be sliced
+    with reflective boundaries.
+
+    Parameters
+    ----------
+    n_tf_coils : int
+        number of TF coils of the tokamak
+    half : bool, optional
+        if True return the half sector starting at the coil midplane,
+        by default False
+    boundary_type : str, optional
+        boundary condition the sector will be sliced with, either
+        'reflective' or 'periodic', by default 'reflective'
+
+    Returns
+    -------
+    tuple of two floats
+        angles (deg) to be used as the angle argument of the components
+    """
+
+    if n_tf_coils < 1:
+        raise ValueError("n_tf_coils must be a positive integer")
+
+    if half and boundary_type == 'periodic':
+        raise ValueError("the half sector is mirrored by its neighbour and can "
+                         "only be sliced with reflective boundaries")
+
+    sector = 360. / n_tf_coils
+
+    if half:
+        return (0., sector / 2)
+
+    return (-sector / 2, sector / 2)
+
+
+def sector_phi(angle):
+    """Azimuthal distribution matching the toroidal sector, to be used as
+    the phi argument of openmc.stats.CylindricalIndependent so that no
+    source particle is sampled outside of the modeled sector
+
+    Parameters
+    ----------
+    angle : tuple of two floats
+        The first float is the angle in deg to cut with respect the x axis
+        The second float is the angle in deg to finish the cut
+
+    Returns
+    -------
+    openmc.stats.Uniform
+        Uniform distribution between the two angles in rad
+    """
+
+    return openmc.stats.Uniform(a=math.radians(angle[0]), b=math.radians(angle[1]))
+
+
 class Component(ABC):
     """Implement common interface for components"""
 
@@ -52,7 +288,8 @@ class Component(ABC):
 
 
 class Plasma(Component):
-    def __init__(self, outer_nodes, material: openmc.Material = None, surf_offset: float = 0., angle=None):
+    def __init__(self, outer_nodes, material: openmc.Material = None, surf_offset: float = 0., angle=None, boundary_type: str = 'reflective',
+                 surface_cache: SurfaceCache = None):
         """Plasma component described by its outer surface. The outer surface is an openmc
 
         Parameters
@@ -68,12 +305,20 @@ class Plasma(Component):
         angle : tuple of two floats, optional
         The first float is the angle in deg to cut with respect the x axis
         The second float is the angle in deg to finish the cut, by default None
+        boundary_type : str, optional
+            boundary condition of the two surfaces slicing the tokamak, either
+            'reflective' or 'periodic', by default 'reflective'
+        surface_cache : SurfaceCache, optional
+            surfaces shared with the other components of the model, by
+            default a new cache
         """
 
         self.outer_nodes = outer_nodes
         self.material = material
         self.surf_offset = surf_offset
         self.angle = angle
+        self.boundary_type = boundary_type
+        self.surface_cache = SurfaceCache() if surface_cache is None else surface_cache
 
     @property
     def surfaces(self):
@@ -84,8 +329,7 @@ class Plasma(Component):
         openmc.Surface
             Rurfaces necessary to build the plasma component
         """
-        main_surf = openmc.model.Polygon(
-            self.outer_nodes, basis="rz").offset(self.surf_offset)
+        main_surf = self.surface_cache.polygon(self.outer_nodes, self.surf_offset)
 
         return main_surf
 
@@ -101,7 +345,7 @@ class Plasma(Component):
 
         _region = -(self.surfaces)
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -119,21 +363,22 @@ class Plasma(Component):
 
 
 class FirstWall(Component):
-    def __init__(self, inner_nodes, thickness: str, material: openmc.Material, angle=None):
+    def __init__(self, inner_nodes, thickness: str, material: openmc.Material, angle=None, boundary_type: str = 'reflective',
+                 surface_cache: SurfaceCache = None):
         super().__init__()
 
         self.inner_nodes = inner_nodes
         self.thickness = thickness
         self.material = material
         self.angle = angle
+        self.boundary_type = boundary_type
+        self.surface_cache = SurfaceCache() if surface_cache is None else surface_cache
 
     @property
     def surfaces(self):
 
-        inner_surface = openmc.model.Polygon(
-            self.inner_nodes, basis="rz")
-        outer_surface = openmc.model.Polygon(
-            self.inner_nodes, basis="rz").offset(self.thickness)
+        inner_surface = self.surface_cache.polygon(self.inner_nodes)
+        outer_surface = self.surface_cache.polygon(self.inner_nodes, self.thickness)
 
         return inner_surface, outer_surface
 
@@ -142,7 +387,7 @@ class FirstWall(Component):
 
         _region = -(self.surfaces[1]) & +(self.surfaces[0])
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -154,13 +399,15 @@ class FirstWall(Component):
 
 class SOLVacuum(Component):
 
-    def __init__(self, plasma: Plasma, first_wall: FirstWall, material: openmc.Material = None, angle=None):
+    def __init__(self, plasma: Plasma, first_wall: FirstWall, material: openmc.Material = None, angle=None, boundary_type: str = 'reflective'):
         super().__init__()
 
         self.plasma = plasma
+        self.surface_cache = plasma.surface_cache
         self.first_wall = first_wall
         self.material = material
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
@@ -175,7 +422,7 @@ class SOLVacuum(Component):
 
         _region = -(self.surfaces[1]) & +(self.surfaces[0])
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -186,19 +433,21 @@ class SOLVacuum(Component):
 
 
 class VesselInnerStructure(Component):
-    def __init__(self, first_wall: FirstWall, thickness: str, material: openmc.Material, angle=None):
+    def __init__(self, first_wall: FirstWall, thickness: str, material: openmc.Material, angle=None, boundary_type: str = 'reflective'):
         super().__init__()
 
         self.first_wall = first_wall
+        self.surface_cache = first_wall.surface_cache
         self.thickness = thickness
         self.material = material
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
 
         inner_surface = self.first_wall.surfaces[-1]
-        outer_surface = inner_surface.offset(self.thickness)
+        outer_surface = self.surface_cache.offset(inner_surface, self.thickness)
 
         return inner_surface, outer_surface
 
@@ -207,7 +456,7 @@ class VesselInnerStructure(Component):
 
         _region = -(self.surfaces[1]) & +(self.surfaces[0])
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -218,19 +467,21 @@ class VesselInnerStructure(Component):
 
 
 class VesselCoolingChannel(Component):
-    def __init__(self, vessel_inner_structure: VesselInnerStructure, thickness: str, material: openmc.Material, angle=None):
+    def __init__(self, vessel_inner_structure: VesselInnerStructure, thickness: str, material: openmc.Material, angle=None, boundary_type: str = 'reflective'):
         super().__init__()
 
         self.vessel_inner_structure = vessel_inner_structure
+        self.surface_cache = vessel_inner_structure.surface_cache
         self.thickness = thickness
         self.material = material
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
 
         inner_surface = self.vessel_inner_structure.surfaces[-1]
-        outer_surface = inner_surface.offset(self.thickness)
+        outer_surface = self.surface_cache.offset(inner_surface, self.thickness)
 
         return inner_surface, outer_surface
 
@@ -239,7 +490,7 @@ class VesselCoolingChannel(Component):
 
         _region = -(self.surfaces[1]) & +(self.surfaces[0])
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -250,19 +501,21 @@ class VesselCoolingChannel(Component):
 
 
 class VesselNeutronMultiplier(Component):
-    def __init__(self, vessel_cooling_channel: VesselCoolingChannel, thickness: str, material: openmc.Material, angle=None):
+    def __init__(self, vessel_cooling_channel: VesselCoolingChannel, thickness: str, material: openmc.Material, angle=None, boundary_type: str = 'reflective'):
         super().__init__()
 
         self.vessel_cooling_channel = vessel_cooling_channel
+        self.surface_cache = vessel_cooling_channel.surface_cache
         self.thickness = thickness
         self.material = material
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
 
         inner_surface = self.vessel_cooling_channel.surfaces[-1]
-        outer_surface = inner_surface.offset(self.thickness)
+        outer_surface = self.surface_cache.offset(inner_surface, self.thickness)
 
         return inner_surface, outer_surface
 
@@ -271,7 +524,7 @@ class VesselNeutronMultiplier(Component):
 
         _region = -(self.surfaces[1]) & +(self.surfaces[0])
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -282,19 +535,21 @@ class VesselNeutronMultiplier(Component):
 
 
 class VesselOuterStructure(Component):
-    def __init__(self, vessel_neutron_multiplier: typing.Union[VesselNeutronMultiplier, VesselCoolingChannel], thickness: str, material: openmc.Material, angle=None):
+    def __init__(self, vessel_neutron_multiplier: typing.Union[VesselNeutronMultiplier, VesselCoolingChannel], thickness: str, material: openmc.Material, angle=None, boundary_type: str = 'reflective'):
         super().__init__()
 
         self.vessel_neutron_multiplier = vessel_neutron_multiplier
+        self.surface_cache = vessel_neutron_multiplier.surface_cache
         self.thickness = thickness
         self.material = material
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
 
         inner_surface = self.vessel_neutron_multiplier.surfaces[-1]
-        outer_surface = inner_surface.offset(self.thickness)
+        outer_surface = self.surface_cache.offset(inner_surface, self.thickness)
 
         return inner_surface, outer_surface
 
@@ -303,7 +558,7 @@ class VesselOuterStructure(Component):
 
         _region = -(self.surfaces[1]) & +(self.surfaces[0])
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -315,14 +570,17 @@ class VesselOuterStructure(Component):
 
 class Blanket(Component):
     def __init__(self, vacuum_vessel: typing.Union[VesselInnerStructure, VesselOuterStructure],
-                 thickness: float, material: openmc.Material, nodes=None, angle=None):
+                 thickness: float, material: openmc.Material, nodes=None, angle=None,
+                 boundary_type: str = 'reflective'):
         super().__init__()
 
         self.vacuum_vessel = vacuum_vessel
+        self.surface_cache = vacuum_vessel.surface_cache
         self.thickness = thickness
         self.material = material
         self.nodes = nodes
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
@@ -330,10 +588,9 @@ class Blanket(Component):
         inner_surface = self.vacuum_vessel.surfaces[-1]
 
         if self.nodes:
-            outer_surface = openmc.model.Polygon(self.nodes, basis="rz")
+            outer_surface = self.surface_cache.polygon(self.nodes)
         else:
-            outer_surface = self.vacuum_vessel.surfaces[-1].offset(
-                self.thickness)
+            outer_surface = self.surface_cache.offset(inner_surface, self.thickness)
 
         return inner_surface, outer_surface
 
@@ -342,7 +599,7 @@ class Blanket(Component):
 
         _region = -(self.surfaces[1]) & +(self.surfaces[0])
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -352,14 +609,16 @@ class Blanket(Component):
 
 
 class Shield(Component):
-    def __init__(self, blanket: Blanket, thickness: float, material: openmc.Material, nodes=None, angle=None):
+    def __init__(self, blanket: Blanket, thickness: float, material: openmc.Material, nodes=None, angle=None, boundary_type: str = 'reflective'):
         super().__init__()
 
         self.blanket = blanket
+        self.surface_cache = blanket.surface_cache
         self.thickness = thickness
         self.material = material
         self.nodes = nodes
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
@@ -367,10 +626,9 @@ class Shield(Component):
         inner_surface = self.blanket.surfaces[1]
 
         if self.nodes:
-            outer_surface = openmc.model.Polygon(self.nodes, basis="rz")
+            outer_surface = self.surface_cache.polygon(self.nodes)
         else:
-            outer_surface = self.blanket.surfaces[1].offset(
-                self.thickness)
+            outer_surface = self.surface_cache.offset(inner_surface, self.thickness)
 
         return inner_surface, outer_surface
 
@@ -379,7 +637,7 @@ class Shield(Component):
 
         _region = -(self.surfaces[1]) & +(self.surfaces[0])
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -389,23 +647,26 @@ class Shield(Component):
 
 
 class PFCoilMagnet(Component):
-    def __init__(self, nodes, material: openmc.Material, angle=None):
+    def __init__(self, nodes, material: openmc.Material, angle=None, boundary_type: str = 'reflective',
+                 surface_cache: SurfaceCache = None):
         super().__init__()
 
         self.nodes = nodes
         self.material = material
         self.angle = angle
+        self.boundary_type = boundary_type
+        self.surface_cache = SurfaceCache() if surface_cache is None else surface_cache
 
     @property
     def surfaces(self):
 
-        return openmc.model.Polygon(self.nodes, basis="rz")
+        return self.surface_cache.polygon(self.nodes)
 
     @property
     def region(self):
         _region = -(self.surfaces)
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -416,25 +677,27 @@ class PFCoilMagnet(Component):
 
 
 class PFCoilInsulation(Component):
-    def __init__(self, pf_coil_magnet: PFCoilMagnet, thickness: float, material: openmc.Material, angle=None):
+    def __init__(self, pf_coil_magnet: PFCoilMagnet, thickness: float, material: openmc.Material, angle=None, boundary_type: str = 'reflective'):
         super().__init__()
 
         self.pf_coil_magnet = pf_coil_magnet
+        self.surface_cache = pf_coil_magnet.surface_cache
         self.thickness = thickness
         self.material = material
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
 
-        return self.pf_coil_magnet.surfaces.offset(self.thickness)
+        return self.surface_cache.offset(self.pf_coil_magnet.surfaces, self.thickness)
 
     @property
     def region(self):
 
         _region = -(self.surfaces) & ~(self.pf_coil_magnet.region)
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -445,22 +708,24 @@ class PFCoilInsulation(Component):
 
 
 class PFCoilCase(Component):
-    def __init__(self, pf_coil_magnet: PFCoilMagnet, thickness: float, material: openmc.Material, pf_coil_insulation: PFCoilInsulation = None, angle=None):
+    def __init__(self, pf_coil_magnet: PFCoilMagnet, thickness: float, material: openmc.Material, pf_coil_insulation: PFCoilInsulation = None, angle=None, boundary_type: str = 'reflective'):
         super().__init__()
 
         self.pf_coil_magnet = pf_coil_magnet
+        self.surface_cache = pf_coil_magnet.surface_cache
         self.pf_coil_insulation = pf_coil_insulation
         self.material = material
         self.thickness = thickness
         self.angle = angle
+        self.boundary_type = boundary_type
 
     @property
     def surfaces(self):
 
         if self.pf_coil_insulation:
-            return self.pf_coil_insulation.surfaces.offset(self.thickness)
+            return self.surface_cache.offset(self.pf_coil_insulation.surfaces, self.thickness)
         else:
-            return self.pf_coil_magnet.surfaces.offset(self.thickness)
+            return self.surface_cache.offset(self.pf_coil_magnet.surfaces, self.thickness)
 
     @property
     def region(self):
@@ -470,7 +735,7 @@ class PFCoilCase(Component):
         if self.pf_coil_insulation:
             _region = _region & ~(self.pf_coil_insulation.region)
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -480,37 +745,71 @@ class PFCoilCase(Component):
         return openmc.Cell(region=self.region, fill=self.material)
 
 
-class TFCoilMagnet(Component):
-    def __init__(self, inner_nodes, thickness: float, material: openmc.Material, angle=None, rotation_angle: float = 0):
-        super().__init__()
+class _TFCoilLayer(Component):
+    """Implement common geometry for the TF coil components. Each layer is
+    described by its offsets with respect to the magnet inner surface (outer
+    surface if the magnet has outer nodes) and midplane, and its region is the layer envelope minus the envelope of
+    the layer it wraps"""
 
-        self.inner_nodes = inner_nodes
-        self.thickness = thickness
-        self.material = material
-        self.angle = angle
-        self.rotation_angle = rotation_angle
+    _inner_layer = None
+
+    @property
+    def offsets(self):
+        """Position of the component outer boundaries with respect to the
+        magnet inner surface and midplane
+
+        Returns
+        -------
+        tuple of three floats
+            inwards offset of the inner surface, outwards offset of the outer
+            surface and half width in the toroidal direction (cm)
+        """
+
+        inner_offset, outer_offset, half_width = self._inner_layer.offsets
+
+        return (inner_offset + self.inner_thickness,
+                outer_offset + self.outer_thickness,
+                half_width + self.toroidal_thickness)
 
     @property
     def surfaces(self):
 
-        main_surface_in = openmc.model.Polygon(self.inner_nodes, basis="rz")
-        main_surface_out = openmc.model.Polygon(
-            self.inner_nodes, basis="rz").offset(self.thickness)
-        lower_bound = openmc.YPlane(
-            y0=-self.thickness).rotate((0, 0, self.rotation_angle))
-        upper_bound = openmc.YPlane(y0=self.thickness).rotate(
-            (0, 0, self.rotation_angle))
-        left_bound = openmc.XPlane(x0=0).rotate((0, 0, self.rotation_angle))
+        inner_offset, outer_offset, half_width = self.offsets
+
+        main_surface_in = self.surface_cache.polygon(self.inner_nodes, -inner_offset)
+        if self.outer_nodes is not None:
+            main_surface_out = self.surface_cache.polygon(self.outer_nodes, outer_offset)
+        else:
+            main_surface_out = self.surface_cache.polygon(self.inner_nodes, outer_offset)
+        lower_bound, upper_bound = self.surface_cache.toroidal_planes(
+            half_width, self.rotation_angle)
+        left_bound = self.surface_cache.midplane_bound(self.rotation_angle)
 
         return main_surface_in, main_surface_out, lower_bound, upper_bound, left_bound
 
+    @property
+    def envelope(self):
+        """openmc.Region enclosed by the component outer boundaries,
+        including the components it wraps
+
+        Returns
+        -------
+        openmc.Region
+        """
+
+        main_surface_in, main_surface_out, lower_bound, upper_bound, left_bound = self.surfaces
+
+        return +main_surface_in & -main_surface_out & +lower_bound & -upper_bound & +left_bound
+
     @property
     def region(self):
 
-        _region = +(self.surfaces[0]) & -(self.surfaces[1]) & + \
-            (self.surfaces[2]) & -(self.surfaces[3]) & +(self.surfaces[4])
+        _region = self.envelope
+
+        if self._inner_layer:
+            _region = _region & ~(self._inner_layer.envelope)
 
-        _region = _add_boundaries(_region, self.angle)
+        _region = _add_boundaries(_region, self.angle, self.boundary_type, self.surface_cache)
 
         return _region
 
@@ -520,104 +819,168 @@ class TFCoilMagnet(Component):
         return openmc.Cell(region=self.region, fill=self.material)
 
 
-class TFCoilInsulation(Component):
-    def __init__(self, tf_coil_magnet: TFCoilMagnet, thickness: float, material: openmc.Material, angle=None):
+class TFCoilMagnet(_TFCoilLayer):
+    def __init__(self, inner_nodes, thickness: float, material: openmc.Material, angle=None,
+                 rotation_angle: float = 0, radial_thickness: float = None, toroidal_thickness: float = None,
+                 outer_nodes=None, boundary_type: str = 'reflective', surface_cache: SurfaceCache = None):
+        """TF coil winding pack described by its inner surface in the poloidal
+        plane and extruded in the toroidal direction
+
+        Parameters
+        ----------
+        inner_nodes : iterable of tuples
+            (r,z) coordinates of the magnet inner surface
+        thickness : float
+            default (cm) for both radial_thickness and toroidal_thickness
+        material : openmc.Material
+            material to fill the magnet with
+        angle : tuple of two floats, optional
+            The first float is the angle in deg to cut with respect the x axis
+            The second float is the angle in deg to finish the cut, by default None
+        rotation_angle : float, optional
+            number (deg) for rotating the magnet counterclockwise around the z-axis,
+            by default 0
+        radial_thickness : float, optional
+            number (cm) for offsetting the inner nodes outwards in the poloidal
+            plane, by default thickness
+        toroidal_thickness : float, optional
+            number (cm) the magnet extends on each side of its midplane in the
+            toroidal direction, by default thickness
+        outer_nodes : iterable of tuples, optional
+            (r,z) coordinates of the magnet outer surface. If given, they are
+            used instead of offsetting the inner nodes by radial_thickness,
+            by default None
+        boundary_type : str, optional
+            boundary condition of the two surfaces slicing the tokamak, either
+            'reflective' or 'periodic', by default 'reflective'
+        surface_cache : SurfaceCache, optional
+            surfaces shared with the other components of the model, by
+            default a new cache
+        """
         super().__init__()
 
-        self.tf_coil_magnet = tf_coil_magnet
+        self.inner_nodes = inner_nodes
         self.thickness = thickness
         self.material = material
         self.angle = angle
-        self.rotation_angle = tf_coil_magnet.rotation_angle
+        self.boundary_type = boundary_type
+        self.surface_cache = SurfaceCache() if surface_cache is None else surface_cache
+        self.rotation_angle = rotation_angle
+        self.outer_nodes = outer_nodes
+        self.radial_thickness = thickness if radial_thickness is None else radial_thickness
+        self.toroidal_thickness = thickness if toroidal_thickness is None else toroidal_thickness
 
     @property
-    def surfaces(self):
-
-        lb_y0 = self.tf_coil_magnet.surfaces[2].d - self.thickness
-        ub_y0 = self.tf_coil_magnet.surfaces[3].d + self.thickness
+    def offsets(self):
 
-        main_surface_in = self.tf_coil_magnet.surfaces[0].offset(
-            -self.thickness)
-        main_surface_out = self.tf_coil_magnet.surfaces[1].offset(
-            +self.thickness)
-        lower_bound = openmc.YPlane(y0=lb_y0).rotate(
-            (0, 0, self.rotation_angle))
-        upper_bound = openmc.YPlane(y0=ub_y0).rotate(
-            (0, 0, self.rotation_angle))
-        left_bound = openmc.XPlane(x0=0).rotate((0, 0, self.rotation_angle))
+        if self.outer_nodes is not None:
+            return 0., 0., self.toroidal_thickness
 
-        return main_surface_in, main_surface_out, lower_bound, upper_bound, left_bound
+        return 0., self.radial_thickness, self.toroidal_thickness
 
-    @property
-    def region(self):
 
-        _region = +(self.surfaces[0]) & -(self.surfaces[1]) & + \
-            (self.surfaces[2]) & -(self.surfaces[3]) & + \
-            (self.surfaces[4]) & ~(self.tf_coil_magnet.region)
+class TFCoilInsulation(_TFCoilLayer):
+    def __init__(self, tf_coil_magnet: TFCoilMagnet, thickness: float, material: openmc.Material, angle=None, boundary_type: str = 'reflective',
+                 inner_thickness: float = None, outer_thickness: float = None, toroidal_thickness: float = None):
+        """TF coil insulation wrapped around the magnet
 
-        _region = _add_boundaries(_region, self.angle)
+        Parameters
+        ----------
+        tf_coil_magnet : TFCoilMagnet
+            magnet to wrap
+        thickness : float
+            default (cm) for the inner, outer and toroidal thicknesses
+        material : openmc.Material
+            material to fill the insulation with
+        angle : tuple of two floats, optional
+            The first float is the angle in deg to cut with respect the x axis
+            The second float is the angle in deg to finish the cut, by default None
+        boundary_type : str, optional
+            boundary condition of the two surfaces slicing the tokamak, either
+            'reflective' or 'periodic', by default 'reflective'
+        inner_thickness : float, optional
+            thickness (cm) on the inner (plasma facing) side of the magnet,
+            by default thickness
+        outer_thickness : float, optional
+            thickness (cm) on the outer side of the magnet, by default thickness
+        toroidal_thickness : float, optional
+            thickness (cm) on each toroidal side of the magnet, by default thickness
+        """
+        super().__init__()
 
-        return _region
+        self.tf_coil_magnet = tf_coil_magnet
+        self.surface_cache = tf_coil_magnet.surface_cache
+        self.thickness = thickness
+        self.material = material
+        self.angle = angle
+        self.boundary_type = boundary_type
+        self.inner_nodes = tf_coil_magnet.inner_nodes
+        self.outer_nodes = tf_coil_magnet.outer_nodes
+        self.rotation_angle = tf_coil_magnet.rotation_angle
+        self.inner_thickness = thickness if inner_thickness is None else inner_thickness
+        self.outer_thickness = thickness if outer_thickness is None else outer_thickness
+        self.toroidal_thickness = thickness if toroidal_thickness is None else toroidal_thickness
 
     @property
-    def cell(self):
-        return openmc.Cell(region=self.region, fill=self.material)
+    def _inner_layer(self):
+
+        return self.tf_coil_magnet
+
 
+class TFCoilCase(_TFCoilLayer):
+    def __init__(self, tf_coil_magnet: TFCoilMagnet, thickness: float, material: openmc.Material, tf_coil_insulation: TFCoilInsulation = None,
+                 angle=None, boundary_type: str = 'reflective',
+                 inner_thickness: float = None, outer_thickness: float = None, toroidal_thickness: float = None):
+        """TF coil case wrapped around the insulation, or around the magnet
+        when no insulation is given
 
-class TFCoilCase(Component):
-    def __init__(self, tf_coil_magnet: TFCoilMagnet, thickness: float, material: openmc.Material, tf_coil_insulation: TFCoilInsulation = None, angle=None):
+        Parameters
+        ----------
+        tf_coil_magnet : TFCoilMagnet
+            magnet to wrap
+        thickness : float
+            default (cm) for the inner, outer and toroidal thicknesses
+        material : openmc.Material
+            material to fill the case with
+        tf_coil_insulation : TFCoilInsulation, optional
+            insulation around the magnet, by default None
+        angle : tuple of two floats, optional
+            The first float is the angle in deg to cut with respect the x axis
+            The second float is the angle in deg to finish the cut, by default None
+        boundary_type : str, optional
+            boundary condition of the two surfaces slicing the tokamak, either
+            'reflective' or 'periodic', by default 'reflective'
+        inner_thickness : float, optional
+            thickness (cm) on the inner (plasma facing) side of the coil,
+            by default thickness
+        outer_thickness : float, optional
+            thickness (cm) on the outer side of the coil, by default thickness
+        toroidal_thickness : float, optional
+            thickness (cm) on each toroidal side of the coil, by default thickness
+        """
         super().__init__()
 
         self.tf_coil_magnet = tf_coil_magnet
+        self.surface_cache = tf_coil_magnet.surface_cache
         self.thickness = thickness
         self.material = material
         self.tf_coil_insulation = tf_coil_insulation
         self.angle = angle
+        self.boundary_type = boundary_type
+        self.inner_nodes = tf_coil_magnet.inner_nodes
+        self.outer_nodes = tf_coil_magnet.outer_nodes
         self.rotation_angle = tf_coil_magnet.rotation_angle
+        self.inner_thickness = thickness if inner_thickness is None else inner_thickness
+        self.outer_thickness = thickness if outer_thickness is None else outer_thickness
+        self.toroidal_thickness = thickness if toroidal_thickness is None else toroidal_thickness
 
     @property
-    def surfaces(self):
+    def _inner_layer(self):
 
         if self.tf_coil_insulation:
-            insulation_thickness = self.tf_coil_insulation.thickness
+            return self.tf_coil_insulation
         else:
-            insulation_thickness = 0.
-
-        lb_y0 = self.tf_coil_magnet.surfaces[2].d - \
-            self.thickness - insulation_thickness
-        ub_y0 = self.tf_coil_magnet.surfaces[3].d + \
-            self.thickness + insulation_thickness
-
-        main_surface_in = self.tf_coil_magnet.surfaces[0].offset(
-            -(self.thickness+insulation_thickness))
-        main_surface_out = self.tf_coil_magnet.surfaces[1].offset(
-            +(self.thickness+insulation_thickness))
-        lower_bound = openmc.YPlane(y0=lb_y0).rotate(
-            (0, 0, self.rotation_angle))
-        upper_bound = openmc.YPlane(y0=ub_y0).rotate(
-            (0, 0, self.rotation_angle))
-        left_bound = openmc.XPlane(x0=0).rotate((0, 0, self.rotation_angle))
-
-        return main_surface_in, main_surface_out, lower_bound, upper_bound, left_bound
-
-    @property
-    def region(self):
-
-        _region = +(self.surfaces[0]) & -(self.surfaces[1]) & + \
-            (self.surfaces[2]) & -(self.surfaces[3]) & + \
-            (self.surfaces[4]) & ~(self.tf_coil_magnet.region)
-
-        if self.tf_coil_insulation:
-            _region = _region & ~(self.tf_coil_insulation.region)
-
-        _region = _add_boundaries(_region, self.angle)
-
-        return _region
-
-    @property
-    def cell(self):
-
-        return openmc.Cell(region=self.region, fill=self.material)
+            return self.tf_coil_magnet
 
 
 def core_group(plasma_outer_nodes, plasma_material: openmc.Material,
@@ -628,7 +991,7 @@ def core_group(plasma_outer_nodes, plasma_material: openmc.Material,
                vv_stro_thickness: float, vv_stro_material: openmc.Material,
                blanket_thickness: float, blanket_material: openmc.Material,
                shield_thickness: float, shield_material: openmc.Material,
-               angle=None):
+               angle=None, boundary_type: str = 'reflective', surface_cache: SurfaceCache = None):
     """This function allows do directly generate all the Core components in one call
 
 
@@ -682,6 +1045,12 @@ def core_group(plasma_outer_nodes, plasma_material: openmc.Material,
     angle : tuple of two floats, optional
         The first float is the angle in deg to cut with respect the x axis
         The second float is the angle in deg to finish the cut, by default None
+    boundary_type : str, optional
+        boundary condition of the two surfaces slicing the tokamak, either
+        'reflective' or 'periodic', by default 'reflective'
+    surface_cache : SurfaceCache, optional
+        surfaces shared with the other components of the model, by default
+        a new cache
 
     Returns
     -------
@@ -690,28 +1059,33 @@ def core_group(plasma_outer_nodes, plasma_material: openmc.Material,
     VesselOuterStructure, Blanket, Shield
     """
 
+    if surface_cache is None:
+        surface_cache = SurfaceCache()
+
     plasma = Plasma(outer_nodes=plasma_outer_nodes,
-                    material=plasma_material, angle=angle)
+                    material=plasma_material, angle=angle, boundary_type=boundary_type,
+                    surface_cache=surface_cache)
 
     first_wall = FirstWall(inner_nodes=firstwall_inner_nodes,
-                           thickness=firstwall_thickness, material=firstwall_material, angle=angle)
+                           thickness=firstwall_thickness, material=firstwall_material, angle=angle, boundary_type=boundary_type,
+                           surface_cache=surface_cache)
     vessel_inner_structure = VesselInnerStructure(
-        first_wall=first_wall, thickness=vv_stri_thickness, material=vv_stri_material, angle=angle)
+        first_wall=first_wall, thickness=vv_stri_thickness, material=vv_stri_material, angle=angle, boundary_type=boundary_type)
     vessel_cooling_channel = VesselCoolingChannel(
-        vessel_inner_structure=vessel_inner_structure, thickness=vv_channel_thickness, material=vv_channel_material, angle=angle)
+        vessel_inner_structure=vessel_inner_structure, thickness=vv_channel_thickness, material=vv_channel_material, angle=angle, boundary_type=boundary_type)
     vessel_neutron_multiplier = VesselNeutronMultiplier(
-        vessel_cooling_channel=vessel_cooling_channel, thickness=vv_multiplier_thickness, material=vv_multiplier_material, angle=angle)
+        vessel_cooling_channel=vessel_cooling_channel, thickness=vv_multiplier_thickness, material=vv_multiplier_material, angle=angle, boundary_type=boundary_type)
     vessel_outer_structure = VesselOuterStructure(
-        vessel_neutron_multiplier=vessel_neutron_multiplier, thickness=vv_stro_thickness, material=vv_stro_material, angle=angle)
+        vessel_neutron_multiplier=vessel_neutron_multiplier, thickness=vv_stro_thickness, material=vv_stro_material, angle=angle, boundary_type=boundary_type)
 
     sol = SOLVacuum(plasma=plasma, first_wall=first_wall,
-                    material=None, angle=angle)
+                    material=None, angle=angle, boundary_type=boundary_type)
 
     blanket = Blanket(vacuum_vessel=vessel_outer_structure, thickness=blanket_thickness,
-                      material=blanket_material, nodes=None, angle=angle)
+                      material=blanket_material, nodes=None, angle=angle, boundary_type=boundary_type)
 
     shield = Shield(blanket=blanket, thickness=shield_thickness,
-                    material=shield_material, angle=angle)
+                    material=shield_material, angle=angle, boundary_type=boundary_type)
 
     return plasma, sol, first_wall, vessel_inner_structure, vessel_cooling_channel, vessel_neutron_multiplier, vessel_outer_structure, blanket, shield
 
@@ -719,7 +1093,7 @@ def core_group(plasma_outer_nodes, plasma_material: openmc.Material,
 def pfcoil_group(magnet_nodes, magnet_material: openmc.Material,
                  insulation_thickness: float, insulation_material: openmc.Material,
                  case_thickness: float, case_material: openmc.Material,
-                 angle=None):
+                 angle=None, boundary_type: str = 'reflective', surface_cache: SurfaceCache = None):
     """This function allows do directly generate all the PFCoil components in one call
 
     Parameters
@@ -741,6 +1115,12 @@ def pfcoil_group(magnet_nodes, magnet_material: openmc.Material,
     angle : tuple of two floats, optional
         The first float is the angle in deg to cut with respect the x axis
         The second float is the angle in deg to finish the cut, by default None
+    boundary_type : str, optional
+        boundary condition of the two surfaces slicing the tokamak, either
+        'reflective' or 'periodic', by default 'reflective'
+    surface_cache : SurfaceCache, optional
+        surfaces shared with the other components of the model, by default
+        a new cache
 
     Returns
     -------
@@ -748,14 +1128,18 @@ def pfcoil_group(magnet_nodes, magnet_material: openmc.Material,
     PFCoilMagnet, PFCoilInsulation, PFCoilCase
     """
 
+    if surface_cache is None:
+        surface_cache = SurfaceCache()
+
     pf_magnet = PFCoilMagnet(
-        nodes=magnet_nodes, material=magnet_material, angle=angle)
+        nodes=magnet_nodes, material=magnet_material, angle=angle, boundary_type=boundary_type,
+        surface_cache=surface_cache)
 
     pf_insulation = PFCoilInsulation(pf_coil_magnet=pf_magnet,
                                      thickness=insulation_thickness,
-                                     material=insulation_material, angle=angle)
+                                     material=insulation_material, angle=angle, boundary_type=boundary_type)
     pf_case = PFCoilCase(pf_coil_magnet=pf_magnet, pf_coil_insulation=pf_insulation,
-                         thickness=case_thickness, material=case_material, angle=angle)
+                         thickness=case_thickness, material=case_material, angle=angle, boundary_type=boundary_type)
 
     return pf_magnet, pf_insulation, pf_case
 
@@ -763,7 +1147,13 @@ def pfcoil_group(magnet_nodes, magnet_material: openmc.Material,
 def tfcoil_group(magnet_inner_nodes, magnet_thickness: float, magnet_material: openmc.Material,
                  insulation_thickness: float, insulation_material: openmc.Material,
                  case_thickness: float, case_material: openmc.Material,
-                 angle=None, rotation_angle: float = 0):
+                 angle=None, rotation_angle: float = 0,
+                 magnet_toroidal_thickness: float = None,
+                 insulation_inner_thickness: float = None, insulation_outer_thickness: float = None,
+                 insulation_toroidal_thickness: float = None,
+                 case_inner_thickness: float = None, case_outer_thickness: float = None,
+                 case_toroidal_thickness: float = None, magnet_outer_nodes=None,
+                 boundary_type: str = 'reflective', surface_cache: SurfaceCache = None):
     """This function allows do directly generate all the TFCoil components in one call
 
     Parameters
@@ -772,8 +1162,8 @@ def tfcoil_group(magnet_inner_nodes, magnet_thickness: float, magnet_material: o
         List of (r,z) coordinates for the superconductor cell inner surface
     magnet_thickness : float
         number (cm) for offsetting the magnet nodes outwards in poloidal direction
-        and to extrude the magnet in the toroidal direction with the xz plane being
-        the midplane
+        and, unless magnet_toroidal_thickness is given, to extrude the magnet in
+        the toroidal direction with the xz plane being the midplane
     magnet_material : openmc.Material
         Material to fill the magnet with
     insulation_thickness : float
@@ -794,6 +1184,25 @@ def tfcoil_group(magnet_inner_nodes, magnet_thickness: float, magnet_material: o
     rotation_angle : float, optional
         number (deg) for rotating the magnet counterclockwise around the z-axis,
         by default 0
+    magnet_toroidal_thickness : float, optional
+        number (cm) the magnet extends on each side of its midplane in the toroidal
+        direction, by default magnet_thickness
+    insulation_inner_thickness, insulation_outer_thickness, insulation_toroidal_thickness : float, optional
+        insulation thickness (cm) on the inner (plasma facing) side, on the outer side
+        and on each toroidal side of the magnet, by default insulation_thickness
+    case_inner_thickness, case_outer_thickness, case_toroidal_thickness : float, optional
+        case thickness (cm) on the inner (plasma facing) side, on the outer side
+        and on each toroidal side of the insulation, by default case_thickness
+    magnet_outer_nodes : Iterable of tuples, optional
+        List of (r,z) coordinates for the superconductor cell outer surface. If given,
+        the magnet nodes are not offset by magnet_thickness and insulation and case
+        are offset from the outer nodes, by default None
+    boundary_type : str, optional
+        boundary condition of the two surfaces slicing the tokamak, either
+        'reflective' or 'periodic', by default 'reflective'
+    surface_cache : SurfaceCache, optional
+        surfaces shared with the other components of the model, by default
+        a new cache
 
     Returns
     -------
@@ -801,13 +1210,24 @@ def tfcoil_group(magnet_inner_nodes, magnet_thickness: float, magnet_material: o
         TFCoilMagnet, TFCoilInsulation, TFCoilCase
     """
 
+    if surface_cache is None:
+        surface_cache = SurfaceCache()
+
     tf_coil_magnet = TFCoilMagnet(inner_nodes=magnet_inner_nodes, thickness=magnet_thickness,
-                                  material=magnet_material, angle=angle, rotation_angle=rotation_angle)
+                                  material=magnet_material, angle=angle, boundary_type=boundary_type,
+                                  rotation_angle=rotation_angle, toroidal_thickness=magnet_toroidal_thickness,
+                                  outer_nodes=magnet_outer_nodes, surface_cache=surface_cache)
 
     tf_coil_insulation = TFCoilInsulation(tf_coil_magnet=tf_coil_magnet, thickness=insulation_thickness,
-                                          material=insulation_material, angle=angle)
+                                          material=insulation_material, angle=angle, boundary_type=boundary_type,
+                                          inner_thickness=insulation_inner_thickness,
+                                          outer_thickness=insulation_outer_thickness,
+                                          toroidal_thickness=insulation_toroidal_thickness)
 
     tf_coil_case = TFCoilCase(tf_coil_magnet=tf_coil_magnet, tf_coil_insulation=tf_coil_insulation,
-                              thickness=case_thickness, material=case_material, angle=angle)
+                              thickness=case_thickness, material=case_material, angle=angle, boundary_type=boundary_type,
+                              inner_thickness=case_inner_thickness,
+                              outer_thickness=case_outer_thickness,
+                              toroidal_thickness=case_toroidal_thickness)
 
     return tf_coil_magnet, tf_coil_insulation, tf_coil_case
@@ -0,0 +1,193 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import h5py
+import numpy as np
+import openmc
+
+_xdmf_template = """<?xml version="1.0" ?>
+<Xdmf Version="3.0">
+  <Domain>
+    <Grid Name="{name}" GridType="Uniform">
+{topology}
+{attributes}
+    </Grid>
+  </Domain>
+</Xdmf>
+"""
+
+_attribute_template = """      <Attribute Name="{name}" AttributeType="Scalar" Center="Cell">
+        <DataItem Dimensions="{dimensions}" NumberType="Float" Precision="8" Format="HDF">{path}:/{dataset}</DataItem>
+      </Attribute>"""
+
+
+def _labels(tally_filter):
+    """Label of each bin of a (non mesh) filter"""
+
+    if isinstance(tally_filter, openmc.EnergyFilter):
+        return [f"{low:.4g}-{high:.4g}eV" for low, high in tally_filter.bins]
+
+    return [str(b) for b in tally_filter.bins]
+
+
+def _layout(tally):
+    """Mesh filter and labels of the bins of the filters before (outer) and
+    after (inner) it"""
+
+    mesh_filter = tally.find_filter(openmc.MeshFilter)
+    position = tally.filters.index(mesh_filter)
+
+    outer = [_labels(f) for f in tally.filters[:position]]
+    inner = [_labels(f) for f in tally.filters[position + 1:]]
+
+    return mesh_filter.mesh, outer, inner
+
+
+def _mesh_points(mesh):
+    """Vertices of a regular or cylindrical mesh, (z, y, x) ordered"""
+
+    if isinstance(mesh, openmc.CylindricalMesh):
+        z, phi, r = np.meshgrid(mesh.z_grid, mesh.phi_grid, mesh.r_grid, indexing='ij')
+        origin = np.asarray(mesh.origin, dtype=float)
+        return np.stack([r * np.cos(phi) + origin[0], r * np.sin(phi) + origin[1], z + origin[2]], axis=-1)
+
+    nx, ny, nz = mesh.dimension
+    x, y, z = (np.linspace(low, high, n + 1)
+               for low, high, n in zip(mesh.lower_left, mesh.upper_right, (nx, ny, nz)))
+    z, y, x = np.meshgrid(z, y, x, indexing='ij')
+
+    return np.stack([x, y, z], axis=-1)
+
+
+def _topology(dimension, points_path):
+    """XDMF topology and geometry of the mesh"""
+
+    dimensions = ' '.join(str(n + 1) for n in reversed(dimension))
+
+    return (f'      <Topology TopologyType="3DSMesh" Dimensions="{dimensions}"/>\n'
+            f'      <Geometry GeometryType="XYZ">\n'
+            f'        <DataItem Dimensions="{dimensions} 3" NumberType="Float" Precision="8" '
+            f'Format="HDF">{points_path}:/mesh/points</DataItem>\n'
+            f'      </Geometry>')
+
+
+def _export_score(statepoint, tally_id: int, column: int, score: str, output,
+                  dimension, outer, inner, n_realizations: int):
+    """Stream one score of a mesh tally into an HDF5 file, one z slab at a
+    time. column is the index of the (nuclide, score) pair in the results,
+    nuclide_index * n_scores + score_index."""
+
+    nx, ny, nz = dimension
+    plane = nx * ny
+    n_inner = int(np.prod([len(labels) for labels in inner]))
+    n_mesh = plane * nz
+
+    names = []
+    with h5py.File(statepoint, 'r') as sp, h5py.File(output, 'a') as f:
+        results = sp[f'tallies/tally {tally_id}/results']
+
+        for o, outer_labels in enumerate(itertools.product(*outer)):
+            datasets = []
+            for inner_labels in itertools.product(*inner):
+                name = '/'.join((score,) + outer_labels + inner_labels)
+                datasets.append((f.require_dataset(f'{name}/mean', (nz, ny, nx), float),
+                                 f.require_dataset(f'{name}/std_dev', (nz, ny, nx), float)))
+                names.append(name)
+
+            for k in range(nz):
+                start = (o * n_mesh + k * plane) * n_inner
+                block = results[start:start + plane * n_inner, column, :]
+                block = block.reshape(ny, nx, n_inner, 2)
+
+                mean = block[..., 0] / n_realizations
+                with np.errstate(invalid='ignore'):
+                    std_dev = np.sqrt(np.maximum(block[..., 1] / n_realizations - mean**2, 0.)
+                                      / max(n_realizations - 1, 1))
+
+                for q, (mean_dataset, std_dataset) in enumerate(datasets):
+                    mean_dataset[k] = mean[..., q]
+                    std_dataset[k] = std_dev[..., q]
+
+    return names
+
+
+def export_mesh_tally(statepoint, tally, output, processes: int = None):
+    """Export a mesh tally to HDF5 with an XDMF description readable by
+    ParaView or VisIt. The tally results are streamed from the statepoint
+    one z slab at a time, so that memory stays bounded whatever the mesh
+    size. Regular and cylindrical meshes are supported; the other filters
+    of the tally (e.g. particle or energy) give one field per bin, and the
+    nuclides of the tally, if any, one field per nuclide and score.
+
+    Parameters
+    ----------
+    statepoint : str or pathlib.Path
+        path to the statepoint file
+    tally : int or str
+        tally id or tally name
+    output : str or pathlib.Path
+        path to the .xdmf file, the data is written next to it in .h5 files
+    processes : int, optional
+        if given, the scores are exported in parallel by this number of
+        processes, each one to its own .h5 file, by default None (serial)
+
+    Returns
+    -------
+    pathlib.Path
+        path to the .xdmf file
+    """
+
+    output = Path(output).with_suffix('.xdmf')
+
+    with openmc.StatePoint(statepoint) as sp:
+        tally = sp.get_tally(name=tally) if isinstance(tally, str) else sp.get_tally(id=tally)
+        mesh, outer, inner = _layout(tally)
+        scores = list(tally.scores)
+        nuclides = list(tally.nuclides)
+        n_realizations = tally.num_realizations
+
+    # results columns are ordered by nuclide, then by score
+    columns = [n * len(scores) + i for n in range(len(nuclides)) for i in range(len(scores))]
+    if nuclides == ['total']:
+        fields = scores
+    else:
+        fields = [f"{nuclide}/{score}" for nuclide in nuclides for score in scores]
+
+    if isinstance(mesh, openmc.CylindricalMesh):
+        dimension = (len(mesh.r_grid) - 1, len(mesh.phi_grid) - 1, len(mesh.z_grid) - 1)
+    elif isinstance(mesh, openmc.RegularMesh):
+        dimension = tuple(mesh.dimension)
+    else:
+        raise TypeError("only regular and cylindrical meshes are supported")
+
+    points_file = output.with_suffix('.h5')
+    with h5py.File(points_file, 'w') as f:
+        f.create_dataset('mesh/points', data=_mesh_points(mesh))
+
+    if processes:
+        files = [output.with_suffix(f".{field.replace('/', '.')}.h5") for field in fields]
+    else:
+        files = [points_file] * len(fields)
+
+    arguments = [(str(statepoint), tally.id, column, field, file, dimension, outer, inner, n_realizations)
+                 for column, field, file in zip(columns, fields, files)]
+
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            names = list(executor.map(_export_score, *zip(*arguments)))
+    else:
+        names = [_export_score(*args) for args in arguments]
+
+    cells = ' '.join(str(n) for n in reversed(dimension))
+    attributes = []
+    for file, score_names in zip(files, names):
+        for name in score_names:
+            for value in ('mean', 'std_dev'):
+                attributes.append(_attribute_template.format(
+                    name=f"{name}/{value}", dimensions=cells, path=file.name, dataset=f"{name}/{value}"))
+
+    output.write_text(_xdmf_template.format(name=tally.name or f"tally {tally.id}",
+                                            topology=_topology(dimension, points_file.name),
+                                            attributes='\n'.join(attributes)))
+
+    return output
@@ -0,0 +1,160 @@
+import numpy as np
+import openmc
+from tokamak_radiation_environment.materials import database
+from tokamak_radiation_environment.response import reactions as default_reactions
+from tokamak_radiation_environment.response import response_functions
+from tokamak_radiation_environment.results import _seconds_per_year, _statepoint, _tally, source_rate
+
+gas_reactions = ('(n,Xp)', '(n,Xd)', '(n,Xt)', '(n,X3He)', '(n,Xa)')
+
+
+def tally_spectra(statepoint, tally, score: str = 'flux', value: str = 'mean'):
+    """Group spectra of a tally with an energy filter, e.g. the flux
+    spectrum tally of the reactor decks
+
+    Parameters
+    ----------
+    statepoint : openmc.StatePoint or str
+        statepoint or path to the statepoint file
+    tally : int, str or openmc.Tally
+        tally id, tally name or tally
+    score : str, optional
+        score of the spectra, by default 'flux'
+    value : str, optional
+        'mean' or 'std_dev', by default 'mean'
+
+    Returns
+    -------
+    numpy.ndarray
+        spectra with one axis per filter (energy groups last)
+    numpy.ndarray
+        group boundaries in eV
+    """
+
+    with _statepoint(statepoint) as sp:
+        tally = _tally(sp, tally)
+
+        energy_filter = tally.find_filter(openmc.EnergyFilter)
+        axis = tally.filters.index(energy_filter)
+
+        data = tally.get_reshaped_data(value=value)
+        data = data[..., 0, tally.get_score_index(score)]
+
+    return np.moveaxis(data, axis, -1), energy_filter.values
+
+
+def _materials(materials):
+    """openmc.Material objects from materials or database names"""
+
+    if isinstance(materials, (str, openmc.Material)):
+        materials = [materials]
+
+    library = None
+    found = []
+    for material in materials:
+        if isinstance(material, str):
+            library = library or database()
+            material = library[material]
+        found.append(material)
+
+    return found
+
+
+def fold(spectra, responses):
+    """Fold group spectra with group responses
+
+    Parameters
+    ----------
+    spectra : numpy.ndarray
+        spectra with the groups along the last axis
+    responses : numpy.ndarray
+        responses with the groups along the last axis, e.g. (reactions x
+        groups) or (materials x reactions x groups)
+
+    Returns
+    -------
+    numpy.ndarray
+        spectra axes followed by the responses axes (groups excluded)
+    """
+
+    return np.tensordot(spectra, responses, axes=([-1], [-1]))
+
+
+def reaction_rates(spectra, structure, materials, reactions=default_reactions, volume: float = 1.,
+                   temperature: float = 294.):
+    """Reaction rate densities obtained by folding stored flux spectra with
+    the cached response functions of any material, without a dedicated tally
+
+    Parameters
+    ----------
+    spectra : numpy.ndarray
+        flux spectra (particle-cm per source) with the groups along the last
+        axis, e.g. from tally_spectra
+    structure : str or iterable of float
+        group structure name or boundaries in eV of the spectra
+    materials : str, openmc.Material or iterable
+        materials, or names of materials of the database
+    reactions : iterable of str or int, optional
+        reaction names or MT numbers, by default the responses of
+        response.reactions
+    volume : float or numpy.ndarray, optional
+        volume of the tally bins (cm3), broadcast against the spectra
+        without their group axis, by default 1.
+    temperature : float, optional
+        temperature in K, by default 294.
+
+    Returns
+    -------
+    numpy.ndarray
+        spectra axes followed by (materials x reactions), in reactions per
+        source particle per cm3 (eV per source particle per cm3 for heating
+        and damage energy)
+    """
+
+    responses = np.stack([response_functions(material, structure, reactions, temperature)
+                          for material in _materials(materials)])
+
+    spectra = np.asarray(spectra, dtype=float)
+    volume = np.asarray(volume, dtype=float)[..., np.newaxis, np.newaxis]
+
+    return fold(spectra, responses) / volume
+
+
+def appm_per_fpy(spectra, structure, materials, reactions=gas_reactions, volume: float = 1.,
+                 fusion_power: float = 500e6, temperature: float = 294.):
+    """Gas production (or any other reaction) rates in atomic parts per
+    million per full power year, folding stored flux spectra with the cached
+    response functions
+
+    Parameters
+    ----------
+    spectra : numpy.ndarray
+        flux spectra (particle-cm per source) with the groups along the last
+        axis, e.g. from tally_spectra
+    structure : str or iterable of float
+        group structure name or boundaries in eV of the spectra
+    materials : str, openmc.Material or iterable
+        materials, or names of materials of the database
+    reactions : iterable of str or int, optional
+        reaction names or MT numbers, by default the gas production reactions
+    volume : float or numpy.ndarray, optional
+        volume of the tally bins (cm3), by default 1.
+    fusion_power : float, optional
+        fusion power (W), by default 500e6
+    temperature : float, optional
+        temperature in K, by default 294.
+
+    Returns
+    -------
+    numpy.ndarray
+        spectra axes followed by (materials x reactions), in appm/fpy
+    """
+
+    materials = _materials(materials)
+    rates = reaction_rates(spectra, structure, materials, reactions, volume, temperature)
+
+    # atoms/cm3
+    atom_densities = np.array([sum(material.get_nuclide_atom_densities().values())
+                               for material in materials]) * 1e24
+
+    return rates / atom_densities[:, np.newaxis] * 1e6 * source_rate(fusion_power) * _seconds_per_year
@@ -0,0 +1,304 @@
+import copy
+import glob
+import os
+import shutil
+import subprocess
+from pathlib import Path
+import openmc
+from tokamak_radiation_environment.results import merge_statepoints
+
+_schedulers = {'slurm': ('sbatch', 'job.sbatch'), 'pbs': ('qsub', 'job.pbs')}
+
+_slurm_template = """#!/bin/bash
+#SBATCH --job-name={job_name}
+#SBATCH --nodes={nodes}
+#SBATCH --ntasks-per-node={ranks_per_node}
+#SBATCH --cpus-per-task={threads}
+#SBATCH --time={walltime}
+{array}
+export OMP_NUM_THREADS={threads}
+export OMP_PLACES=cores
+export OMP_PROC_BIND=close
+
+cd {workdir}
+srun openmc -s {threads}
+"""
+
+_pbs_template = """#!/bin/bash
+#PBS -N {job_name}
+#PBS -l select={nodes}:ncpus={cores}:mpiprocs={ranks_per_node}:ompthreads={threads}
+#PBS -l walltime={walltime}
+{array}
+export OMP_NUM_THREADS={threads}
+export OMP_PLACES=cores
+export OMP_PROC_BIND=close
+
+cd {workdir}
+mpiexec -n {ranks} openmc -s {threads}
+"""
+
+
+def node_topology():
+    """Detect the topology of the node(s) the process is running on. The
+    number of nodes and cores per node are taken from the Slurm or PBS
+    environment when available.
+
+    Returns
+    -------
+    dict
+        'nodes', 'cores_per_node' and 'numa_per_node'
+    """
+
+    if hasattr(os, 'sched_getaffinity'):
+        cores = len(os.sched_getaffinity(0))
+    else:
+        cores = os.cpu_count() or 1
+
+    cores = int(os.environ.get('SLURM_CPUS_ON_NODE', os.environ.get('NCPUS', cores)))
+
+    nodes = os.environ.get('SLURM_JOB_NUM_NODES')
+    if nodes is None and 'PBS_NODEFILE' in os.environ:
+        with open(os.environ['PBS_NODEFILE']) as f:
+            nodes = len(set(f.read().split()))
+    nodes = int(nodes or 1)
+
+    numa = len(glob.glob('/sys/devices/system/node/node[0-9]*')) or 1
+    numa = min(numa, cores)
+
+    return {'nodes': nodes, 'cores_per_node': cores, 'numa_per_node': numa}
+
+
+def hybrid_layout(nodes: int = None, topology: dict = None):
+    """MPI x OpenMP layout with one MPI rank per NUMA domain and one OpenMP
+    thread per core of the domain
+
+    Parameters
+    ----------
+    nodes : int, optional
+        number of nodes, by default the detected number of nodes
+    topology : dict, optional
+        node topology as returned by node_topology, by default detected
+
+    Returns
+    -------
+    dict
+        'nodes', 'ranks_per_node', 'ranks' and 'threads'
+    """
+
+    if topology is None:
+        topology = node_topology()
+    if nodes is None:
+        nodes = topology['nodes']
+
+    ranks_per_node = topology['numa_per_node']
+    threads = max(topology['cores_per_node'] // ranks_per_node, 1)
+
+    return {'nodes': nodes, 'ranks_per_node': ranks_per_node,
+            'ranks': nodes * ranks_per_node, 'threads': threads}
+
+
+def run(model: openmc.Model, nodes: int = None, topology: dict = None, mpiexec: str = None,
+        dry_run: bool = False, **kwargs):
+    """Run the model locally with one OpenMP thread per core of the node or,
+    if an MPI launcher is given, with the hybrid MPI x OpenMP layout of the
+    nodes. MPI is opt-in: openmc has to be built with MPI, otherwise each
+    rank runs an independent copy of the model writing the same files.
+
+    Parameters
+    ----------
+    model : openmc.Model
+        model to run
+    nodes : int, optional
+        number of nodes, by default the detected number of nodes
+    topology : dict, optional
+        node topology as returned by node_topology, by default detected
+    mpiexec : str, optional
+        MPI launcher of an MPI build of openmc, e.g. 'mpiexec' or 'srun',
+        by default None (no MPI)
+    dry_run : bool, optional
+        if True return the command instead of running it, by default False
+    **kwargs
+        passed to openmc.Model.run
+
+    Returns
+    -------
+    pathlib.Path or list of str
+        path to the last statepoint, or the openmc command if dry_run
+
+    Raises
+    ------
+    FileNotFoundError
+        if the MPI launcher is not found
+    """
+
+    layout = hybrid_layout(nodes, topology)
+
+    if mpiexec is None:
+        mpi_args = None
+        threads = layout['ranks_per_node'] * layout['threads']
+    elif shutil.which(mpiexec):
+        mpi_args = [mpiexec, '-n', str(layout['ranks'])]
+        threads = layout['threads']
+    else:
+        raise FileNotFoundError(f"MPI launcher {mpiexec} not found")
+
+    if dry_run:
+        return (mpi_args or []) + ['openmc', '-s', str(threads)]
+
+    return model.run(threads=threads, mpi_args=mpi_args, **kwargs)
+
+
+def split_runs(model: openmc.Model, directory, n_runs: int, total_particles: int = None, seed: int = 1):
+    """Export the model as independent, differently seeded sub-runs sharing
+    the total number of histories. Once all of them are done, their
+    statepoints are merged with merge_runs.
+
+    Parameters
+    ----------
+    model : openmc.Model
+        model to split
+    directory : str or pathlib.Path
+        directory where the run_NNN sub-run directories are created
+    n_runs : int
+        number of sub-runs
+    total_particles : int, optional
+        total number of histories, by default particles x batches of the model
+    seed : int, optional
+        seed of the first sub-run, the following ones are incremented by one,
+        by default 1
+
+    Returns
+    -------
+    list of pathlib.Path
+        sub-run directories
+    """
+
+    sub_model = copy.copy(model)
+    sub_model.settings = copy.deepcopy(model.settings)
+    settings = sub_model.settings
+    batches = settings.batches
+
+    if total_particles is None:
+        total_particles = model.settings.particles * batches
+
+    settings.particles = -(-total_particles // (n_runs * batches))
+    settings.statepoint = {'batches': [batches]}
+
+    run_dirs = []
+    for i in range(n_runs):
+        run_dir = Path(directory) / f"run_{i:03d}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        settings.seed = seed + i
+        sub_model.export_to_xml(run_dir)
+        run_dirs.append(run_dir)
+
+    return run_dirs
+
+
+def job_script(workdir, scheduler: str = 'slurm', nodes: int = None, walltime: str = '24:00:00',
+               job_name: str = 'openmc', n_runs: int = None, topology: dict = None):
+    """Batch script running openmc with the hybrid MPI x OpenMP layout
+
+    Parameters
+    ----------
+    workdir : str or pathlib.Path
+        directory containing the model xml files, or the run_NNN sub-runs
+        created by split_runs if n_runs is given
+    scheduler : str, optional
+        'slurm' or 'pbs', by default 'slurm'
+    nodes : int, optional
+        number of nodes per job, by default the detected number of nodes
+    walltime : str, optional
+        walltime as HH:MM:SS, by default '24:00:00'
+    job_name : str, optional
+        name of the job, by default 'openmc'
+    n_runs : int, optional
+        number of sub-runs, submitted as a job array, by default None
+    topology : dict, optional
+        node topology as returned by node_topology, by default detected
+
+    Returns
+    -------
+    str
+        content of the batch script
+    """
+
+    if scheduler not in _schedulers:
+        raise ValueError(f"scheduler must be one of {list(_schedulers)}")
+
+    layout = hybrid_layout(nodes, topology)
+    workdir = Path(workdir).resolve()
+
+    if scheduler == 'slurm':
+        template = _slurm_template
+        array = f"#SBATCH --array=0-{n_runs - 1}" if n_runs else ""
+        task_id = '$SLURM_ARRAY_TASK_ID'
+    else:
+        template = _pbs_template
+        array = f"#PBS -J 0-{n_runs - 1}" if n_runs else ""
+        task_id = '$PBS_ARRAY_INDEX'
+
+    if n_runs:
+        workdir = f'{workdir}/$(printf "run_%03d" {task_id})'
+
+    return template.format(job_name=job_name, walltime=walltime, array=array, workdir=workdir,
+                           cores=layout['ranks_per_node'] * layout['threads'], **layout)
+
+
+def submit(workdir, scheduler: str = 'slurm', dry_run: bool = True, **kwargs):
+    """Write the batch script in workdir and submit it
+
+    Parameters
+    ----------
+    workdir : str or pathlib.Path
+        directory containing the model xml files or the sub-runs
+    scheduler : str, optional
+        'slurm' or 'pbs', by default 'slurm'
+    dry_run : bool, optional
+        if True only write the script, by default True
+    **kwargs
+        passed to job_script
+
+    Returns
+    -------
+    pathlib.Path
+        path to the batch script
+    """
+
+    command, filename = _schedulers.get(scheduler, (None, None))
+    script = job_script(workdir, scheduler=scheduler, **kwargs)
+
+    path = Path(workdir) / filename
+    path.write_text(script)
+
+    if not dry_run:
+        subprocess.run([command, path.name], cwd=workdir, check=True)
+
+    return path
+
+
+def merge_runs(run_dirs, output):
+    """Merge the last statepoint of each sub-run created by split_runs
+
+    Parameters
+    ----------
+    run_dirs : iterable of str or pathlib.Path
+        sub-run directories
+    output : str or pathlib.Path
+        path to the merged statepoint file
+
+    Returns
+    -------
+    pathlib.Path
+        path to the merged statepoint
+    """
+
+    statepoints = []
+    for run_dir in run_dirs:
+        paths = sorted(Path(run_dir).glob('statepoint.*.h5'),
+                       key=lambda path: int(path.suffixes[-2][1:]))
+        if not paths:
+            raise FileNotFoundError(f"no statepoint found in {run_dir}")
+        statepoints.append(paths[-1])
+
+    return merge_statepoints(statepoints, output)
@@ -1,4 +1,9 @@
+import collections
+import functools
+import re
+import numpy as np
 import openmc
+import openmc.data
 
 _material_list = ['dt_plasma', 'tungsten', 'beryllium', 'copper', 'silver', 'pbsn',
                   'ss304', 'ss316L', 'inconel718', 'nitronic50', 'hastelloy_c276',
@@ -279,3 +284,203 @@ def list_all():
     """
     for m in _material_list:
         print(m)
+
+
+def database():
+    """Materials of this database by name
+
+    Returns
+    -------
+    dict
+        material name (as in list_all) -> openmc.Material
+    """
+    found = {m.name.lower(): m for m in globals().values() if isinstance(m, openmc.Material)}
+    return {name: found[name.lower()] for name in _material_list}
+
+
+Composition = collections.namedtuple('Composition', ['names', 'nuclides', 'densities', 'atom_densities'])
+
+
+@functools.lru_cache(maxsize=None)
+def composition_matrix():
+    """Dense representation of the database, built once: atom density of
+    every nuclide in every material. Mixtures, comparisons of compositions
+    or reaction rates of all the materials are then matrix operations. The
+    cache has to be cleared (composition_matrix.cache_clear()) if database
+    materials are modified.
+
+    Returns
+    -------
+    Composition
+        names : numpy.ndarray of the material names (as in list_all)
+        nuclides : numpy.ndarray of the nuclide names, sorted by ZAM
+        densities : numpy.ndarray of the mass densities (g/cm3)
+        atom_densities : (materials x nuclides) numpy.ndarray of the atom
+        densities (atom/b-cm)
+    """
+    library = database()
+    densities = {name: m.get_nuclide_atom_densities() for name, m in library.items()}
+
+    nuclides = sorted({nuclide for d in densities.values() for nuclide in d}, key=openmc.data.zam)
+    index = {nuclide: i for i, nuclide in enumerate(nuclides)}
+
+    matrix = np.zeros((len(library), len(nuclides)))
+    for i, d in enumerate(densities.values()):
+        matrix[i, [index[nuclide] for nuclide in d]] = list(d.values())
+
+    composition = Composition(np.array(list(library)), np.array(nuclides),
+                              np.array([m.get_mass_density() for m in library.values()]), matrix)
+    for array in composition:
+        array.setflags(write=False)
+
+    return composition
+
+
+def _material(densities, name):
+    """New openmc.Material from (nuclide, atom density) pairs"""
+
+    material = openmc.Material(name=name)
+    for nuclide, density in densities:
+        material.add_nuclide(nuclide, density)
+    material.set_density('atom/b-cm', sum(density for _, density in densities))
+
+    return material
+
+
+@functools.lru_cache(maxsize=None)
+def _mixture(names, fractions, percent_type):
+    """(nuclide, atom density) pairs of a mixture of database materials"""
+
+    composition = composition_matrix()
+    rows = [int(np.flatnonzero(composition.names == n)[0]) for n in names]
+    fractions = np.array(fractions)
+
+    if percent_type == 'wo':
+        fractions = fractions / composition.densities[rows]
+    elif percent_type != 'vo':
+        raise ValueError("percent_type must be 'vo' or 'wo'")
+    fractions = fractions / fractions.sum()
+
+    atom_densities = fractions @ composition.atom_densities[rows]
+    nonzero = np.flatnonzero(atom_densities)
+
+    return tuple(zip(composition.nuclides[nonzero].tolist(), atom_densities[nonzero].tolist()))
+
+
+def mixture(names, fractions, percent_type: str = 'vo', name: str = None):
+    """Homogenized mixture of database materials, e.g. the structure,
+    coolant and breeder of a smeared blanket layer, computed from the
+    composition matrix. The atom densities are memoized per constituents
+    and fractions, and a new openmc.Material is returned on each call, so
+    that changing one mixture does not affect the others.
+
+    Parameters
+    ----------
+    names : iterable of str
+        names of the database materials to mix
+    fractions : iterable of float
+        volume ('vo') or weight ('wo') fraction of each material,
+        normalized to one
+    percent_type : str, optional
+        'vo' or 'wo', by default 'vo'
+    name : str, optional
+        name of the mixture, by default None
+
+    Returns
+    -------
+    openmc.Material
+    """
+    return _material(_mixture(tuple(names), tuple(float(f) for f in fractions), percent_type), name)
+
+
+def _formula_elements(formula: str):
+    """Number of atoms of each element of a simple chemical formula"""
+
+    elements = {}
+    for element, count in re.findall(r'([A-Z][a-z]?)(\d*)', formula):
+        elements[element] = elements.get(element, 0) + int(count or 1)
+
+    return elements
+
+
+@functools.lru_cache(maxsize=None)
+def _breeder(formulas):
+    """(element, atom fraction) pairs of a mixture of chemical formulas"""
+
+    elements = {}
+    for formula, fraction in formulas:
+        for element, count in _formula_elements(formula).items():
+            elements[element] = elements.get(element, 0) + fraction * count
+
+    return tuple(elements.items())
+
+
+def breeder(formulas: dict, density: float, enrichment: float = None, name: str = None):
+    """Lithium bearing breeder (salt, eutectic or pure metal) with a given
+    composition and Li-6 enrichment, e.g. breeder({'LiF': 66, 'BeF2': 34},
+    1.96, enrichment=90) for a 90% enriched FLiBe. The elemental composition
+    is cached per set of formulas and a new openmc.Material is returned on
+    each call.
+
+    Parameters
+    ----------
+    formulas : dict
+        chemical formula -> molar fraction (normalized), e.g. {'Pb': 84.2,
+        'Li': 15.8} for PbLi
+    density : float
+        mass density (g/cm3)
+    enrichment : float, optional
+        Li-6 enrichment (atom percent), by default None (natural lithium)
+    name : str, optional
+        name of the material, by default None
+
+    Returns
+    -------
+    openmc.Material
+    """
+    material = openmc.Material(name=name)
+    for element, amount in _breeder(tuple(formulas.items())):
+        if element == 'Li' and enrichment is not None:
+            material.add_element(element, amount, 'ao', enrichment=enrichment,
+                                 enrichment_target='Li6', enrichment_type='ao')
+        else:
+            material.add_element(element, amount, 'ao')
+    material.set_density('g/cm3', density)
+
+    return material
+
+
+@functools.lru_cache(maxsize=None)
+def _enriched(name, enrichment):
+    """(nuclide, atom density) pairs of a database breeder enriched in Li-6"""
+
+    densities = dict(database()[name].get_nuclide_atom_densities())
+
+    lithium = densities.pop('Li6', 0.) + densities.pop('Li7', 0.)
+    if not lithium:
+        raise ValueError(f"{name} does not contain lithium")
+    densities['Li6'] = enrichment / 100 * lithium
+    densities['Li7'] = (1 - enrichment / 100) * lithium
+
+    return tuple(densities.items())
+
+
+def enriched(name: str, enrichment: float):
+    """Breeder of this database (e.g. 'flibe', 'pbli', 'lifnafrzf4') with
+    its lithium enriched in Li-6. The number of atoms per unit volume is kept,
+    the mass density follows the enrichment. The atom densities are cached
+    per breeder and enrichment and a new openmc.Material is returned on each
+    call.
+
+    Parameters
+    ----------
+    name : str
+        name of the database material
+    enrichment : float
+        Li-6 enrichment (atom percent)
+
+    Returns
+    -------
+    openmc.Material
+    """
+    return _material(_enriched(name, float(enrichment)), f"{name}_li6_{enrichment:g}")
@@ -0,0 +1,483 @@
+import hashlib
+import json
+import warnings
+import numpy as np
+import pandas as pd
+import openmc
+from tokamak_radiation_environment.response import cache_dir
+from tokamak_radiation_environment.results import _statepoint, _tally
+from tokamak_radiation_environment.spectra import group_structure
+
+
+def _polygons(component):
+    """openmc.model.Polygon surfaces of a component"""
+
+    surfaces = component.surfaces
+    if isinstance(surfaces, dict):
+        surfaces = surfaces.values()
+    elif not isinstance(surfaces, (tuple, list)):
+        surfaces = [surfaces]
+
+    return [surface for surface in surfaces if isinstance(surface, openmc.model.Polygon)]
+
+
+def component_extent(components):
+    """(r, z) extent of components from the nodes of their polygons
+
+    Parameters
+    ----------
+    components : iterable of Component
+        components, e.g. Reactor.components.values()
+
+    Returns
+    -------
+    tuple of four floats
+        r_min, r_max, z_min, z_max (cm)
+
+    Raises
+    ------
+    ValueError
+        if the components have no polygon surface
+    """
+
+    points = [polygon.points for component in components for polygon in _polygons(component)]
+    if not points:
+        raise ValueError("the extent is computed from the polygon surfaces, the components have none")
+    points = np.concatenate(points)
+
+    return points[:, 0].min(), points[:, 0].max(), points[:, 1].min(), points[:, 1].max()
+
+
+def cylindrical_mesh(components, angle=None, resolution=(2., 1., 2.), padding: float = 0.):
+    """openmc.CylindricalMesh covering the components within the toroidal
+    sector. CylindricalMesh does not accept negative angles: a sector lying
+    below phi = 0 is shifted by 360 deg, and a sector straddling phi = 0
+    (e.g. sector_angle(n_tf_coils)) is meshed over its upper part only,
+    with a warning. For a sector symmetric about phi = 0 the lower half is
+    the mirror image of the upper half.
+
+    Parameters
+    ----------
+    components : iterable of Component
+        components to cover, e.g. the TF coil components for a
+        magnet-resolved tally
+    angle : tuple of two floats, optional
+        toroidal sector in deg, by default None (full torus)
+    resolution : tuple of three floats, optional
+        maximum size of the bins in r (cm), phi (deg) and z (cm), by default
+        (2., 1., 2.)
+    padding : float, optional
+        margin added around the components in r and z (cm), by default 0.
+
+    Returns
+    -------
+    openmc.CylindricalMesh
+    """
+
+    r_min, r_max, z_min, z_max = component_extent(components)
+    r_min, r_max = max(r_min - padding, 0.), r_max + padding
+    z_min, z_max = z_min - padding, z_max + padding
+
+    phi_min, phi_max = (0., 360.) if angle is None else angle
+    if phi_max <= 0:
+        phi_min, phi_max = phi_min + 360., phi_max + 360.
+    elif phi_min < 0:
+        warnings.warn(f"the sector ({phi_min:g}, {phi_max:g}) deg straddles phi = 0, "
+                      f"only (0, {phi_max:g}) deg is meshed")
+        phi_min = 0.
+
+    dr, dphi, dz = resolution
+    n_r = int(np.ceil((r_max - r_min) / dr))
+    n_phi = int(np.ceil((phi_max - phi_min) / dphi))
+    n_z = int(np.ceil((z_max - z_min) / dz))
+
+    return openmc.CylindricalMesh(r_grid=np.linspace(r_min, r_max, n_r + 1),
+                                  phi_grid=np.radians(np.linspace(phi_min, phi_max, n_phi + 1)),
+                                  z_grid=np.linspace(z_min, z_max, n_z + 1))
+
+
+def mesh_tally(mesh, scores=('flux',), energies=None, particles=('neutron',), tally_id: int = None,
+               name: str = None):
+    """Mesh tally with particle and energy filters
+
+    Parameters
+    ----------
+    mesh : openmc.MeshBase
+        mesh of the tally, e.g. from cylindrical_mesh
+    scores : iterable of str, optional
+        scores of the tally, by default ('flux',)
+    energies : str or iterable of float, optional
+        group structure name or boundaries in eV, by default None (no energy
+        filter)
+    particles : iterable of str, optional
+        particles of the particle filter, by default ('neutron',)
+    tally_id : int, optional
+        id of the tally, by default automatically assigned
+    name : str, optional
+        name of the tally, by default None
+
+    Returns
+    -------
+    openmc.Tally
+    """
+
+    tally = openmc.Tally(tally_id=tally_id, name=name)
+    tally.filters = [openmc.ParticleFilter(list(particles)), openmc.MeshFilter(mesh)]
+    if energies is not None:
+        tally.filters.append(openmc.EnergyFilter(group_structure(energies)))
+    tally.scores = list(scores)
+
+    return tally
+
+
+def voxel_centers(mesh):
+    """Centers of the mesh voxels, in the order of the mesh filter bins
+
+    Parameters
+    ----------
+    mesh : openmc.RegularMesh or openmc.CylindricalMesh
+
+    Returns
+    -------
+    numpy.ndarray
+        (voxels x 3) x, y, z coordinates (cm)
+    """
+
+    if isinstance(mesh, openmc.CylindricalMesh):
+        r, phi, z = (0.5 * (grid[1:] + grid[:-1]) for grid in (mesh.r_grid, mesh.phi_grid, mesh.z_grid))
+        z, phi, r = np.meshgrid(z, phi, r, indexing='ij')
+        x, y = r * np.cos(phi), r * np.sin(phi)
+        points = np.stack([x.ravel(), y.ravel(), z.ravel()], axis=-1)
+        return points + np.asarray(mesh.origin, dtype=float)
+
+    if isinstance(mesh, openmc.RegularMesh):
+        x, y, z = ((np.arange(n) + 0.5) * (high - low) / n + low
+                   for low, high, n in zip(mesh.lower_left, mesh.upper_right, mesh.dimension))
+        z, y, x = np.meshgrid(z, y, x, indexing='ij')
+        return np.stack([x.ravel(), y.ravel(), z.ravel()], axis=-1)
+
+    raise TypeError("only regular and cylindrical meshes are supported")
+
+
+def _evaluate(surface, points):
+    """Value of the surface equation at each point, from the coefficients of
+    the planes, cylinders, cones, spheres and quadrics the polygons and the
+    sector planes are made of"""
+
+    x, y, z = points.T
+    c = surface.coefficients
+
+    if isinstance(surface, openmc.XPlane):
+        return x - c['x0']
+    if isinstance(surface, openmc.YPlane):
+        return y - c['y0']
+    if isinstance(surface, openmc.ZPlane):
+        return z - c['z0']
+    if isinstance(surface, openmc.Plane):
+        return c['a'] * x + c['b'] * y + c['c'] * z - c['d']
+
+    if isinstance(surface, openmc.Quadric):
+        return (c['a'] * x * x + c['b'] * y * y + c['c'] * z * z + c['d'] * x * y + c['e'] * y * z
+                + c['f'] * x * z + c['g'] * x + c['h'] * y + c['j'] * z + c['k'])
+
+    dx, dy, dz = x - c.get('x0', 0.), y - c.get('y0', 0.), z - c.get('z0', 0.)
+
+    if isinstance(surface, openmc.XCylinder):
+        return dy * dy + dz * dz - c['r']**2
+    if isinstance(surface, openmc.YCylinder):
+        return dx * dx + dz * dz - c['r']**2
+    if isinstance(surface, openmc.ZCylinder):
+        return dx * dx + dy * dy - c['r']**2
+    if isinstance(surface, openmc.Sphere):
+        return dx * dx + dy * dy + dz * dz - c['r']**2
+    if isinstance(surface, openmc.XCone):
+        return dy * dy + dz * dz - c['r2'] * dx * dx
+    if isinstance(surface, openmc.YCone):
+        return dx * dx + dz * dz - c['r2'] * dy * dy
+    if isinstance(surface, openmc.ZCone):
+        return dx * dx + dy * dy - c['r2'] * dz * dz
+
+    raise TypeError(f"unsupported surface {type(surface).__name__}")
+
+
+def region_contains(region, points, values: dict = None):
+    """Vectorized point-in-region test walking the region tree
+
+    Parameters
+    ----------
+    region : openmc.Region
+        region made of planes and quadric surfaces
+    points : numpy.ndarray
+        (points x 3) x, y, z coordinates (cm)
+    values : dict, optional
+        surface id -> surface equation values at the points, filled as the
+        surfaces are evaluated so that surfaces shared between regions are
+        evaluated once, by default None
+
+    Returns
+    -------
+    numpy.ndarray of bool
+    """
+
+    if values is None:
+        values = {}
+
+    if isinstance(region, openmc.Halfspace):
+        surface = region.surface
+        if surface.id not in values:
+            values[surface.id] = _evaluate(surface, points)
+        return values[surface.id] > 0 if region.side == '+' else values[surface.id] < 0
+
+    if isinstance(region, openmc.Complement):
+        return ~region_contains(region.node, points, values)
+
+    if isinstance(region, openmc.Intersection):
+        inside = np.ones(len(points), dtype=bool)
+        for node in region:
+            inside &= region_contains(node, points, values)
+        return inside
+
+    if isinstance(region, openmc.Union):
+        inside = np.zeros(len(points), dtype=bool)
+        for node in region:
+            inside |= region_contains(node, points, values)
+        return inside
+
+    raise TypeError(f"unsupported region {type(region)}")
+
+
+def classify(mesh, cells: dict, chunk_size: int = 100000):
+    """Component containing the center of each voxel of a mesh
+
+    Parameters
+    ----------
+    mesh : openmc.RegularMesh or openmc.CylindricalMesh
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.cells
+    chunk_size : int, optional
+        number of voxels classified at once, bounding the memory used by
+        the surface values, by default 100000
+
+    Returns
+    -------
+    numpy.ndarray of int
+        index of the component (in the order of cells) of each voxel, in
+        the order of the mesh filter bins, -1 outside all the components
+    """
+
+    points = voxel_centers(mesh)
+    component = np.full(len(points), -1)
+
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        found = component[start:start + chunk_size]
+        values = {}
+        for i, cell in enumerate(cells.values()):
+            found[region_contains(cell.region, chunk, values) & (found < 0)] = i
+
+    return component
+
+
+def _masks_key(mesh, cells: dict):
+    """Hash of the mesh and of the component regions and surfaces"""
+
+    if isinstance(mesh, openmc.CylindricalMesh):
+        grids = [mesh.r_grid, mesh.phi_grid, mesh.z_grid, mesh.origin]
+    else:
+        grids = [mesh.lower_left, mesh.upper_right, mesh.dimension]
+
+    surfaces = {}
+    for cell in cells.values():
+        for surface_id, surface in cell.region.get_surfaces().items():
+            surfaces[surface_id] = [type(surface).__name__,
+                                    sorted((key, float(value)) for key, value in surface.coefficients.items())]
+
+    content = json.dumps({'mesh': [type(mesh).__name__] + [np.asarray(g, dtype=float).tolist() for g in grids],
+                          'cells': [[name, str(cell.region)] for name, cell in cells.items()],
+                          'surfaces': sorted(surfaces.items())})
+
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def component_masks(mesh, cells: dict, use_cache: bool = True, **kwargs):
+    """Component of each voxel of a mesh (see classify), computed once per
+    mesh and geometry and cached on disk (see response.cache_dir)
+
+    Parameters
+    ----------
+    mesh : openmc.RegularMesh or openmc.CylindricalMesh
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.cells
+    use_cache : bool, optional
+        if False the voxels are classified again, by default True
+    **kwargs
+        passed to classify
+
+    Returns
+    -------
+    numpy.ndarray of int
+        index of the component (in the order of cells) of each voxel, -1
+        outside all the components
+    """
+
+    path = cache_dir('masks') / f"{_masks_key(mesh, cells)}.npy"
+    if use_cache and path.exists():
+        return np.load(path)
+
+    masks = classify(mesh, cells, **kwargs)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, masks)
+
+    return masks
+
+
+def voxel_volumes(mesh):
+    """Volume of the voxels, in the order of the mesh filter bins
+
+    Parameters
+    ----------
+    mesh : openmc.RegularMesh or openmc.CylindricalMesh
+
+    Returns
+    -------
+    numpy.ndarray
+        volumes (cm3)
+    """
+
+    if isinstance(mesh, openmc.CylindricalMesh):
+        r, phi, z = mesh.r_grid, mesh.phi_grid, mesh.z_grid
+        dz, dphi, area = np.meshgrid(np.diff(z), np.diff(phi), 0.5 * np.diff(np.square(r)), indexing='ij')
+        return (area * dphi * dz).ravel()
+
+    if isinstance(mesh, openmc.RegularMesh):
+        width = (np.asarray(mesh.upper_right) - np.asarray(mesh.lower_left)) / np.asarray(mesh.dimension)
+        return np.full(int(np.prod(mesh.dimension)), np.prod(width))
+
+    raise TypeError("only regular and cylindrical meshes are supported")
+
+
+def component_reductions(values, masks, names, volumes=None, percentiles=(95.,)):
+    """Maximum, mean, volume-weighted integral and percentiles of mesh
+    values inside each component, for all the components and fields at
+    once (bincount over the voxel labels and a single lexsort)
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        values per voxel, (voxels) or (fields x voxels), e.g. a flux or
+        heating density
+    masks : numpy.ndarray of int
+        component index of each voxel, from component_masks
+    names : iterable of str
+        component names, in the order of the indices of masks
+    volumes : numpy.ndarray, optional
+        voxel volumes (cm3), by default all ones
+    percentiles : iterable of float, optional
+        percentiles (0-100) of the voxel values, by default (95.,)
+
+    Returns
+    -------
+    pandas.DataFrame
+        one row per (field, component) with the volume, max, mean, volume
+        weighted mean, integral and percentiles. Components without any
+        voxel have a zero volume and integral and NaN statistics.
+    """
+
+    names = list(names)
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    n_fields, n_voxels = values.shape
+    n_components = len(names)
+    volumes = np.ones(n_voxels) if volumes is None else np.asarray(volumes, dtype=float)
+
+    inside = masks >= 0
+    labels = (masks[inside] + n_components * np.arange(n_fields)[:, np.newaxis]).ravel()
+    data = values[:, inside].ravel()
+    weights = np.tile(volumes[inside], n_fields)
+    n_labels = n_components * n_fields
+
+    count = np.bincount(labels, minlength=n_labels)
+    volume = np.bincount(labels, weights=weights, minlength=n_labels)
+    integral = np.bincount(labels, weights=data * weights, minlength=n_labels)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reductions = {'volume': volume,
+                      'mean': np.bincount(labels, weights=data, minlength=n_labels) / count,
+                      'volume_mean': integral / volume,
+                      'integral': integral}
+
+    index = pd.MultiIndex.from_product([range(n_fields), names], names=['field', 'component'])
+
+    if not data.size:
+        # no voxel inside any component
+        for key in ['max'] + [f"p{q:g}" for q in percentiles]:
+            reductions[key] = np.full(n_labels, np.nan)
+        return pd.DataFrame(reductions, index=index)
+
+    # values sorted per label: maximum and percentiles are read at offsets
+    sorted_data = data[np.lexsort((data, labels))]
+    start = np.concatenate([[0], np.cumsum(count)[:-1]])
+    empty = count == 0
+
+    reductions['max'] = np.where(empty, np.nan, sorted_data[np.maximum(start + count - 1, 0)])
+    for q in percentiles:
+        rank = q / 100 * np.maximum(count - 1, 0)
+        low = np.minimum(start + np.floor(rank).astype(int), len(sorted_data) - 1)
+        high = np.minimum(start + np.ceil(rank).astype(int), len(sorted_data) - 1)
+        value = sorted_data[low] + (rank - np.floor(rank)) * (sorted_data[high] - sorted_data[low])
+        reductions[f"p{q:g}"] = np.where(empty, np.nan, value)
+
+    return pd.DataFrame(reductions, index=index)
+
+
+def tally_reductions(statepoint, tally, cells: dict, score: str = None, percentiles=(95.,),
+                     nuclide: str = 'total', **kwargs):
+    """Reductions of a mesh tally inside each component
+
+    Parameters
+    ----------
+    statepoint : openmc.StatePoint or str
+        statepoint or path to the statepoint file
+    tally : int, str or openmc.Tally
+        tally id, tally name or tally with a regular or cylindrical mesh
+        filter
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.cells
+    score : str, optional
+        score to reduce, by default the first score of the tally
+    percentiles : iterable of float, optional
+        percentiles (0-100) of the voxel values, by default (95.,)
+    nuclide : str, optional
+        nuclide of the tally to reduce, by default 'total'
+    **kwargs
+        passed to component_masks
+
+    Returns
+    -------
+    pandas.DataFrame
+        see component_reductions, the mean and max values being per unit
+        volume, one field per bin of the other filters of the tally
+
+    Raises
+    ------
+    ValueError
+        if the tally does not score the nuclide
+    """
+
+    with _statepoint(statepoint) as sp:
+        tally = _tally(sp, tally)
+
+        mesh_filter = tally.find_filter(openmc.MeshFilter)
+        axis = tally.filters.index(mesh_filter)
+        mesh = mesh_filter.mesh
+
+        if nuclide not in tally.nuclides:
+            raise ValueError(f"tally {tally.id} scores {', '.join(tally.nuclides)}, not {nuclide}")
+
+        data = tally.get_reshaped_data(value='mean')
+        data = data[..., tally.get_nuclide_index(nuclide), tally.get_score_index(score or tally.scores[0])]
+    data = np.moveaxis(data, axis, -1).reshape(-1, data.shape[axis])
+
+    volumes = voxel_volumes(mesh)
+    masks = component_masks(mesh, cells, **kwargs)
+
+    return component_reductions(data / volumes, masks, cells, volumes, percentiles)
@@ -0,0 +1,244 @@
+import copy
+import hashlib
+import json
+import re
+from pathlib import Path
+import openmc
+import openmc.mgxs
+from tokamak_radiation_environment import launcher
+from tokamak_radiation_environment.response import cache_dir
+from tokamak_radiation_environment.spectra import group_structure
+
+mgxs_types = ('total', 'absorption', 'nu-scatter matrix', 'multiplicity matrix')
+
+# scores of the continuous energy tallies that are kept in multigroup mode
+multigroup_scores = ('flux', 'total', 'absorption', 'scatter')
+
+
+def _domains(cells: dict):
+    """Component cells filled with a material"""
+
+    return {name: cell for name, cell in cells.items() if isinstance(cell.fill, openmc.Material)}
+
+
+def _multigroup_tallies(tallies):
+    """Copies of the tallies restricted to the multigroup scores, summed
+    over the nuclides. Tallies left without score are dropped."""
+
+    mg_tallies = openmc.Tallies()
+    for tally in tallies:
+        scores = [score for score in tally.scores if score in multigroup_scores]
+        if not scores:
+            continue
+        tally = copy.deepcopy(tally)
+        tally.scores = scores
+        tally.nuclides = []
+        mg_tallies.append(tally)
+
+    return mg_tallies
+
+
+def _region_key(region):
+    """Description of a region independent of the surface ids: each id is
+    replaced by the type, coefficients and boundary condition of its
+    surface"""
+
+    surfaces = region.get_surfaces()
+
+    def describe(match):
+        surface = surfaces[int(match.group())]
+        coefficients = sorted((key, round(float(value), 9)) for key, value in surface.coefficients.items())
+        return repr((type(surface).__name__, coefficients, surface.boundary_type))
+
+    return re.sub(r'\d+', describe, str(region))
+
+
+def component_keys(cells: dict, groups='CASMO-70', legendre_order: int = 0):
+    """Hash identifying the multigroup cross sections of each component: the
+    material composition, the region the spectrum is collapsed over and the
+    group structure. A component keeps its key, and its cached cross
+    sections, as long as its material and surfaces are unchanged, even if
+    other components of the model change.
+
+    Parameters
+    ----------
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.cells
+    groups : str or iterable of float, optional
+        group structure name or boundaries in eV, by default 'CASMO-70'
+    legendre_order : int, optional
+        scattering order, by default 0
+
+    Returns
+    -------
+    dict
+        component name -> sha256 hex digest, for the cells filled with a
+        material
+    """
+
+    edges = group_structure(groups).tolist()
+
+    keys = {}
+    for name, cell in _domains(cells).items():
+        densities = sorted((nuclide, float(density))
+                           for nuclide, density in cell.fill.get_nuclide_atom_densities().items())
+        content = json.dumps({'densities': densities,
+                              'temperature': cell.fill.temperature,
+                              'region': _region_key(cell.region),
+                              'groups': edges,
+                              'legendre_order': legendre_order,
+                              'mgxs_types': list(mgxs_types)})
+        keys[name] = hashlib.sha256(content.encode()).hexdigest()
+
+    return keys
+
+
+def generate(model: openmc.Model, cells: dict, groups='CASMO-70', directory='mgxs', legendre_order: int = 0,
+             use_cache: bool = True, **kwargs):
+    """Multigroup cross sections of each component cell from one continuous
+    energy run of the model. The cross sections of each component are cached
+    (see response.cache_dir) under its component_keys hash, and the run only
+    tallies the components whose material or surfaces changed. No run is
+    done if they are all cached.
+
+    Parameters
+    ----------
+    model : openmc.Model
+        continuous energy model
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.cells
+    groups : str or iterable of float, optional
+        group structure name (e.g. 'TRIPOLI-315') or boundaries in eV, by
+        default 'CASMO-70'
+    directory : str or pathlib.Path, optional
+        directory of the continuous energy run and of the library, by
+        default 'mgxs'
+    legendre_order : int, optional
+        scattering order, by default 0
+    use_cache : bool, optional
+        if False the cross sections of all the components are regenerated,
+        by default True
+    **kwargs
+        passed to launcher.run
+
+    Returns
+    -------
+    pathlib.Path
+        path to the mgxs.h5 library, with one macroscopic xsdata named as
+        each component
+    """
+
+    domains = _domains(cells)
+    keys = component_keys(cells, groups, legendre_order)
+    energy_groups = openmc.mgxs.EnergyGroups(group_structure(groups))
+
+    cache = cache_dir('mgxs')
+    missing = {name: cell for name, cell in domains.items()
+               if not use_cache or not (cache / f"{keys[name]}.h5").exists()}
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    if missing:
+        library = openmc.mgxs.Library(model.geometry)
+        library.energy_groups = energy_groups
+        library.mgxs_types = list(mgxs_types)
+        library.domain_type = 'cell'
+        library.domains = list(missing.values())
+        library.correction = None
+        library.scatter_format = 'legendre'
+        library.legendre_order = legendre_order
+        library.by_nuclide = False
+        library.build_library()
+
+        ce_model = copy.copy(model)
+        ce_model.tallies = openmc.Tallies(model.tallies)
+        library.add_to_tallies_file(ce_model.tallies, merge=True)
+
+        statepoint = launcher.run(ce_model, cwd=directory, **kwargs)
+
+        with openmc.StatePoint(statepoint) as sp:
+            library.load_from_statepoint(sp)
+
+        mgxs_file = library.create_mg_library(xs_type='macro', xsdata_names=list(missing))
+
+        cache.mkdir(parents=True, exist_ok=True)
+        for name in missing:
+            entry = openmc.MGXSLibrary(energy_groups)
+            entry.add_xsdata(mgxs_file.get_by_name(name))
+            entry.export_to_hdf5(str(cache / f"{keys[name]}.h5"))
+
+    mgxs_file = openmc.MGXSLibrary(energy_groups)
+    for name in domains:
+        xsdata = openmc.MGXSLibrary.from_hdf5(str(cache / f"{keys[name]}.h5")).xsdatas[0]
+        xsdata.name = name
+        mgxs_file.add_xsdata(xsdata)
+
+    path = directory / 'mgxs.h5'
+    mgxs_file.export_to_hdf5(str(path))
+
+    return path
+
+
+def multigroup_model(model: openmc.Model, cells: dict, library, random_ray: dict = None, tallies=None):
+    """Copy of the model running in multigroup mode with the library
+    generated for its components. The geometry is the same, each component
+    cell is filled with the macroscopic cross sections named after it.
+    Reaction scores (e.g. gas production or heating) have no macroscopic
+    multigroup data, so the continuous energy tallies are restricted to the
+    multigroup_scores and tallies left without score are dropped.
+
+    Parameters
+    ----------
+    model : openmc.Model
+        continuous energy model
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.cells
+    library : str or pathlib.Path
+        path to the library returned by generate
+    random_ray : dict, optional
+        random ray settings (e.g. {'distance_inactive': 100.,
+        'distance_active': 500.}), by default None (multigroup Monte Carlo).
+        The ray source is uniform over the bounding box of the geometry
+        unless 'ray_source' is given.
+    tallies : iterable of openmc.Tally, optional
+        tallies of the multigroup model, by default the tallies of the model
+        restricted to the multigroup scores
+
+    Returns
+    -------
+    openmc.Model
+    """
+
+    mg_model = copy.copy(model)
+    mg_model.geometry = copy.deepcopy(model.geometry)
+    mg_model.settings = copy.deepcopy(model.settings)
+
+    if tallies is None:
+        tallies = _multigroup_tallies(model.tallies)
+    mg_model.tallies = openmc.Tallies(tallies)
+
+    geometry_cells = mg_model.geometry.get_all_cells()
+
+    materials = openmc.Materials()
+    materials.cross_sections = str(library)
+    for name, cell in _domains(cells).items():
+        material = openmc.Material(name=name)
+        material.set_density('macro', 1.)
+        material.add_macroscopic(name)
+        geometry_cells[cell.id].fill = material
+        materials.append(material)
+    mg_model.materials = materials
+
+    settings = mg_model.settings
+    settings.energy_mode = 'multi-group'
+
+    if random_ray is not None:
+        random_ray = dict(random_ray)
+        if 'ray_source' not in random_ray:
+            lower_left, upper_right = mg_model.geometry.bounding_box
+            random_ray['ray_source'] = openmc.IndependentSource(
+                space=openmc.stats.Box(lower_left, upper_right))
+        settings.random_ray = random_ray
+
+    return mg_model
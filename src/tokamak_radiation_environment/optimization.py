@@ -0,0 +1,248 @@
+import itertools
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import scipy.optimize
+import scipy.stats.qmc
+from tokamak_radiation_environment import launcher
+
+
+def latin_hypercube(bounds: dict, n_points: int, seed: int = None):
+    """Latin hypercube design of experiments
+
+    Parameters
+    ----------
+    bounds : dict
+        parameter name -> (lower, upper)
+    n_points : int
+        number of points
+    seed : int, optional
+        random seed, by default None
+
+    Returns
+    -------
+    list of dict
+        parameter name -> value, one dict per point
+    """
+
+    names = list(bounds)
+    lower, upper = np.array([bounds[name] for name in names], dtype=float).T
+
+    sample = scipy.stats.qmc.LatinHypercube(d=len(names), seed=seed).random(n_points)
+    points = scipy.stats.qmc.scale(sample, lower, upper)
+
+    return [dict(zip(names, point)) for point in points]
+
+
+class AttenuationFit:
+    def __init__(self, thicknesses, fluences):
+        """Exponential attenuation surrogate of the fluence behind a stack of
+        layers, log(F) = log(F0) - sum_i mu_i t_i, fitted by least squares
+
+        Parameters
+        ----------
+        thicknesses : numpy.ndarray
+            (points x layers) layer thicknesses (cm)
+        fluences : numpy.ndarray
+            fluence of each point. Points that did not score (zero, negative
+            or NaN fluence) carry no information on the attenuation and are
+            left out of the fit.
+
+        Raises
+        ------
+        ValueError
+            if fewer points than fitted coefficients have a positive fluence
+        """
+
+        thicknesses = np.atleast_2d(np.asarray(thicknesses, dtype=float))
+        fluences = np.asarray(fluences, dtype=float)
+
+        scored = np.isfinite(fluences) & (fluences > 0)
+        if scored.sum() < thicknesses.shape[1] + 1:
+            raise ValueError(f"{scored.sum()} points with a positive fluence, at least "
+                             f"{thicknesses.shape[1] + 1} are needed to fit the attenuation")
+
+        thicknesses = thicknesses[scored]
+        log_fluences = np.log(fluences[scored])
+
+        matrix = np.column_stack([np.ones(len(thicknesses)), -thicknesses])
+        coefficients, *_ = np.linalg.lstsq(matrix, log_fluences, rcond=None)
+
+        self.log_f0 = coefficients[0]
+        self.mu = coefficients[1:]
+
+        residuals = log_fluences - matrix @ coefficients
+        dof = max(len(log_fluences) - len(coefficients), 1)
+        self.sigma = np.sqrt((residuals**2).sum() / dof)
+
+    def __call__(self, thicknesses):
+        """Predicted fluence
+
+        Parameters
+        ----------
+        thicknesses : numpy.ndarray
+            (points x layers) or (layers,) layer thicknesses (cm)
+
+        Returns
+        -------
+        numpy.ndarray or float
+        """
+
+        return np.exp(self.log_f0 - np.asarray(thicknesses, dtype=float) @ self.mu)
+
+    def minimum_build(self, target: float, lower, upper, margin: float = 0.):
+        """Thinnest stack of layers meeting a fluence target according to
+        the surrogate
+
+        Parameters
+        ----------
+        target : float
+            maximum fluence
+        lower : iterable of float
+            minimum thickness of each layer (cm)
+        upper : iterable of float
+            maximum thickness of each layer (cm)
+        margin : float, optional
+            safety margin on log(target), e.g. the fit residual sigma, by
+            default 0.
+
+        Returns
+        -------
+        numpy.ndarray or None
+            thickness of each layer (cm), None if the target cannot be met
+            within the bounds
+        """
+
+        # minimize sum(t) subject to mu . t >= log(F0) - log(target) + margin
+        result = scipy.optimize.linprog(c=np.ones(len(self.mu)), A_ub=[-self.mu],
+                                        b_ub=[np.log(target) - self.log_f0 - margin],
+                                        bounds=list(zip(lower, upper)))
+
+        return result.x if result.success else None
+
+
+def deck_evaluator(deck, fluence, directory='optimization', **kwargs):
+    """Evaluation function running a reference deck with modified core
+    parameters
+
+    Parameters
+    ----------
+    deck : module
+        deck providing core_parameters and build_model, e.g. the
+        reactors/<name>/openmc_model.py modules
+    fluence : callable
+        function of the statepoint path returning the fluence to minimize,
+        e.g. the TF coil flux of the spectrum tally
+    directory : str or pathlib.Path, optional
+        directory of the point_NNN run directories, by default 'optimization'
+    **kwargs
+        passed to launcher.run
+
+    Returns
+    -------
+    callable
+        function of the parameters dict returning the fluence
+    """
+
+    counter = itertools.count()
+
+    def evaluate(parameters):
+        core_parameters = deck.core_parameters
+        deck.core_parameters = dict(core_parameters, **parameters)
+        try:
+            model = deck.build_model()
+        finally:
+            deck.core_parameters = core_parameters
+
+        cwd = Path(directory) / f"point_{next(counter):03d}"
+        cwd.mkdir(parents=True, exist_ok=True)
+
+        return fluence(launcher.run(model, cwd=cwd, **kwargs))
+
+    return evaluate
+
+
+def optimize_shield(evaluate, bounds: dict, target: float, choices: dict = None, n_initial: int = None,
+                    max_runs: int = 20, tolerance: float = 0.1, seed: int = None):
+    """Thinnest radial build meeting a fluence target. For each combination
+    of the discrete choices (e.g. the shield material) a sparse latin
+    hypercube design is run, an exponential attenuation surrogate is
+    fitted and the next point is the minimum build the surrogate predicts
+    for the target, until the simulated fluence is within tolerance below
+    the target.
+
+    Parameters
+    ----------
+    evaluate : callable
+        function of the parameters dict returning the fluence, e.g. from
+        deck_evaluator
+    bounds : dict
+        thickness parameter name -> (lower, upper) in cm, e.g.
+        {'blanket_thickness': (30, 80), 'shield_thickness': (10, 60)}
+    target : float
+        maximum fluence
+    choices : dict, optional
+        discrete parameter name -> options, e.g. {'shield_material': [ss304,
+        wc, b4c]}, by default None
+    n_initial : int, optional
+        number of points of the initial design, by default twice the number
+        of thickness parameters plus one
+    max_runs : int, optional
+        maximum number of runs per combination of choices, by default 20
+    tolerance : float, optional
+        relative distance below the target at which the search stops, by
+        default 0.1
+    seed : int, optional
+        random seed of the design of experiments, by default None
+
+    Returns
+    -------
+    pandas.Series or None
+        thinnest point meeting the target, None if there is none
+    pandas.DataFrame
+        all the evaluated points with their fluence and radial build
+    """
+
+    names = list(bounds)
+    lower, upper = np.array([bounds[name] for name in names], dtype=float).T
+    if n_initial is None:
+        n_initial = 2 * len(names) + 1
+
+    choices = choices or {}
+    rows = []
+    for combination in itertools.product(*choices.values()):
+        fixed = dict(zip(choices, combination))
+
+        points = []
+        for point in latin_hypercube(bounds, n_initial, seed):
+            points.append({**fixed, **point, 'fluence': evaluate({**fixed, **point})})
+
+        while len(points) < max_runs:
+            thicknesses = np.array([[point[name] for name in names] for point in points])
+            fluences = np.array([point['fluence'] for point in points])
+
+            fit = AttenuationFit(thicknesses, fluences)
+            build = fit.minimum_build(target, lower, upper, margin=fit.sigma)
+            if build is None:
+                break
+
+            # the surrogate keeps proposing an already simulated point
+            if np.any(np.all(np.isclose(thicknesses, build, atol=1e-3 * (upper - lower)), axis=1)):
+                break
+
+            point = dict(zip(names, build))
+            fluence = evaluate({**fixed, **point})
+            points.append({**fixed, **point, 'fluence': fluence})
+
+            if (1 - tolerance) * target <= fluence <= target:
+                break
+
+        rows.extend(points)
+
+    history = pd.DataFrame(rows)
+    history['radial_build'] = history[names].sum(axis=1)
+
+    feasible = history[history['fluence'] <= target]
+    best = feasible.loc[feasible['radial_build'].idxmin()] if not feasible.empty else None
+
+    return best, history
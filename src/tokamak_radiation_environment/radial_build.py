@@ -0,0 +1,158 @@
+import functools
+import numpy as np
+import pandas as pd
+import openmc
+import openmc.data
+from tokamak_radiation_environment.reactor import core_names
+
+# core_group parameter prefix of each layer between the plasma and the magnets
+layer_prefixes = ('firstwall', 'vv_stri', 'vv_channel', 'vv_multiplier', 'vv_stro', 'blanket', 'shield')
+
+layer_names = core_names[2:]
+
+
+def mass_removal_cross_section(z: int):
+    """Fast neutron mass removal cross section of an element (cm2/g), from
+    the empirical fits 0.19 Z^-0.743 for Z <= 8 and 0.125 Z^-0.565 above,
+    0.598 cm2/g for hydrogen
+
+    Parameters
+    ----------
+    z : int
+        atomic number
+
+    Returns
+    -------
+    float
+    """
+
+    if z == 1:
+        return 0.598
+    if z <= 8:
+        return 0.19 * z**-0.743
+
+    return 0.125 * z**-0.565
+
+
+@functools.lru_cache(maxsize=None)
+def _removal_cross_section(mass_densities):
+
+    return sum(density * mass_removal_cross_section(openmc.data.zam(nuclide)[0])
+               for nuclide, density in mass_densities)
+
+
+def removal_cross_section(material: openmc.Material):
+    """Macroscopic fast neutron removal cross section of a material, cached
+    per composition
+
+    Parameters
+    ----------
+    material : openmc.Material
+
+    Returns
+    -------
+    float
+        removal cross section (1/cm)
+    """
+
+    mass_densities = tuple(sorted((nuclide, float(density))
+                                  for nuclide, density in material.get_mass_densities().items()))
+
+    return _removal_cross_section(mass_densities)
+
+
+def _path_factor(nodes, node: int, direction):
+    """Path length per unit layer thickness along direction, i.e. 1/cos of
+    the angle between the ray and the normal of the wall at the node"""
+
+    nodes = np.asarray(nodes, dtype=float)
+    tangent = nodes[(node + 1) % len(nodes)] - nodes[node - 1]
+    normal = np.array([tangent[1], -tangent[0]])
+    direction = np.asarray(direction, dtype=float)
+
+    cosine = abs(normal @ direction) / (np.linalg.norm(normal) * np.linalg.norm(direction))
+
+    return 1 / cosine
+
+
+def estimate(core_parameters: dict, node: int = None, direction=(-1., 0.)):
+    """Fast screening estimate of the attenuation of the 14 MeV neutrons
+    through the core layers up to the TF coil inboard leg, with removal
+    cross sections along a poloidal ray starting from the first wall inner
+    nodes
+
+    Parameters
+    ----------
+    core_parameters : dict
+        core_group keyword arguments, e.g. the core_parameters of a deck
+    node : int, optional
+        index of the first wall inner node the ray starts from, by default
+        the inboard midplane node (minimum r)
+    direction : tuple of two floats, optional
+        (r, z) direction of the ray, by default (-1., 0.) (inboard)
+
+    Returns
+    -------
+    pandas.DataFrame
+        one row per layer with its thickness, path length, removal cross
+        section and the transmission at its outer surface
+    """
+
+    nodes = core_parameters['firstwall_inner_nodes']
+    if node is None:
+        node = int(np.argmin([r for r, _ in nodes]))
+    factor = _path_factor(nodes, node, direction)
+
+    thickness = np.array([core_parameters[f"{prefix}_thickness"] for prefix in layer_prefixes], dtype=float)
+    sigma = np.array([removal_cross_section(core_parameters[f"{prefix}_material"])
+                      for prefix in layer_prefixes])
+    path = thickness * factor
+
+    return pd.DataFrame({'component': layer_names, 'thickness': thickness, 'path': path,
+                         'removal_cross_section': sigma,
+                         'transmission': np.exp(-np.cumsum(sigma * path))})
+
+
+def screen(designs, node: int = None, direction=(-1., 0.)):
+    """Transmission to the TF coil of many designs at once
+
+    Parameters
+    ----------
+    designs : iterable of dict
+        core_group keyword arguments of each design
+    node : int, optional
+        index of the first wall inner node the ray starts from, by default
+        the inboard midplane node of each design
+    direction : tuple of two floats, optional
+        (r, z) direction of the ray, by default (-1., 0.) (inboard)
+
+    Returns
+    -------
+    numpy.ndarray
+        transmission of each design
+    """
+
+    designs = list(designs)
+
+    # designs share their nodes and materials objects
+    factors = {}
+    sigmas = {}
+    thickness = np.empty((len(designs), len(layer_prefixes)))
+    sigma = np.empty_like(thickness)
+    factor = np.empty(len(designs))
+
+    for i, design in enumerate(designs):
+        nodes = design['firstwall_inner_nodes']
+        if id(nodes) not in factors:
+            start = int(np.argmin([r for r, _ in nodes])) if node is None else node
+            factors[id(nodes)] = _path_factor(nodes, start, direction)
+        factor[i] = factors[id(nodes)]
+
+        for j, prefix in enumerate(layer_prefixes):
+            thickness[i, j] = design[f"{prefix}_thickness"]
+            material = design[f"{prefix}_material"]
+            if id(material) not in sigmas:
+                sigmas[id(material)] = removal_cross_section(material)
+            sigma[i, j] = sigmas[id(material)]
+
+    return np.exp(-(sigma * thickness).sum(axis=1) * factor)
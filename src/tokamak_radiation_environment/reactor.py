@@ -0,0 +1,205 @@
+import fnmatch
+import warnings
+import openmc
+from openmc.mixin import IDWarning
+from tokamak_radiation_environment.components import sector_cell
+
+core_names = ('plasma', 'sol', 'first_wall', 'vessel_inner_structure', 'vessel_cooling_channel',
+              'vessel_neutron_multiplier', 'vessel_outer_structure', 'blanket', 'shield')
+
+coil_names = ('magnet', 'insulation', 'case')
+
+
+def name_components(names, components, prefix: str = None):
+    """Pair the components returned by a group function with their names
+
+    Parameters
+    ----------
+    names : iterable of str
+        names of the components, e.g. core_names or coil_names
+    components : iterable of Component
+        components returned by core_group, pfcoil_group or tfcoil_group
+    prefix : str, optional
+        prepended to the names as '<prefix>_<name>', by default None
+
+    Returns
+    -------
+    dict
+        component name -> Component
+    """
+
+    if prefix:
+        names = [f"{prefix}_{name}" for name in names]
+
+    return dict(zip(names, components))
+
+
+class Reactor:
+    def __init__(self, components: dict, bounding_region: openmc.Region, angle=None, boundary_type: str = 'reflective'):
+        """Collection of named components assembled into an openmc geometry.
+        The components have to be built without angle, the toroidal sector
+        is applied once to the root cell (see components.sector_cell).
+        Cells are generated once and kept, so that the same openmc.Cell
+        objects are found in the geometry, in the tallies and in the results.
+
+        Parameters
+        ----------
+        components : dict
+            component name -> Component
+        bounding_region : openmc.Region
+            outer region of the model (e.g. the inside of a vacuum sphere)
+        angle : tuple of two floats, optional
+            The first float is the angle in deg to cut with respect the x axis
+            The second float is the angle in deg to finish the cut, by default None
+        boundary_type : str, optional
+            boundary condition of the two surfaces slicing the tokamak, either
+            'reflective' or 'periodic', by default 'reflective'
+        """
+
+        self.components = dict(components)
+        self.bounding_region = bounding_region
+        self.angle = angle
+        self.boundary_type = boundary_type
+
+        self._cells = None
+        self._root_cell = None
+
+    @property
+    def cells(self):
+        """Component cells registry
+
+        Returns
+        -------
+        dict
+            component name -> openmc.Cell
+        """
+
+        if self._cells is None:
+            self._cells = {}
+            for name, component in self.components.items():
+                cell = component.cell
+                cell.name = name
+                self._cells[name] = cell
+
+        return self._cells
+
+    def select(self, *patterns):
+        """Component cells whose name matches any of the patterns
+
+        Parameters
+        ----------
+        *patterns : str
+            shell-style patterns, e.g. '*magnet*' or 'vessel_*'
+
+        Returns
+        -------
+        dict
+            component name -> openmc.Cell
+        """
+
+        return {name: cell for name, cell in self.cells.items()
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)}
+
+    def set_material(self, material: openmc.Material, *patterns):
+        """Fill the component cells whose name matches any of the patterns
+        with another material. The replacement takes the id of the material
+        it replaces, so that the geometry is unchanged and only the materials
+        have to be exported again (see export_materials). If the cells were
+        void or the replaced material still fills other cells, the
+        replacement keeps its own id and the geometry has to be exported
+        again.
+
+        Parameters
+        ----------
+        material : openmc.Material
+            new material, e.g. from materials.enriched. Its id is modified.
+        *patterns : str
+            shell-style patterns, e.g. 'blanket' or 'vessel_cooling_channel'
+
+        Returns
+        -------
+        list of str
+            names of the modified components
+        """
+
+        selected = self.select(*patterns)
+        kept = {id(cell.fill) for name, cell in self.cells.items() if name not in selected}
+
+        replacements = {}
+        for name, cell in selected.items():
+            replaced = cell.fill
+            if id(replaced) not in replacements:
+                if not isinstance(replaced, openmc.Material) or id(replaced) in kept:
+                    warnings.warn(f"{name} was void or its material still fills other cells, the "
+                                  "geometry has to be exported again")
+                    replacement = material
+                else:
+                    # one copy of the new material per replaced material id
+                    replacement = material.clone() if replacements else material
+                    with warnings.catch_warnings():
+                        warnings.simplefilter('ignore', IDWarning)
+                        replacement.id = replaced.id
+                replacements[id(replaced)] = replacement
+
+            cell.fill = replacements[id(replaced)]
+            self.components[name].material = cell.fill
+
+        return list(selected)
+
+    @property
+    def materials(self):
+        """Materials filling the component cells
+
+        Returns
+        -------
+        openmc.Materials
+        """
+
+        materials = openmc.Materials()
+        for cell in self.cells.values():
+            if isinstance(cell.fill, openmc.Material) and cell.fill not in materials:
+                materials.append(cell.fill)
+
+        return materials
+
+    def export_materials(self, path='materials.xml'):
+        """Export the materials of the component cells, e.g. after
+        set_material, without exporting the geometry again
+
+        Parameters
+        ----------
+        path : str or pathlib.Path, optional
+            path to the materials.xml file, by default 'materials.xml'
+        """
+
+        self.materials.export_to_xml(path)
+
+    @property
+    def root_cell(self):
+        """openmc.Cell bounding the toroidal sector and filled with the
+        component cells
+
+        Returns
+        -------
+        openmc.Cell
+        """
+
+        if self._root_cell is None:
+            self._root_cell = sector_cell(self.cells.values(), bounding_region=self.bounding_region,
+                                          angle=self.angle, boundary_type=self.boundary_type)
+
+        return self._root_cell
+
+    @property
+    def geometry(self):
+        """openmc.Geometry generator
+
+        Returns
+        -------
+        openmc.Geometry
+        """
+
+        geometry = openmc.Geometry(root=[self.root_cell])
+        geometry.merge_surfaces = True
+
+        return geometry
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import numpy as np
+import openmc
+from tokamak_radiation_environment import materials
+from tokamak_radiation_environment.spectra import group_structure
+
+# default responses: gas production, heating (MT 301) and damage energy (MT 444)
+reactions = ('(n,Xp)', '(n,Xd)', '(n,Xt)', '(n,X3He)', '(n,Xa)', 'heating', 'damage-energy')
+
+_mt = {'(n,Xp)': 203, '(n,Xd)': 204, '(n,Xt)': 205, '(n,X3He)': 206, '(n,Xa)': 207,
+       'heating': 301, 'damage-energy': 444}
+
+_responses = {}
+
+
+def cache_dir(kind: str = 'responses'):
+    """Directory where cached data are stored, under the TRE_CACHE_DIR
+    environment variable, by default ~/.cache/tokamak_radiation_environment
+
+    Parameters
+    ----------
+    kind : str, optional
+        subdirectory of the cached data, by default 'responses'
+
+    Returns
+    -------
+    pathlib.Path
+    """
+
+    root = os.environ.get('TRE_CACHE_DIR', Path.home() / '.cache' / 'tokamak_radiation_environment')
+
+    return Path(root) / kind
+
+
+def _cross_sections():
+    """Path to the cross_sections.xml in use"""
+
+    try:
+        path = openmc.config.get('cross_sections')
+    except AttributeError:
+        path = os.environ.get('OPENMC_CROSS_SECTIONS')
+
+    return str(path) if path is not None else None
+
+
+def _response_key(material: openmc.Material, edges, reactions, temperature: float):
+    """Hash of everything the group-collapsed responses depend on"""
+
+    densities = {nuclide: float(density)
+                 for nuclide, density in material.get_nuclide_atom_densities().items()}
+
+    cross_sections = _cross_sections()
+    mtime = os.path.getmtime(cross_sections) if cross_sections and os.path.exists(cross_sections) else None
+
+    content = json.dumps({'densities': sorted(densities.items()),
+                          'edges': np.asarray(edges, dtype=float).tolist(),
+                          'reactions': list(reactions),
+                          'temperature': temperature,
+                          'cross_sections': [cross_sections, mtime]})
+
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def collapse(energy, cross_sections, structure, weight=None):
+    """Collapse pointwise cross sections onto a group structure, averaging
+    them over each group with a weighting spectrum
+
+    Parameters
+    ----------
+    energy : numpy.ndarray
+        pointwise energy grid in eV
+    cross_sections : numpy.ndarray
+        cross sections on the energy grid, one row per reaction
+    structure : str or iterable of float
+        group structure name or boundaries in eV
+    weight : callable, optional
+        weighting spectrum as a function of the energy, by default 1/E
+        (flat in lethargy)
+
+    Returns
+    -------
+    numpy.ndarray
+        (reactions x groups) group-averaged cross sections
+    """
+
+    edges = group_structure(structure)
+    energy = np.asarray(energy, dtype=float)
+    cross_sections = np.atleast_2d(cross_sections)
+
+    if weight is None:
+        def weight(e):
+            return 1 / e
+
+    # pointwise grid refined with the group boundaries
+    inside = (energy > edges[0]) & (energy < edges[-1])
+    grid = np.union1d(energy[inside], edges)
+    values = np.array([np.interp(grid, energy, xs) for xs in cross_sections])
+    w = weight(grid)
+
+    # trapezoidal integrals over each segment, summed per group
+    width = np.diff(grid)
+    norm = 0.5 * (w[:-1] + w[1:]) * width
+    integral = 0.5 * (values[:, :-1] * w[:-1] + values[:, 1:] * w[1:]) * width
+
+    starts = np.searchsorted(grid, edges[:-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.add.reduceat(integral, starts, axis=1) / np.add.reduceat(norm, starts)
+
+
+def response_functions(material: openmc.Material, structure='TRIPOLI-315', reactions=reactions,
+                       temperature: float = 294., use_cache: bool = True):
+    """Macroscopic response functions of a material collapsed onto a group
+    structure. Responses are computed once with openmc.calculate_cexs and
+    kept in memory and on disk (see cache_dir), keyed by the material
+    composition, the group structure, the reactions, the temperature and
+    the nuclear data library. A reaction rate is then the dot product of a
+    group response with a group flux.
+
+    Parameters
+    ----------
+    material : openmc.Material
+        material, e.g. from the materials database
+    structure : str or iterable of float, optional
+        group structure name or boundaries in eV, by default 'TRIPOLI-315'
+        (the energy filter of the reactor decks)
+    reactions : iterable of str or int, optional
+        reaction names (see response.reactions) or MT numbers, by default
+        gas production, heating and damage energy
+    temperature : float, optional
+        temperature in K, by default 294.
+    use_cache : bool, optional
+        if False the responses are recomputed and the cache updated, by
+        default True
+
+    Returns
+    -------
+    numpy.ndarray
+        (reactions x groups) responses in 1/cm (eV/cm for heating and
+        damage energy)
+    """
+
+    edges = group_structure(structure)
+    mts = [_mt.get(reaction, reaction) for reaction in reactions]
+
+    key = _response_key(material, edges, mts, temperature)
+    path = cache_dir() / f"{key}.npy"
+
+    if use_cache:
+        if key in _responses:
+            return _responses[key]
+        if path.exists():
+            responses = np.load(path)
+            responses.setflags(write=False)
+            _responses[key] = responses
+            return responses
+
+    energy, cross_sections = openmc.calculate_cexs(material, mts, temperature=temperature)
+    responses = collapse(energy, cross_sections, edges)
+    responses.setflags(write=False)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, responses)
+    _responses[key] = responses
+
+    return responses
+
+
+def response_library(names=None, structure='TRIPOLI-315', reactions=reactions, temperature: float = 294.):
+    """Response functions of the materials of the database
+
+    Parameters
+    ----------
+    names : iterable of str, optional
+        material names, by default all the materials of the database
+    structure : str or iterable of float, optional
+        group structure name or boundaries in eV, by default 'TRIPOLI-315'
+    reactions : iterable of str or int, optional
+        reaction names or MT numbers, by default gas production, heating and
+        damage energy
+    temperature : float, optional
+        temperature in K, by default 294.
+
+    Returns
+    -------
+    numpy.ndarray
+        (materials x reactions x groups) responses, in the order of names
+    """
+
+    library = materials.database()
+    if names is None:
+        names = list(library)
+
+    return np.stack([response_functions(library[name], structure, reactions, temperature)
+                     for name in names])
+
+
+def clear_response_cache(disk: bool = False):
+    """Clear the in-memory response functions, and the ones stored on disk
+    if disk is True"""
+
+    _responses.clear()
+
+    if disk and cache_dir().exists():
+        for path in cache_dir().glob('*.npy'):
+            path.unlink()
@@ -0,0 +1,144 @@
+import hashlib
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+import h5py
+import openmc
+from tokamak_radiation_environment import launcher
+
+_hash_file = 'model.sha256'
+
+# settings that can change between a run and its restart
+_restartable_settings = ('batches', 'statepoint', 'sourcepoint', 'output')
+
+
+def model_hash(model: openmc.Model):
+    """Hash of the geometry, materials, tallies and settings of a model,
+    ignoring the settings a restart is allowed to change (number of
+    batches, statepoint and output options)
+
+    Parameters
+    ----------
+    model : openmc.Model
+
+    Returns
+    -------
+    str
+        sha256 hex digest
+    """
+
+    digest = hashlib.sha256()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model.export_to_xml(tmp)
+        for name in ('geometry.xml', 'materials.xml', 'settings.xml', 'tallies.xml'):
+            path = Path(tmp) / name
+            if not path.exists():
+                continue
+            root = ET.parse(path).getroot()
+            if name == 'settings.xml':
+                for tag in _restartable_settings:
+                    for element in root.findall(tag):
+                        root.remove(element)
+            digest.update(ET.tostring(root))
+
+    return digest.hexdigest()
+
+
+def _is_valid(statepoint: Path, model: openmc.Model):
+    """Check that a statepoint is readable and consistent with the model"""
+
+    try:
+        with h5py.File(statepoint, 'r') as f:
+            settings = model.settings
+            return (f['n_particles'][()] == settings.particles
+                    and f['run_mode'][()].decode() == settings.run_mode
+                    and f['current_batch'][()] <= settings.batches
+                    and 'tallies' in f)
+    except (OSError, KeyError):
+        return False
+
+
+def latest_statepoint(directory, model: openmc.Model):
+    """Latest valid statepoint.NNN.h5 written in directory by the same model.
+    Statepoints that cannot be read (e.g. truncated by a node failure) or
+    that do not match the model are skipped.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        run directory
+    model : openmc.Model
+        model the statepoint has to belong to
+
+    Returns
+    -------
+    pathlib.Path or None
+        path to the latest valid statepoint, None if there is none
+    """
+
+    directory = Path(directory)
+
+    hash_path = directory / _hash_file
+    if not hash_path.exists() or hash_path.read_text().strip() != model_hash(model):
+        return None
+
+    return _latest_valid(directory, model)
+
+
+def _latest_valid(directory: Path, model: openmc.Model):
+
+    statepoints = sorted(directory.glob('statepoint.*.h5'),
+                         key=lambda path: int(path.suffixes[-2][1:]), reverse=True)
+
+    for statepoint in statepoints:
+        if _is_valid(statepoint, model):
+            return statepoint
+
+    return None
+
+
+def resume(model: openmc.Model, directory, **kwargs):
+    """Run the model in directory, restarting from the latest valid
+    statepoint of a previous run of the same model if there is one. The
+    model hash is stored next to the statepoints; a run directory holding
+    statepoints of a different model raises an error instead of being
+    overwritten.
+
+    Parameters
+    ----------
+    model : openmc.Model
+        model to run
+    directory : str or pathlib.Path
+        run directory
+    **kwargs
+        passed to launcher.run
+
+    Returns
+    -------
+    pathlib.Path
+        path to the last statepoint
+    """
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    digest = model_hash(model)
+    hash_path = directory / _hash_file
+
+    previous = hash_path.read_text().strip() if hash_path.exists() else None
+    if previous != digest and any(directory.glob('statepoint.*.h5')):
+        raise ValueError(f"{directory} contains statepoints of a different or unknown model "
+                         "(geometry, materials, tallies or settings changed)")
+
+    hash_path.write_text(digest)
+
+    statepoint = _latest_valid(directory, model)
+
+    if statepoint is not None:
+        with h5py.File(statepoint, 'r') as f:
+            if f['current_batch'][()] == model.settings.batches:
+                return statepoint
+        kwargs['restart_file'] = statepoint.resolve()
+
+    return launcher.run(model, cwd=directory, **kwargs)
@@ -0,0 +1,432 @@
+import contextlib
+import os
+import shutil
+from pathlib import Path
+import h5py
+import numpy as np
+import pandas as pd
+import openmc
+
+
+@contextlib.contextmanager
+def _statepoint(statepoint):
+    """Open the statepoint if a path is given and close it on exit. An
+    openmc.StatePoint given by the caller is left open."""
+
+    if isinstance(statepoint, (str, os.PathLike)):
+        with openmc.StatePoint(statepoint) as sp:
+            yield sp
+    else:
+        yield statepoint
+
+
+def _tally(statepoint, tally):
+    """Get a tally from a statepoint by id (int) or name (str)"""
+
+    if isinstance(tally, openmc.Tally):
+        return tally
+    if isinstance(tally, str):
+        return statepoint.get_tally(name=tally)
+
+    return statepoint.get_tally(id=tally)
+
+
+# energy released per D-T fusion reaction (eV)
+fusion_energy = 17.6e6
+
+# energy of the D-T fusion neutrons (eV)
+neutron_energy = 14.06e6
+
+_ev_to_j = 1.60218e-19
+
+_seconds_per_year = 3600 * 24 * 365
+
+
+def source_rate(fusion_power: float = 500e6):
+    """Neutron source rate of a D-T plasma, i.e. the factor turning tallies
+    per source particle into rates
+
+    Parameters
+    ----------
+    fusion_power : float, optional
+        fusion power (W), by default 500e6
+
+    Returns
+    -------
+    float
+        neutrons per second
+    """
+
+    return fusion_power / (fusion_energy * _ev_to_j)
+
+
+def simulation_time(statepoint):
+    """Time spent transporting and tallying particles, i.e. the T of the
+    figure of merit
+
+    Parameters
+    ----------
+    statepoint : openmc.StatePoint or str
+        statepoint or path to the statepoint file
+
+    Returns
+    -------
+    float
+        time spent in active batches (s)
+    """
+
+    with _statepoint(statepoint) as sp:
+        return sp.runtime['active batches']
+
+
+def tally_fom(statepoint, tally, time: float = None):
+    """Figure of merit FOM = 1/(R^2 T) of each bin of a tally, R being the
+    relative error and T the simulation time. Bins that did not score have
+    a NaN figure of merit.
+
+    Parameters
+    ----------
+    statepoint : openmc.StatePoint or str
+        statepoint or path to the statepoint file
+    tally : int, str or openmc.Tally
+        tally id, tally name or tally
+    time : float, optional
+        simulation time (s), by default the active batches time of the
+        statepoint
+
+    Returns
+    -------
+    pandas.DataFrame
+        tally dataframe with 'rel. err.' and 'fom' columns added
+    """
+
+    with _statepoint(statepoint) as sp:
+        tally = _tally(sp, tally)
+
+        if time is None:
+            time = simulation_time(sp)
+
+        df = tally.get_pandas_dataframe()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel_err = df['std. dev.'] / df['mean']
+        df['rel. err.'] = rel_err.where((df['mean'] > 0) & (df['std. dev.'] > 0))
+        df['fom'] = 1 / (df['rel. err.']**2 * time)
+
+    return df
+
+
+def component_fom(statepoint, cells: dict, tallies=None, time: float = None):
+    """Figure of merit of the cell tallies aggregated per component
+
+    Parameters
+    ----------
+    statepoint : openmc.StatePoint or str
+        statepoint or path to the statepoint file
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.cells
+    tallies : iterable of int, str or openmc.Tally, optional
+        tallies to consider, by default all the tallies with a cell filter
+    time : float, optional
+        simulation time (s), by default the active batches time of the
+        statepoint
+
+    Returns
+    -------
+    pandas.DataFrame
+        one row per (tally, component, score) with the minimum and median
+        figure of merit and the maximum relative error over the bins, empty
+        if no tally scores the components. Use DataFrame.to_json to export
+        it.
+    """
+
+    names = {cell.id: name for name, cell in cells.items()}
+
+    frames = []
+    with _statepoint(statepoint) as sp:
+        if tallies is None:
+            tallies = [tally for tally in sp.tallies.values()
+                       if tally.contains_filter(openmc.CellFilter)]
+
+        for tally in tallies:
+            tally = _tally(sp, tally)
+            df = tally_fom(sp, tally, time)
+            df['component'] = df['cell'].map(names)
+            df['tally'] = tally.id
+            frames.append(df.dropna(subset=['component']))
+
+    if not frames:
+        return pd.DataFrame(columns=['tally', 'component', 'score', 'fom_min', 'fom_median', 'rel_err_max'])
+
+    df = pd.concat(frames, ignore_index=True)
+
+    return df.groupby(['tally', 'component', 'score'], sort=False).agg(
+        fom_min=('fom', 'min'), fom_median=('fom', 'median'),
+        rel_err_max=('rel. err.', 'max')).reset_index()
+
+
+def fom_history(statepoints, tally):
+    """Evolution of the figure of merit of a tally along the run, from the
+    statepoints written periodically during the simulation
+
+    Parameters
+    ----------
+    statepoints : iterable of openmc.StatePoint or str
+        statepoints (or paths) of the same run
+    tally : int, str or openmc.Tally
+        tally id or tally name
+
+    Returns
+    -------
+    pandas.DataFrame
+        minimum and median figure of merit of the scored bins per batch
+    """
+
+    rows = []
+    for statepoint in statepoints:
+        with _statepoint(statepoint) as sp:
+            fom = tally_fom(sp, tally)['fom']
+            rows.append({'batch': sp.current_batch,
+                         'fom_min': fom.min(), 'fom_median': fom.median()})
+
+    return pd.DataFrame(rows).sort_values('batch', ignore_index=True)
+
+
+def _tally_layout(f):
+    """Shape of the results, filters, bins, nuclides and scores of each
+    tally of an open statepoint file, to check that statepoints can be
+    merged"""
+
+    def read(group, name):
+        return np.atleast_1d(group[name][()]).tolist() if name in group else None
+
+    layout = {}
+    for name, group in f['tallies'].items():
+        if not name.startswith('tally '):
+            continue
+        filters = read(group, 'filters') or []
+        layout[name] = (group['results'].shape, filters, read(group, 'nuclides'), read(group, 'score_bins'),
+                        [read(f['tallies/filters'], f'filter {i}/bins') for i in filters])
+
+    return layout
+
+
+def _combine(sums, sums_sq, realizations, weights):
+    """Sum and sum of squares over all the realizations reproducing the
+    weighted mean of independent runs and its variance, from the sum and
+    sum of squares of each run"""
+
+    n = realizations.sum()
+
+    mean, variance = 0., 0.
+    for sum_, sum_sq, n_i, weight in zip(sums, sums_sq, realizations, weights):
+        mean_i = sum_ / n_i
+        mean = mean + weight * mean_i
+        variance = variance + weight**2 * np.maximum(sum_sq / n_i - mean_i**2, 0.) / (n_i - 1)
+
+    return n * mean, n * (mean**2 + (n - 1) * variance)
+
+
+def merge_statepoints(statepoints, output, chunk_size: int = 100000):
+    """Merge the statepoints of independently seeded runs of the same model
+    into a single statepoint. The mean of each tally bin is the mean of the
+    runs weighted by their number of histories and its variance combines
+    the variances of the runs means, so that runs with different numbers of
+    particles or batches can be merged. The merged sum and sum of squares
+    reproduce this mean and standard deviation over the total number of
+    realizations, and the runtimes are summed. Tallies are streamed one at
+    a time and in chunks of bins, so that memory stays bounded whatever the
+    tally size.
+
+    Parameters
+    ----------
+    statepoints : iterable of str or pathlib.Path
+        paths to the statepoint files to merge
+    output : str or pathlib.Path
+        path to the merged statepoint file
+    chunk_size : int, optional
+        number of filter bins read at once, by default 100000
+
+    Returns
+    -------
+    pathlib.Path
+        path to the merged statepoint, readable by openmc.StatePoint
+
+    Raises
+    ------
+    ValueError
+        if the statepoints do not have the same tallies, or a run has less
+        than two realizations
+    """
+
+    statepoints = [Path(statepoint) for statepoint in statepoints]
+    output = Path(output)
+
+    files = [h5py.File(statepoint, 'r') for statepoint in statepoints]
+    try:
+        layout = _tally_layout(files[0])
+        for statepoint, f in zip(statepoints[1:], files[1:]):
+            if _tally_layout(f) != layout or f['global_tallies'].shape != files[0]['global_tallies'].shape:
+                raise ValueError(f"{statepoint} does not have the same tallies as {statepoints[0]}")
+
+        particles = np.array([f['n_particles'][()] for f in files], dtype=float)
+        realizations = np.array([f['n_realizations'][()] for f in files], dtype=float)
+        if (realizations < 2).any():
+            raise ValueError("every run needs at least two realizations")
+        histories = particles * realizations
+        weights = histories / histories.sum()
+
+        shutil.copyfile(statepoints[0], output)
+        with h5py.File(output, 'r+') as merged:
+            for name in layout:
+                tally_realizations = np.array([f[f'tallies/{name}/n_realizations'][()] for f in files],
+                                              dtype=float)
+                results = merged[f'tallies/{name}/results']
+                for start in range(0, results.shape[0], chunk_size):
+                    stop = min(start + chunk_size, results.shape[0])
+                    chunks = [f[f'tallies/{name}/results'][start:stop] for f in files]
+                    total = np.empty(chunks[0].shape)
+                    total[..., 0], total[..., 1] = _combine([chunk[..., 0] for chunk in chunks],
+                                                            [chunk[..., 1] for chunk in chunks],
+                                                            tally_realizations, weights)
+                    results[start:stop] = total
+                merged[f'tallies/{name}/n_realizations'][()] = int(tally_realizations.sum())
+
+            # global tallies columns are value, sum and sum of squares
+            global_tallies = merged['global_tallies'][()]
+            global_tallies[:, 1], global_tallies[:, 2] = _combine(
+                [f['global_tallies'][:, 1] for f in files], [f['global_tallies'][:, 2] for f in files],
+                realizations, weights)
+            merged['global_tallies'][()] = global_tallies
+
+            n_realizations = int(realizations.sum())
+            merged['n_realizations'][()] = n_realizations
+            merged['n_batches'][()] = n_realizations
+            merged['current_batch'][()] = n_realizations
+            merged['n_particles'][()] = round(histories.sum() / n_realizations)
+
+            for name, dataset in merged['runtime'].items():
+                dataset[()] = sum(f[f'runtime/{name}'][()] for f in files)
+    finally:
+        for f in files:
+            f.close()
+
+    return output
+
+
+def component_heating(statepoint, cells: dict, tally='component_heating', volumes: dict = None,
+                      fusion_power: float = 500e6):
+    """Nuclear heating of each component from the tally of
+    tallies.heating_tally, normalized to the fusion power
+
+    Parameters
+    ----------
+    statepoint : openmc.StatePoint or str
+        statepoint or path to the statepoint file
+    cells : dict
+        component name -> openmc.Cell, e.g. Reactor.cells
+    tally : int, str or openmc.Tally, optional
+        tally id or tally name, by default 'component_heating'
+    volumes : dict, optional
+        component name -> volume (cm3), by default the volume of the cells.
+        Every component scored by the tally needs a volume.
+    fusion_power : float, optional
+        fusion power (W), by default 500e6
+
+    Returns
+    -------
+    pandas.DataFrame
+        one row per component with the heating of each particle and the
+        total heating (W), its standard deviation (W) and the average power
+        density (W/cm3). The standard deviation of the total combines the
+        particle bins in quadrature: the heating of the photons and of the
+        neutrons of the same history are positively correlated, so it is a
+        lower bound.
+
+    Raises
+    ------
+    ValueError
+        if the volume of a component is unknown
+    """
+
+    with _statepoint(statepoint) as sp:
+        tally = _tally(sp, tally)
+
+        cell_filter = tally.find_filter(openmc.CellFilter)
+        particle_filter = tally.find_filter(openmc.ParticleFilter)
+        cell_axis = tally.filters.index(cell_filter)
+        particle_axis = tally.filters.index(particle_filter)
+
+        mean = tally.get_reshaped_data(value='mean')[..., 0, 0]
+        std_dev = tally.get_reshaped_data(value='std_dev')[..., 0, 0]
+
+    # eV per source particle -> W
+    norm = source_rate(fusion_power) * _ev_to_j
+
+    mean = np.moveaxis(mean, (cell_axis, particle_axis), (0, 1)).reshape(len(cell_filter.bins),
+                                                                          len(particle_filter.bins))
+    std_dev = np.moveaxis(std_dev, (cell_axis, particle_axis), (0, 1)).reshape(mean.shape)
+
+    rows = {cell_id: i for i, cell_id in enumerate(cell_filter.bins)}
+    names = [name for name, cell in cells.items() if cell.id in rows]
+    index = [rows[cells[name].id] for name in names]
+
+    df = pd.DataFrame(mean[index] * norm, index=pd.Index(names, name='component'),
+                      columns=[f"{particle} [W]" for particle in particle_filter.bins])
+    df['total [W]'] = df.sum(axis=1)
+    df['std. dev. [W]'] = np.sqrt((std_dev[index]**2).sum(axis=1)) * norm
+
+    if volumes is None:
+        volumes = {name: cells[name].volume for name in names}
+    missing = [name for name in names if not volumes.get(name)]
+    if missing:
+        raise ValueError(f"unknown volume of {', '.join(missing)}, set the cell volumes "
+                         "or pass them with the volumes argument")
+    volume = np.array([volumes[name] for name in names], dtype=float)
+    df['W/cm3'] = df['total [W]'] / volume
+
+    return df
+
+
+def breeding_performance(statepoint, tally='breeding', leakage='leakage'):
+    """Tritium breeding ratio and energy multiplication of the breeding
+    components and neutron leakage of the model, all per source neutron.
+    The tritium breeding ratio is the H3 production summed over the cells
+    of tallies.breeding_tally, the energy multiplication is the heating
+    (all particles) summed over the same cells divided by the 14.06 MeV of
+    the source neutron, and the leakage is the neutron current through the
+    vacuum boundaries of the model from tallies.leakage_tally.
+
+    Parameters
+    ----------
+    statepoint : openmc.StatePoint or str
+        statepoint or path to the statepoint file
+    tally : int, str or openmc.Tally, optional
+        breeding tally id or tally name, by default 'breeding'
+    leakage : int, str or openmc.Tally, optional
+        leakage tally id or tally name, by default 'leakage'
+
+    Returns
+    -------
+    pandas.Series
+        'tbr', 'energy_multiplication' and 'leakage' per source neutron
+        with their standard deviations
+    """
+
+    with _statepoint(statepoint) as sp:
+        tally = _tally(sp, tally)
+
+        # sum over the cells, per score
+        total = tally.summation(filter_type=openmc.CellFilter, remove_filter=True)
+        tritium = total.get_slice(scores=['H3-production'])
+        heating = total.get_slice(scores=['heating'])
+
+        # sum over the vacuum surfaces
+        leakage = _tally(sp, leakage).summation(filter_type=openmc.SurfaceFilter, remove_filter=True)
+
+    return pd.Series({'tbr': tritium.mean.sum(),
+                      'tbr_std_dev': tritium.std_dev.sum(),
+                      'energy_multiplication': heating.mean.sum() / neutron_energy,
+                      'energy_multiplication_std_dev': heating.std_dev.sum() / neutron_energy,
+                      'leakage': leakage.mean.sum(),
+                      'leakage_std_dev': leakage.std_dev.sum()})
@@ -0,0 +1,155 @@
+import functools
+import numpy as np
+import scipy.sparse
+import openmc
+
+
+def group_structure(structure):
+    """Energy group boundaries
+
+    Parameters
+    ----------
+    structure : str or iterable of float
+        name of an openmc.mgxs.GROUP_STRUCTURES entry (e.g. 'TRIPOLI-315')
+        or increasing group boundaries in eV
+
+    Returns
+    -------
+    numpy.ndarray
+        group boundaries in eV
+    """
+
+    if isinstance(structure, str):
+        return openmc.mgxs.GROUP_STRUCTURES[structure]
+
+    edges = np.asarray(structure, dtype=float)
+    if edges.ndim != 1 or edges.size < 2 or np.any(np.diff(edges) <= 0):
+        raise ValueError("group boundaries must be at least two increasing energies")
+
+    return edges
+
+
+def _key(structure):
+    """Hashable key of a group structure for the matrix cache"""
+
+    if isinstance(structure, str):
+        return structure
+
+    return tuple(group_structure(structure).tolist())
+
+
+@functools.lru_cache(maxsize=None)
+def _overlap_matrix(source, target, lethargy: bool):
+
+    source = group_structure(source if isinstance(source, str) else list(source))
+    target = group_structure(target if isinstance(target, str) else list(target))
+
+    # common boundaries within the energy range covered by both structures
+    edges = np.union1d(source, target)
+    edges = edges[(edges >= max(source[0], target[0])) & (edges <= min(source[-1], target[-1]))]
+    lower, upper = edges[:-1], edges[1:]
+
+    middle = 0.5 * (lower + upper)
+    i = np.searchsorted(source, middle) - 1
+    j = np.searchsorted(target, middle) - 1
+
+    # fraction of each source group falling in each piece, assuming a flat
+    # flux per unit lethargy (or energy) within the source group
+    fraction = (upper - lower) / (source[i + 1] - source[i])
+    if lethargy:
+        log = source[i] > 0
+        fraction[log] = np.log(upper[log] / lower[log]) / np.log(source[i + 1][log] / source[i][log])
+
+    # duplicated (j, i) pairs are summed when converting to csr
+    matrix = scipy.sparse.coo_matrix((fraction, (j, i)), shape=(target.size - 1, source.size - 1))
+
+    return matrix.tocsr()
+
+
+def overlap_matrix(source, target, lethargy: bool = True):
+    """Sparse matrix collapsing (or splitting) group-integrated quantities
+    from a source to a target group structure. Element (j, i) is the
+    fraction of source group i falling within target group j. Matrices are
+    cached per structure pair and must not be modified in place.
+
+    Parameters
+    ----------
+    source : str or iterable of float
+        source group structure name or boundaries in eV
+    target : str or iterable of float
+        target group structure name or boundaries in eV
+    lethargy : bool, optional
+        if True the spectrum is assumed flat in lethargy within the source
+        groups, otherwise flat in energy, by default True
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        (target groups x source groups) overlap matrix
+    """
+
+    return _overlap_matrix(_key(source), _key(target), lethargy)
+
+
+def rebin(spectra, source, target, lethargy: bool = True):
+    """Rebin group-integrated spectra (e.g. the flux of an EnergyFilter
+    tally) onto another group structure. Any number of spectra is collapsed
+    with a single sparse matrix product.
+
+    Parameters
+    ----------
+    spectra : numpy.ndarray
+        spectra with the source groups along the last axis
+    source : str or iterable of float
+        source group structure name or boundaries in eV
+    target : str or iterable of float
+        target group structure name or boundaries in eV
+    lethargy : bool, optional
+        if True the spectrum is assumed flat in lethargy within the source
+        groups, otherwise flat in energy, by default True
+
+    Returns
+    -------
+    numpy.ndarray
+        spectra with the target groups along the last axis
+    """
+
+    spectra = np.asarray(spectra, dtype=float)
+    matrix = overlap_matrix(source, target, lethargy)
+
+    if spectra.shape[-1] != matrix.shape[1]:
+        raise ValueError(f"spectra have {spectra.shape[-1]} groups, the source structure "
+                         f"has {matrix.shape[1]}")
+
+    flat = spectra.reshape(-1, matrix.shape[1])
+    rebinned = (matrix @ flat.T).T
+
+    return rebinned.reshape(spectra.shape[:-1] + (matrix.shape[0],))
+
+
+def fast_fraction(spectra, source, threshold: float = 0.1e6, lethargy: bool = True):
+    """Fraction of the flux above an energy threshold
+
+    Parameters
+    ----------
+    spectra : numpy.ndarray
+        spectra with the source groups along the last axis
+    source : str or iterable of float
+        source group structure name or boundaries in eV
+    threshold : float, optional
+        fast neutron threshold in eV, by default 0.1e6
+    lethargy : bool, optional
+        if True the spectrum is assumed flat in lethargy within the source
+        groups, otherwise flat in energy, by default True
+
+    Returns
+    -------
+    numpy.ndarray
+        fast flux fraction of each spectrum
+    """
+
+    edges = group_structure(source)
+    collapsed = rebin(spectra, source, (edges[0], threshold, edges[-1]), lethargy)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return collapsed[..., 1] / collapsed.sum(axis=-1)
@@ -0,0 +1,102 @@
+import openmc
+
+heating_particles = ('neutron', 'photon', 'electron', 'positron')
+
+
+def heating_tally(cells, particles=heating_particles, tally_id: int = None, name: str = 'component_heating'):
+    """Nuclear heating of each component cell, split by particle, in a single
+    tally so that all the cells are scored with one filter lookup per event.
+    Photon transport has to be enabled for the photon heating to be
+    deposited where the photons are absorbed rather than at the neutron
+    collision site.
+
+    Parameters
+    ----------
+    cells : iterable of openmc.Cell
+        component cells, e.g. Reactor.cells.values()
+    particles : iterable of str, optional
+        particles of the particle filter, by default neutron, photon,
+        electron and positron
+    tally_id : int, optional
+        id of the tally, by default automatically assigned
+    name : str, optional
+        name of the tally, by default 'component_heating'
+
+    Returns
+    -------
+    openmc.Tally
+    """
+
+    tally = openmc.Tally(tally_id=tally_id, name=name)
+    tally.filters = [openmc.CellFilter(list(cells)), openmc.ParticleFilter(list(particles))]
+    tally.scores = ['heating']
+
+    return tally
+
+
+# components where tritium is bred and the blanket energy is deposited
+breeding_names = ('vessel_cooling_channel', 'blanket')
+
+breeding_scores = ('H3-production', 'heating')
+
+
+def breeding_tally(cells, tally_id: int = None, name: str = 'breeding'):
+    """Tritium production and heating of the breeding components in a
+    single tally, scored with one cell filter lookup per event. The tritium
+    breeding ratio and the energy multiplication are extracted with
+    results.breeding_performance, together with the neutron leakage of
+    leakage_tally.
+
+    Parameters
+    ----------
+    cells : iterable of openmc.Cell
+        breeding component cells, e.g. Reactor.select(*breeding_names).values()
+    tally_id : int, optional
+        id of the tally, by default automatically assigned
+    name : str, optional
+        name of the tally, by default 'breeding'
+
+    Returns
+    -------
+    openmc.Tally
+    """
+
+    tally = openmc.Tally(tally_id=tally_id, name=name)
+    tally.filters = [openmc.CellFilter(list(cells))]
+    tally.scores = list(breeding_scores)
+
+    return tally
+
+
+def leakage_tally(bounding_region: openmc.Region, particles=('neutron',), tally_id: int = None,
+                  name: str = 'leakage'):
+    """Current of the particles crossing the vacuum boundaries of the model,
+    i.e. the particles leaking out of it. Reflective and periodic surfaces
+    (e.g. the sector planes) are not scored.
+
+    Parameters
+    ----------
+    bounding_region : openmc.Region
+        outer region of the model, e.g. Reactor.bounding_region
+    particles : iterable of str, optional
+        particles of the particle filter, by default neutron
+    tally_id : int, optional
+        id of the tally, by default automatically assigned
+    name : str, optional
+        name of the tally, by default 'leakage'
+
+    Returns
+    -------
+    openmc.Tally
+    """
+
+    surfaces = [surface for surface in bounding_region.get_surfaces().values()
+                if surface.boundary_type == 'vacuum']
+    if not surfaces:
+        raise ValueError("the bounding region has no vacuum boundary")
+
+    tally = openmc.Tally(tally_id=tally_id, name=name)
+    tally.filters = [openmc.SurfaceFilter(surfaces), openmc.ParticleFilter(list(particles))]
+    tally.scores = ['current']
+
+    return tally
@@ -0,0 +1,15 @@
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('openmc')
+
+
+def test_package_import_does_not_load_deplete():
+    # openmc.deplete loads the openmc shared library, which a Python-only
+    # openmc install does not have
+    code = ("import sys, tokamak_radiation_environment; "
+            "assert 'openmc.deplete' not in sys.modules and 'openmc.lib' not in sys.modules")
+
+    subprocess.run([sys.executable, '-c', code], check=True)
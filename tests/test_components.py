@@ -0,0 +1,267 @@
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+openmc = pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import components
+
+
+def _point(r, phi, z=0.):
+    """Cartesian coordinates of a point given in cylindrical coordinates (deg)"""
+
+    return (r * math.cos(math.radians(phi)), r * math.sin(math.radians(phi)), z)
+
+
+def test_sector_angle_full_and_half():
+    assert components.sector_angle(18) == (-10., 10.)
+    assert components.sector_angle(18, half=True) == (0., 10.)
+    assert components.sector_angle(18, boundary_type='periodic') == (-10., 10.)
+
+
+def test_sector_angle_rejects_invalid_sectors():
+    with pytest.raises(ValueError):
+        components.sector_angle(0)
+    with pytest.raises(ValueError):
+        components.sector_angle(18, half=True, boundary_type='periodic')
+
+
+def test_periodic_sector_planes_are_paired():
+    lower_bound, upper_bound = components._sector_planes((-10., 10.), 'periodic')
+
+    assert lower_bound.boundary_type == upper_bound.boundary_type == 'periodic'
+    assert lower_bound.periodic_surface is upper_bound
+
+
+def test_reflective_sector_planes_are_not_paired():
+    lower_bound, upper_bound = components._sector_planes((-10., 10.))
+
+    assert lower_bound.boundary_type == upper_bound.boundary_type == 'reflective'
+    assert lower_bound.periodic_surface is None
+
+
+@pytest.mark.parametrize('boundary_type', ['reflective', 'periodic'])
+def test_sector_cell_bounds_the_wedge(boundary_type):
+    sphere = openmc.Sphere(r=1000.)
+    cells = [openmc.Cell(region=-openmc.ZCylinder(r=100.))]
+
+    root = components.sector_cell(cells, -sphere, angle=(-10., 10.), boundary_type=boundary_type)
+
+    assert _point(50., 0.) in root.region
+    assert _point(500., 9.) in root.region
+    assert _point(500., -9.) in root.region
+    assert _point(500., 11.) not in root.region
+    assert _point(500., 190.) not in root.region
+    assert _point(2000., 0.) not in root.region
+
+    planes = [surface for surface in root.region.get_surfaces().values() if surface is not sphere]
+    assert len(planes) == 2
+    assert all(plane.boundary_type == boundary_type for plane in planes)
+
+
+def test_sector_phi_matches_the_wedge():
+    phi = components.sector_phi((-10., 10.))
+
+    assert phi.a == pytest.approx(-math.pi / 18)
+    assert phi.b == pytest.approx(math.pi / 18)
+
+
+def test_surface_cache_shares_the_sector_planes():
+    cache = components.SurfaceCache()
+
+    planes = cache.sector_planes((-10, 10), 'periodic')
+
+    assert cache.sector_planes([-10., 10.], 'periodic') is planes
+    assert cache.sector_planes((-10., 10.)) is not planes
+    assert components.SurfaceCache().sector_planes((-10., 10.), 'periodic') is not planes
+
+
+def test_group_components_share_one_cache():
+    nodes = [(100., -100.), (300., -100.), (300., 100.), (100., 100.)]
+
+    pf_magnet, pf_insulation, pf_case = components.pfcoil_group(nodes, None, 5., None, 5., None,
+                                                                angle=(-10., 10.))
+    assert pf_insulation.surface_cache is pf_magnet.surface_cache
+    assert pf_case.surface_cache is pf_magnet.surface_cache
+
+    other = components.pfcoil_group(nodes, None, 5., None, 5., None, angle=(-10., 10.))[0]
+    assert other.surface_cache is not pf_magnet.surface_cache
+
+    cache = components.SurfaceCache()
+    magnet = components.pfcoil_group(nodes, None, 5., None, 5., None, surface_cache=cache)[0]
+    assert magnet.surface_cache is cache
+
+
+def test_components_use_the_same_sector_planes():
+    nodes = [(100., -100.), (300., -100.), (300., 100.), (100., 100.)]
+    pf_magnet, pf_insulation, pf_case = components.pfcoil_group(nodes, None, 5., None, 5., None,
+                                                                angle=(-10., 10.), boundary_type='periodic')
+
+    planes = {plane.id for plane in pf_magnet.surface_cache.sector_planes((-10., 10.), 'periodic')}
+    for component in (pf_magnet, pf_insulation, pf_case):
+        surfaces = component.region.get_surfaces()
+        assert planes <= set(surfaces)
+        assert sum(surface.boundary_type == 'periodic' for surface in surfaces.values()) == 2
+
+
+def test_add_boundaries_without_cache_creates_new_planes():
+    region = -openmc.ZCylinder(r=100.)
+
+    first = components._add_boundaries(region, (-10., 10.))
+    second = components._add_boundaries(region, (-10., 10.))
+
+    assert set(first.get_surfaces()) != set(second.get_surfaces())
+    assert components._add_boundaries(region, None) is region
+
+
+_tf_nodes = [(100., -100.), (300., -100.), (300., 100.), (100., 100.)]
+
+
+def _coil_point(u, v, z, rotation_angle):
+    """Cartesian coordinates of a point given in the frame of a TF coil
+    rotated by rotation_angle (deg): u along the coil midplane and v in the
+    toroidal direction"""
+
+    cos, sin = math.cos(math.radians(rotation_angle)), math.sin(math.radians(rotation_angle))
+
+    return (u * cos - v * sin, u * sin + v * cos, z)
+
+
+def _baseline_tf_coil(nodes, thickness, insulation_thickness, case_thickness, rotation_angle):
+    """Magnet, insulation and case regions as built before the radial and
+    toroidal thicknesses were decoupled"""
+
+    def envelope(offset, half_width):
+        inner = openmc.model.Polygon(nodes, basis='rz')
+        outer = openmc.model.Polygon(nodes, basis='rz').offset(thickness)
+        if offset:
+            inner = inner.offset(-offset)
+            outer = outer.offset(offset)
+        lower_bound = openmc.YPlane(y0=-half_width).rotate((0, 0, rotation_angle))
+        upper_bound = openmc.YPlane(y0=half_width).rotate((0, 0, rotation_angle))
+        left_bound = openmc.XPlane(x0=0).rotate((0, 0, rotation_angle))
+
+        return +inner & -outer & +lower_bound & -upper_bound & +left_bound
+
+    magnet = envelope(0., thickness)
+    insulation = envelope(insulation_thickness, thickness + insulation_thickness) & ~magnet
+    case = (envelope(insulation_thickness + case_thickness, thickness + insulation_thickness + case_thickness)
+            & ~magnet & ~insulation)
+
+    return magnet, insulation, case
+
+
+def test_tf_coil_defaults_give_the_baseline_geometry():
+    rotation_angle = 20.
+    magnet, insulation, case = components.tfcoil_group(_tf_nodes, 10., None, 2., None, 5., None,
+                                                       rotation_angle=rotation_angle)
+    expected = _baseline_tf_coil(_tf_nodes, 10., 2., 5., rotation_angle)
+
+    rng = np.random.default_rng(1)
+    points = [_coil_point(u, v, z, rotation_angle) for u, v, z in
+              zip(rng.uniform(-20., 340., 2000), rng.uniform(-25., 25., 2000), rng.uniform(-130., 130., 2000))]
+
+    for component, region in zip((magnet, insulation, case), expected):
+        found = [point in component.region for point in points]
+        assert found == [point in region for point in points]
+        assert any(found)
+
+
+def test_tf_coil_layer_offsets():
+    magnet = components.TFCoilMagnet(_tf_nodes, 10., None)
+    insulation = components.TFCoilInsulation(magnet, 2., None)
+    case = components.TFCoilCase(magnet, 5., None, tf_coil_insulation=insulation,
+                                 inner_thickness=1., outer_thickness=2., toroidal_thickness=3.)
+
+    assert magnet.offsets == (0., 10., 10.)
+    assert insulation.offsets == (2., 12., 12.)
+    assert case.offsets == (3., 14., 15.)
+
+    # without insulation the case wraps the magnet
+    assert components.TFCoilCase(magnet, 5., None).offsets == (5., 15., 15.)
+
+
+def test_tf_coil_decoupled_thicknesses():
+    magnet = components.TFCoilMagnet(_tf_nodes, 10., None, radial_thickness=4., toroidal_thickness=20.)
+
+    assert _coil_point(303., 15., 0., 0.) in magnet.region
+    assert _coil_point(303., 25., 0., 0.) not in magnet.region
+    assert _coil_point(306., 0., 0., 0.) not in magnet.region
+    assert _coil_point(200., 0., 0., 0.) not in magnet.region
+
+
+def test_tf_coil_layers_share_their_surfaces():
+    magnet, insulation, case = components.tfcoil_group(_tf_nodes, 10., None, 2., None, 5., None,
+                                                       rotation_angle=20.)
+    cache = magnet.surface_cache
+
+    assert insulation.surfaces[0] is cache.polygon(_tf_nodes, -2.)
+    assert insulation.surfaces[1] is cache.polygon(_tf_nodes, 12.)
+    assert insulation.surfaces[2:4] == cache.toroidal_planes(12., 20.)
+    assert case.surfaces[4] is magnet.surfaces[4]
+
+    point = _coil_point(305., 0., 0., 20.)
+    assert point in magnet.region
+    assert point not in insulation.region
+    assert point not in case.region
+
+
+def test_surface_cache_shares_polygons_and_offsets():
+    cache = components.SurfaceCache()
+
+    polygon = cache.polygon(_tf_nodes)
+
+    assert cache.polygon([list(node) for node in _tf_nodes]) is polygon
+    assert cache.offset(polygon, 0.) is polygon
+    assert cache.polygon(_tf_nodes, 2.) is cache.offset(polygon, 2.)
+    assert cache.polygon(_tf_nodes, 2.) is not cache.polygon(_tf_nodes, -2.)
+    assert components.SurfaceCache().polygon(_tf_nodes) is not polygon
+
+
+def test_core_layers_share_their_interfaces():
+    plasma_nodes = [(150., -50.), (250., -50.), (250., 50.), (150., 50.)]
+    firstwall_nodes = [(120., -80.), (280., -80.), (280., 80.), (120., 80.)]
+
+    core = components.core_group(plasma_nodes, None, firstwall_nodes, 1., None, 2., None, 3., None,
+                                 4., None, 5., None, 30., None, 20., None)
+    layers = core[2:]
+
+    for inner, outer in zip(layers[:-1], layers[1:]):
+        assert outer.surfaces[0] is inner.surfaces[1]
+
+    # the surfaces are not rebuilt on each access
+    shield = layers[-1]
+    assert shield.surfaces[1] is shield.surfaces[1]
+
+
+def test_blanket_outer_polygon_is_shared_with_the_shield():
+    plasma_nodes = [(150., -50.), (250., -50.), (250., 50.), (150., 50.)]
+    firstwall_nodes = [(120., -80.), (280., -80.), (280., 80.), (120., 80.)]
+    blanket_nodes = [(60., -150.), (340., -150.), (340., 150.), (60., 150.)]
+
+    core = components.core_group(plasma_nodes, None, firstwall_nodes, 1., None, 2., None, 3., None,
+                                 4., None, 5., None, 30., None, 20., None)
+    blanket = components.Blanket(core[6], 30., None, nodes=blanket_nodes)
+    shield = components.Shield(blanket, 20., None)
+
+    assert blanket.surfaces[1] is blanket.surface_cache.polygon(blanket_nodes)
+    assert shield.surfaces[0] is blanket.surfaces[1]
+    assert shield.surfaces[1] is blanket.surface_cache.polygon(blanket_nodes, 20.)
+
+
+def test_tf_coil_outer_polygon():
+    outer_nodes = [(90., -110.), (320., -110.), (320., 110.), (90., 110.)]
+    magnet, insulation, case = components.tfcoil_group(_tf_nodes, 10., None, 2., None, 5., None,
+                                                       magnet_outer_nodes=outer_nodes)
+    cache = magnet.surface_cache
+
+    assert magnet.offsets == (0., 0., 10.)
+    assert magnet.surfaces[1] is cache.polygon(outer_nodes)
+    assert insulation.surfaces[1] is cache.polygon(outer_nodes, 2.)
+    assert case.surfaces[1] is cache.polygon(outer_nodes, 7.)
+
+    assert _coil_point(315., 0., 0., 0.) in magnet.region
+    assert _coil_point(321., 0., 0., 0.) in insulation.region
+    assert _coil_point(325., 0., 0., 0.) in case.region
+    assert _coil_point(330., 0., 0., 0.) not in case.region
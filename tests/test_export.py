@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+h5py = pytest.importorskip('h5py')
+openmc = pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import export
+
+_n_realizations = 4
+
+
+class _StatePoint:
+    """Context manager returning a fixed tally"""
+
+    def __init__(self, tally):
+        self.tally = tally
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def get_tally(self, id=None, name=None):
+        return self.tally
+
+
+def _value(particle, mesh_bin, column):
+    return 10000. * particle + 10. * mesh_bin + column
+
+
+def _mesh_tally_statepoint(path, dimension, particles, nuclides, scores):
+    """Statepoint with the results of a (particle, mesh) tally where each
+    value encodes its particle, mesh bin and (nuclide, score) column"""
+
+    n_mesh = int(np.prod(dimension))
+    n_columns = len(nuclides) * len(scores)
+
+    mean = np.array([[_value(p, m, c) for c in range(n_columns)]
+                     for p in range(len(particles)) for m in range(n_mesh)])
+    results = np.stack([mean * _n_realizations, mean**2 * _n_realizations], axis=-1)
+
+    with h5py.File(path, 'w') as f:
+        f['tallies/tally 3/results'] = results
+
+    mesh = openmc.RegularMesh()
+    mesh.dimension = dimension
+    mesh.lower_left = [0., 0., 0.]
+    mesh.upper_right = [float(n) for n in dimension]
+    mesh_filter = openmc.MeshFilter(mesh)
+    filters = [openmc.ParticleFilter(particles), mesh_filter]
+
+    return SimpleNamespace(id=3, name='mesh', filters=filters, scores=scores, nuclides=nuclides,
+                           num_realizations=_n_realizations, find_filter=lambda filter_type: mesh_filter)
+
+
+def test_export_mesh_tally_columns_and_mesh_order(tmp_path, monkeypatch):
+    dimension = (3, 2, 2)
+    nuclides, scores = ['Fe56', 'total'], ['flux', 'heating']
+    tally = _mesh_tally_statepoint(tmp_path / 'statepoint.h5', dimension, ['neutron', 'photon'], nuclides, scores)
+    monkeypatch.setattr(export.openmc, 'StatePoint', lambda path: _StatePoint(tally))
+
+    output = export.export_mesh_tally(tmp_path / 'statepoint.h5', 3, tmp_path / 'mesh')
+
+    nx, ny, nz = dimension
+    z, y, x = np.meshgrid(range(nz), range(ny), range(nx), indexing='ij')
+    # the mesh bins are ordered x first
+    mesh_bin = x + nx * (y + ny * z)
+
+    with h5py.File(output.with_suffix('.h5'), 'r') as f:
+        assert f['mesh/points'].shape == (nz + 1, ny + 1, nx + 1, 3)
+        for n, nuclide in enumerate(nuclides):
+            for i, score in enumerate(scores):
+                for p, particle in enumerate(['neutron', 'photon']):
+                    name = f"{nuclide}/{score}/{particle}"
+                    expected = _value(p, mesh_bin, n * len(scores) + i)
+                    np.testing.assert_allclose(f[f'{name}/mean'][()], expected)
+                    np.testing.assert_allclose(f[f'{name}/std_dev'][()], 0., atol=1e-6 * expected.max())
+
+    assert 'Fe56/heating/photon/mean' in output.read_text()
+
+
+def test_export_mesh_tally_without_nuclides(tmp_path, monkeypatch):
+    tally = _mesh_tally_statepoint(tmp_path / 'statepoint.h5', (2, 1, 1), ['neutron'], ['total'], ['flux', 'heating'])
+    monkeypatch.setattr(export.openmc, 'StatePoint', lambda path: _StatePoint(tally))
+
+    output = export.export_mesh_tally(tmp_path / 'statepoint.h5', 3, tmp_path / 'mesh')
+
+    with h5py.File(output.with_suffix('.h5'), 'r') as f:
+        np.testing.assert_allclose(f['heating/neutron/mean'][()], [[[1., 11.]]])
+        assert 'total' not in f
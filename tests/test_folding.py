@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import folding, results
+
+
+def test_fold_contracts_the_group_axis():
+    rng = np.random.default_rng(1)
+    spectra = rng.random((4, 3))
+    responses = rng.random((2, 5, 3))
+
+    folded = folding.fold(spectra, responses)
+
+    assert folded.shape == (4, 2, 5)
+    np.testing.assert_allclose(folded, np.einsum('sg,mrg->smr', spectra, responses))
+
+
+def test_appm_per_fpy_normalization(monkeypatch):
+    responses = np.array([[1., 2., 3.], [0., 1., 0.]])
+    monkeypatch.setattr(folding, 'response_functions', lambda material, structure, reactions, temperature: responses)
+    material = SimpleNamespace(get_nuclide_atom_densities=lambda: {'Fe56': 0.05, 'Cr52': 0.03})
+    spectra = np.array([[1., 1., 1.], [2., 0., 0.]])
+
+    appm = folding.appm_per_fpy(spectra, [1., 10., 100., 1000.], [material], reactions=('a', 'b'),
+                                volume=2., fusion_power=1e9)
+
+    # reactions per source particle per atom, times the source neutrons per year
+    per_atom = np.array([[6., 1.], [2., 0.]]) / 2. / 0.08e24
+    expected = per_atom * 1e6 * results.source_rate(1e9) * 3600 * 24 * 365
+    assert appm.shape == (2, 1, 2)
+    np.testing.assert_allclose(appm[:, 0], expected)
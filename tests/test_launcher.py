@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import launcher
+from tokamak_radiation_environment.launcher import hybrid_layout, run
+
+
+def test_hybrid_layout_one_rank_per_numa_domain():
+    topology = {'nodes': 2, 'cores_per_node': 64, 'numa_per_node': 4}
+
+    assert hybrid_layout(topology=topology) == {'nodes': 2, 'ranks_per_node': 4, 'ranks': 8, 'threads': 16}
+
+
+def test_hybrid_layout_nodes_override():
+    topology = {'nodes': 1, 'cores_per_node': 8, 'numa_per_node': 1}
+
+    assert hybrid_layout(nodes=3, topology=topology) == {'nodes': 3, 'ranks_per_node': 1, 'ranks': 3, 'threads': 8}
+
+
+def test_hybrid_layout_at_least_one_thread():
+    topology = {'nodes': 1, 'cores_per_node': 2, 'numa_per_node': 4}
+
+    assert hybrid_layout(topology=topology)['threads'] == 1
+
+
+_topology = {'nodes': 2, 'cores_per_node': 64, 'numa_per_node': 4}
+
+
+def test_run_without_mpi_by_default():
+    assert run(None, topology=_topology, dry_run=True) == ['openmc', '-s', '64']
+
+
+def test_run_with_mpi(monkeypatch):
+    monkeypatch.setattr(launcher.shutil, 'which', lambda name: f'/usr/bin/{name}')
+
+    assert run(None, topology=_topology, mpiexec='mpiexec', dry_run=True) == \
+        ['mpiexec', '-n', '8', 'openmc', '-s', '16']
+
+
+def test_run_missing_mpi_launcher(monkeypatch):
+    monkeypatch.setattr(launcher.shutil, 'which', lambda name: None)
+
+    with pytest.raises(FileNotFoundError):
+        run(None, topology=_topology, mpiexec='mpiexec', dry_run=True)
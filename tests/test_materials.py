@@ -0,0 +1,90 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+openmc = pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import materials
+
+
+def _densities(material):
+    return dict(material.get_nuclide_atom_densities())
+
+
+def test_composition_matrix_matches_the_database():
+    composition = materials.composition_matrix()
+    library = materials.database()
+
+    assert composition.names.tolist() == list(library)
+    assert composition.atom_densities.shape == (len(library), len(composition.nuclides))
+
+    zams = [openmc.data.zam(nuclide) for nuclide in composition.nuclides]
+    assert zams == sorted(zams)
+
+    index = {nuclide: i for i, nuclide in enumerate(composition.nuclides)}
+    for row, (name, material) in enumerate(library.items()):
+        densities = _densities(material)
+        expected = np.zeros(len(index))
+        expected[[index[nuclide] for nuclide in densities]] = list(densities.values())
+        np.testing.assert_allclose(composition.atom_densities[row], expected)
+        assert composition.densities[row] == pytest.approx(material.get_mass_density())
+
+
+def test_composition_matrix_is_cached_and_read_only():
+    composition = materials.composition_matrix()
+
+    assert materials.composition_matrix() is composition
+    with pytest.raises(ValueError):
+        composition.atom_densities[0, 0] = 1.
+
+
+def _mix(names, volume_fractions):
+    """Expected atom densities of a volume mixture of database materials"""
+
+    library = materials.database()
+    expected = {}
+    for name, fraction in zip(names, volume_fractions):
+        for nuclide, density in _densities(library[name]).items():
+            expected[nuclide] = expected.get(nuclide, 0.) + fraction * density
+
+    return expected
+
+
+def _assert_densities(material, expected):
+    densities = _densities(material)
+
+    assert sorted(densities) == sorted(expected)
+    for nuclide, density in expected.items():
+        assert densities[nuclide] == pytest.approx(density)
+
+
+def test_mixture_volume_fractions():
+    mixed = materials.mixture(['tungsten', 'beryllium'], [1., 3.], name='w_be')
+
+    assert mixed.name == 'w_be'
+    _assert_densities(mixed, _mix(['tungsten', 'beryllium'], [0.25, 0.75]))
+
+
+def test_mixture_weight_fractions():
+    library = materials.database()
+    volumes = np.array([0.5 / library['ss316L'].get_mass_density(), 0.5 / library['flibe'].get_mass_density()])
+
+    mixed = materials.mixture(['ss316L', 'flibe'], [0.5, 0.5], percent_type='wo')
+
+    _assert_densities(mixed, _mix(['ss316L', 'flibe'], volumes / volumes.sum()))
+
+
+def test_mixture_returns_a_new_material():
+    first = materials.mixture(['tungsten', 'beryllium'], [0.5, 0.5])
+    second = materials.mixture(['tungsten', 'beryllium'], [0.5, 0.5])
+
+    assert first is not second
+    assert first.id != second.id
+
+    first.set_density('g/cm3', 1.)
+    _assert_densities(materials.mixture(['tungsten', 'beryllium'], [0.5, 0.5]),
+                      _mix(['tungsten', 'beryllium'], [0.5, 0.5]))
+
+
+def test_mixture_rejects_unknown_percent_type():
+    with pytest.raises(ValueError):
+        materials.mixture(['tungsten', 'beryllium'], [0.5, 0.5], percent_type='ao')
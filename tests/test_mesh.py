@@ -0,0 +1,224 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+openmc = pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import mesh
+
+_nodes = [(100., -50.), (200., -50.), (200., 60.), (100., 60.)]
+
+
+def _component(nodes=_nodes):
+    return SimpleNamespace(surfaces=[openmc.model.Polygon(nodes, basis='rz'), openmc.ZPlane(z0=0.)])
+
+
+def test_component_extent():
+    other = _component([(50., -80.), (120., -80.), (120., 0.), (50., 0.)])
+
+    assert mesh.component_extent([_component()]) == (100., 200., -50., 60.)
+    assert mesh.component_extent([_component(), other]) == (50., 200., -80., 60.)
+
+    with pytest.raises(ValueError):
+        mesh.component_extent([SimpleNamespace(surfaces=openmc.ZPlane(z0=0.))])
+
+
+def test_cylindrical_mesh_grids():
+    cylindrical = mesh.cylindrical_mesh([_component()], angle=(0., 10.), resolution=(30., 4., 50.), padding=5.)
+
+    np.testing.assert_allclose(cylindrical.r_grid, np.linspace(95., 205., 5))
+    np.testing.assert_allclose(cylindrical.phi_grid, np.radians(np.linspace(0., 10., 4)))
+    np.testing.assert_allclose(cylindrical.z_grid, np.linspace(-55., 65., 4))
+
+    full = mesh.cylindrical_mesh([_component()], resolution=(10., 10., 10.))
+    assert full.phi_grid[-1] == pytest.approx(2 * math.pi)
+
+
+def test_cylindrical_mesh_negative_sectors():
+    below = mesh.cylindrical_mesh([_component()], angle=(-20., -10.), resolution=(10., 1., 10.))
+    np.testing.assert_allclose(np.degrees(below.phi_grid[[0, -1]]), [340., 350.])
+
+    with pytest.warns(UserWarning):
+        straddling = mesh.cylindrical_mesh([_component()], angle=(-10., 10.), resolution=(10., 1., 10.))
+    np.testing.assert_allclose(np.degrees(straddling.phi_grid[[0, -1]]), [0., 10.])
+    assert len(straddling.phi_grid) == 11
+
+
+def test_voxel_centers_in_mesh_filter_order():
+    cylindrical = openmc.CylindricalMesh(r_grid=[0., 1., 3.], phi_grid=[0., math.pi / 2, math.pi],
+                                         z_grid=[0., 2.])
+
+    points = mesh.voxel_centers(cylindrical)
+
+    # r varies first, then phi, then z
+    r = np.hypot(points[:, 0], points[:, 1])
+    np.testing.assert_allclose(r, [0.5, 2., 0.5, 2.])
+    np.testing.assert_allclose(np.arctan2(points[:, 1], points[:, 0]), np.repeat([math.pi / 4, 3 * math.pi / 4], 2))
+    np.testing.assert_allclose(points[:, 2], 1.)
+
+    volumes = mesh.voxel_volumes(cylindrical)
+    np.testing.assert_allclose(volumes, [math.pi / 4 * 2, math.pi / 4 * 8 * 2] * 2)
+    assert volumes.sum() == pytest.approx(math.pi * 9 / 2 * 2)
+
+
+def test_region_contains_matches_openmc():
+    cylinder = openmc.ZCylinder(r=50.)
+    plane = openmc.Plane(a=1., b=1., c=0., d=10.)
+    sphere = openmc.Sphere(r=80.)
+    cone = openmc.ZCone(r2=0.5)
+    region = (-sphere & ~(-cylinder | -plane)) | (+cone & -sphere)
+
+    points = np.random.default_rng(1).uniform(-100., 100., (1000, 3))
+
+    found = mesh.region_contains(region, points)
+
+    np.testing.assert_array_equal(found, [tuple(point) in region for point in points])
+    assert found.any() and not found.all()
+
+
+def test_region_contains_polygon():
+    polygon = openmc.model.Polygon(_nodes, basis='rz')
+    points = np.array([[150., 0., 0.], [0., 150., 0.], [250., 0., 0.], [150., 0., 70.]])
+
+    np.testing.assert_array_equal(mesh.region_contains(-polygon, points), [True, True, False, False])
+
+
+def test_classify_plane_and_cylinder():
+    regular = openmc.RegularMesh()
+    regular.lower_left = (-2., -2., -1.)
+    regular.upper_right = (2., 2., 1.)
+    regular.dimension = (4, 4, 2)
+
+    cylinder = openmc.ZCylinder(r=1.)
+    plane = openmc.ZPlane(z0=0.)
+    cells = {'core': openmc.Cell(region=-cylinder),
+             'top': openmc.Cell(region=+cylinder & +plane)}
+
+    found = mesh.classify(regular, cells, chunk_size=5)
+
+    x, y, z = mesh.voxel_centers(regular).T
+    expected = np.where(x**2 + y**2 < 1., 0, np.where(z > 0., 1, -1))
+    np.testing.assert_array_equal(found, expected)
+    assert (found == 0).sum() == 8
+
+
+def test_component_masks_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(mesh, 'cache_dir', lambda name: tmp_path / name)
+    regular = openmc.RegularMesh()
+    regular.lower_left = (-2., -2., -1.)
+    regular.upper_right = (2., 2., 1.)
+    regular.dimension = (4, 4, 2)
+    cells = {'core': openmc.Cell(region=-openmc.ZCylinder(r=1.))}
+
+    masks = mesh.component_masks(regular, cells)
+    assert len(list((tmp_path / 'masks').glob('*.npy'))) == 1
+
+    monkeypatch.setattr(mesh, 'classify', lambda *args, **kwargs: pytest.fail("masks not read from the cache"))
+    np.testing.assert_array_equal(mesh.component_masks(regular, cells), masks)
+
+
+def test_component_reductions_max_and_percentiles():
+    masks = np.array([0, 0, 0, 1, 1, -1, 0])
+    values = np.array([[1., 2., 3., 10., 20., 99., 4.],
+                       [4., 3., 2., 5., 5., 99., 1.]])
+    volumes = np.array([1., 1., 2., 1., 3., 1., 1.])
+
+    df = mesh.component_reductions(values, masks, ['a', 'b'], volumes, percentiles=(50., 95.))
+
+    for field in range(2):
+        for component, name in enumerate(['a', 'b']):
+            inside = values[field, masks == component]
+            row = df.loc[(field, name)]
+            assert row['max'] == inside.max()
+            assert row['mean'] == pytest.approx(inside.mean())
+            assert row['p50'] == pytest.approx(np.percentile(inside, 50.))
+            assert row['p95'] == pytest.approx(np.percentile(inside, 95.))
+            weights = volumes[masks == component]
+            assert row['volume'] == pytest.approx(weights.sum())
+            assert row['integral'] == pytest.approx((inside * weights).sum())
+
+
+def test_component_reductions_empty_component():
+    df = mesh.component_reductions([1., 2.], np.array([0, 0]), ['a', 'b'])
+
+    assert df.loc[(0, 'a'), 'max'] == 2.
+    assert df.loc[(0, 'b'), 'volume'] == 0.
+    assert np.isnan(df.loc[(0, 'b'), 'max'])
+    assert np.isnan(df.loc[(0, 'b'), 'p95'])
+
+
+def test_component_reductions_no_voxel_inside():
+    df = mesh.component_reductions([[1., 2.]], np.array([-1, -1]), ['a'])
+
+    assert len(df) == 1
+    assert df.loc[(0, 'a'), 'volume'] == 0.
+    assert np.isnan(df.loc[(0, 'a'), 'max'])
+    assert np.isnan(df.loc[(0, 'a'), 'p95'])
+
+
+class _MeshTally:
+    """Tally with a particle filter, a mesh filter and nuclides"""
+
+    def __init__(self, regular, data):
+        self.id = 8
+        self.mesh_filter = SimpleNamespace(mesh=regular)
+        self.filters = [SimpleNamespace(bins=['neutron', 'photon']), self.mesh_filter]
+        self.nuclides = ['total', 'Fe56']
+        self.scores = ['flux', 'heating']
+        self._data = data
+
+    def find_filter(self, filter_type):
+        return self.mesh_filter
+
+    def get_reshaped_data(self, value='mean'):
+        return self._data
+
+    def get_nuclide_index(self, nuclide):
+        return self.nuclides.index(nuclide)
+
+    def get_score_index(self, score):
+        return self.scores.index(score)
+
+
+def _mesh_tally():
+    regular = openmc.RegularMesh()
+    regular.lower_left = (0., 0., 0.)
+    regular.upper_right = (8., 1., 1.)
+    regular.dimension = (4, 1, 1)
+
+    # (particle, voxel, nuclide, score) encoding all the indices
+    p, v, n, s = np.meshgrid(range(2), range(4), range(2), range(2), indexing='ij')
+
+    return _MeshTally(regular, 1000. * p + 100. * v + 10. * n + s)
+
+
+def test_tally_reductions_fields_and_nuclides(monkeypatch):
+    monkeypatch.setattr(mesh, 'component_masks', lambda *args, **kwargs: np.array([0, 0, 1, -1]))
+    cells = {'a': None, 'b': None}
+    statepoint = SimpleNamespace(get_tally=lambda id=None, name=None: tally)
+    tally = _mesh_tally()
+
+    df = mesh.tally_reductions(statepoint, 8, cells, score='heating', nuclide='Fe56')
+
+    # one field per particle, values per unit volume (2 cm3 voxels)
+    for field in range(2):
+        values = (1000. * field + 100. * np.arange(4) + 10. + 1.) / 2.
+        assert df.loc[(field, 'a'), 'max'] == pytest.approx(values[1])
+        assert df.loc[(field, 'a'), 'mean'] == pytest.approx(values[:2].mean())
+        assert df.loc[(field, 'a'), 'integral'] == pytest.approx(2. * values[:2].sum())
+        assert df.loc[(field, 'b'), 'max'] == pytest.approx(values[2])
+
+    df = mesh.tally_reductions(statepoint, 8, cells)
+    assert df.loc[(1, 'b'), 'max'] == pytest.approx((1000. + 200.) / 2.)
+
+
+def test_tally_reductions_unknown_nuclide(monkeypatch):
+    monkeypatch.setattr(mesh, 'component_masks', lambda *args, **kwargs: np.array([0, 0, 1, -1]))
+    tally = _mesh_tally()
+    statepoint = SimpleNamespace(get_tally=lambda id=None, name=None: tally)
+
+    with pytest.raises(ValueError, match='U235'):
+        mesh.tally_reductions(statepoint, 8, {'a': None}, nuclide='U235')
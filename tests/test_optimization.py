@@ -0,0 +1,72 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+pytest.importorskip('scipy')
+pytest.importorskip('openmc')
+
+from tokamak_radiation_environment.optimization import AttenuationFit, latin_hypercube
+
+
+def _fluence(thicknesses, f0=1e10, mu=(0.1, 0.05)):
+    return f0 * np.exp(-np.asarray(thicknesses) @ np.asarray(mu))
+
+
+def _fit():
+    thicknesses = latin_hypercube({'blanket': (0., 100.), 'shield': (0., 100.)}, 6, seed=1)
+    thicknesses = np.array([[point['blanket'], point['shield']] for point in thicknesses])
+
+    return AttenuationFit(thicknesses, _fluence(thicknesses))
+
+
+def test_latin_hypercube_within_bounds():
+    points = latin_hypercube({'a': (0., 1.), 'b': (10., 20.)}, 5, seed=1)
+
+    assert len(points) == 5
+    assert all(0. <= point['a'] <= 1. and 10. <= point['b'] <= 20. for point in points)
+    # one point per stratum of each parameter
+    assert sorted(int(point['a'] * 5) for point in points) == [0, 1, 2, 3, 4]
+
+
+def test_attenuation_fit_recovers_the_coefficients():
+    fit = _fit()
+
+    assert np.exp(fit.log_f0) == pytest.approx(1e10)
+    np.testing.assert_allclose(fit.mu, [0.1, 0.05])
+    assert fit.sigma == pytest.approx(0., abs=1e-8)
+    assert fit([10., 20.]) == pytest.approx(_fluence([10., 20.]))
+
+
+def test_minimum_build_uses_the_most_attenuating_layer():
+    fit = _fit()
+
+    build = fit.minimum_build(1e6, lower=[0., 0.], upper=[100., 100.])
+
+    np.testing.assert_allclose(build, [np.log(1e4) / 0.1, 0.], atol=1e-6)
+    assert fit(build) == pytest.approx(1e6)
+
+
+def test_minimum_build_with_lower_bounds_and_margin():
+    fit = _fit()
+
+    build = fit.minimum_build(1e6, lower=[0., 10.], upper=[100., 100.], margin=0.5)
+
+    np.testing.assert_allclose(build, [(np.log(1e4) + 0.5 - 0.05 * 10.) / 0.1, 10.], atol=1e-6)
+    assert fit(build) == pytest.approx(1e6 * np.exp(-0.5))
+
+
+def test_minimum_build_unreachable_target():
+    assert _fit().minimum_build(1e-10, lower=[0., 0.], upper=[100., 100.]) is None
+
+
+def test_attenuation_fit_leaves_out_unscored_points():
+    thicknesses = np.array([[0., 0.], [10., 0.], [0., 10.], [50., 50.], [100., 100.]])
+    fluences = _fluence(thicknesses)
+    fluences[3:] = [0., np.nan]
+
+    fit = AttenuationFit(thicknesses, fluences)
+
+    np.testing.assert_allclose(fit.mu, [0.1, 0.05])
+
+    with pytest.raises(ValueError):
+        AttenuationFit(thicknesses[1:], fluences[1:])
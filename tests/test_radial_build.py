@@ -0,0 +1,71 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import radial_build
+
+
+def _material(mass_densities):
+    return SimpleNamespace(get_mass_densities=lambda: dict(mass_densities))
+
+
+steel = _material({'Fe56': 7.9})
+water = _material({'H1': 0.111, 'O16': 0.889})
+
+# diamond with the inboard midplane node at r = 100 cm
+_nodes = [(100., 0.), (200., -100.), (300., 0.), (200., 100.)]
+
+
+def _core_parameters(shield_thickness=20.):
+    parameters = {'firstwall_inner_nodes': _nodes}
+    for prefix, thickness in zip(radial_build.layer_prefixes, (1., 2., 3., 4., 5., 30., shield_thickness)):
+        parameters[f"{prefix}_thickness"] = thickness
+        parameters[f"{prefix}_material"] = water if prefix == 'vv_channel' else steel
+
+    return parameters
+
+
+def test_mass_removal_cross_section():
+    assert radial_build.mass_removal_cross_section(1) == 0.598
+    assert radial_build.mass_removal_cross_section(8) == pytest.approx(0.19 * 8**-0.743)
+    assert radial_build.mass_removal_cross_section(26) == pytest.approx(0.125 * 26**-0.565)
+
+
+def test_removal_cross_section_of_a_mixture():
+    expected = 0.111 * 0.598 + 0.889 * 0.19 * 8**-0.743
+
+    assert radial_build.removal_cross_section(water) == pytest.approx(expected)
+
+
+def test_estimate_inboard_midplane():
+    df = radial_build.estimate(_core_parameters())
+
+    assert list(df['component']) == list(radial_build.layer_names)
+    # the ray is normal to the wall
+    np.testing.assert_allclose(df['path'], df['thickness'])
+
+    sigma = [radial_build.removal_cross_section(water if prefix == 'vv_channel' else steel)
+             for prefix in radial_build.layer_prefixes]
+    np.testing.assert_allclose(df['removal_cross_section'], sigma)
+    np.testing.assert_allclose(df['transmission'], np.exp(-np.cumsum(np.array(sigma) * df['thickness'])))
+
+
+def test_estimate_oblique_ray():
+    df = radial_build.estimate(_core_parameters(), direction=(-1., 1.))
+
+    np.testing.assert_allclose(df['path'], df['thickness'] * math.sqrt(2.))
+
+
+def test_screen_matches_estimate():
+    designs = [_core_parameters(shield_thickness) for shield_thickness in (10., 20., 40.)]
+
+    transmission = radial_build.screen(designs)
+
+    expected = [radial_build.estimate(design)['transmission'].iloc[-1] for design in designs]
+    np.testing.assert_allclose(transmission, expected)
+    assert transmission[0] > transmission[1] > transmission[2]
@@ -0,0 +1,102 @@
+import warnings
+import xml.etree.ElementTree as ET
+
+import pytest
+
+openmc = pytest.importorskip('openmc')
+
+from tokamak_radiation_environment.reactor import Reactor
+
+
+class _Component:
+    """Component filling a fixed region"""
+
+    def __init__(self, region, material):
+        self.region = region
+        self.material = material
+
+    @property
+    def cell(self):
+        return openmc.Cell(region=self.region, fill=self.material)
+
+
+def _material(name, nuclide='Fe56'):
+    material = openmc.Material(name=name)
+    material.add_nuclide(nuclide, 1.)
+    material.set_density('g/cm3', 1.)
+
+    return material
+
+
+def _reactor(steel, water):
+    cylinders = [openmc.ZCylinder(r=r) for r in (10., 20., 30., 40.)]
+    components = {'vessel': _Component(-cylinders[0], steel),
+                  'blanket': _Component(+cylinders[0] & -cylinders[1], water),
+                  'shield': _Component(+cylinders[1] & -cylinders[2], steel),
+                  'magnet': _Component(+cylinders[2] & -cylinders[3], _material('magnet', 'Cu63'))}
+
+    return Reactor(components, -openmc.Sphere(r=100., boundary_type='vacuum'))
+
+
+def _cell_materials(path):
+    return {cell.get('name'): cell.get('material') for cell in ET.parse(path).getroot().iter('cell')
+            if cell.get('material') not in (None, 'void')}
+
+
+def _material_ids(path):
+    return {material.get('id') for material in ET.parse(path).getroot().iter('material')}
+
+
+def test_set_material_keeps_the_geometry(tmp_path):
+    reactor = _reactor(_material('steel'), _material('water', 'O16'))
+    reactor.geometry.export_to_xml(tmp_path / 'geometry.xml')
+    water = reactor.cells['blanket'].fill
+
+    breeder = _material('breeder', 'Li6')
+    assert reactor.set_material(breeder, 'blanket') == ['blanket']
+    reactor.export_materials(tmp_path / 'materials.xml')
+
+    assert breeder.id == water.id
+    assert reactor.cells['blanket'].fill is breeder
+    assert reactor.components['blanket'].material is breeder
+    assert [material.name for material in reactor.materials] == ['steel', 'breeder', 'magnet']
+
+    # the geometry exported before the swap points to the new material
+    assert set(_cell_materials(tmp_path / 'geometry.xml').values()) == _material_ids(tmp_path / 'materials.xml')
+    reactor.geometry.export_to_xml(tmp_path / 'new_geometry.xml')
+    assert _cell_materials(tmp_path / 'new_geometry.xml') == _cell_materials(tmp_path / 'geometry.xml')
+
+
+def test_set_material_of_cells_with_different_materials(tmp_path):
+    reactor = _reactor(_material('steel'), _material('water', 'O16'))
+    reactor.geometry.export_to_xml(tmp_path / 'geometry.xml')
+    replaced = {reactor.cells[name].fill.id for name in ('vessel', 'shield', 'blanket')}
+
+    reactor.set_material(_material('breeder', 'Li6'), 'vessel', 'shield', 'blanket')
+    reactor.export_materials(tmp_path / 'materials.xml')
+
+    assert {reactor.cells[name].fill.id for name in ('vessel', 'shield', 'blanket')} == replaced
+    assert reactor.cells['vessel'].fill is reactor.cells['shield'].fill
+    assert reactor.cells['vessel'].fill is not reactor.cells['blanket'].fill
+    assert set(_cell_materials(tmp_path / 'geometry.xml').values()) == _material_ids(tmp_path / 'materials.xml')
+
+
+def test_set_material_of_a_shared_material_warns():
+    steel = _material('steel')
+    reactor = _reactor(steel, _material('water', 'O16'))
+
+    breeder = _material('breeder', 'Li6')
+    with pytest.warns(UserWarning, match='geometry has to be exported again'):
+        reactor.set_material(breeder, 'shield')
+
+    assert breeder.id != steel.id
+    assert reactor.cells['shield'].fill is breeder
+    assert reactor.cells['vessel'].fill is steel
+
+
+def test_set_material_without_match():
+    reactor = _reactor(_material('steel'), _material('water', 'O16'))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert reactor.set_material(_material('breeder', 'Li6'), 'missing') == []
@@ -0,0 +1,23 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import response
+
+
+def test_collapse_constant_cross_section():
+    energy = np.geomspace(1., 1e6, 50)
+
+    collapsed = response.collapse(energy, np.full(50, 2.), [1., 1e3, 1e6])
+
+    np.testing.assert_allclose(collapsed, [[2., 2.]])
+
+
+def test_collapse_linear_cross_section_flat_weight():
+    # the average of a linear cross section over a group is its midpoint value
+    collapsed = response.collapse([1., 4.], [[1., 4.], [2., 2.]], [1., 2.5, 4.],
+                                  weight=lambda e: np.ones_like(e))
+
+    np.testing.assert_allclose(collapsed, [[1.75, 3.25], [2., 2.]])
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import pytest
+
+openmc = pytest.importorskip('openmc')
+h5py = pytest.importorskip('h5py')
+
+from tokamak_radiation_environment.restart import _latest_valid, model_hash
+
+
+def _model(batches=10, particles=1000, radius=10.):
+    openmc.reset_auto_ids()
+
+    sphere = openmc.Sphere(r=radius, boundary_type='vacuum')
+    geometry = openmc.Geometry([openmc.Cell(region=-sphere)])
+
+    settings = openmc.Settings(run_mode='fixed source')
+    settings.batches = batches
+    settings.particles = particles
+
+    return openmc.Model(geometry=geometry, settings=settings)
+
+
+def test_model_hash_is_stable():
+    assert model_hash(_model()) == model_hash(_model())
+
+
+def test_model_hash_ignores_restartable_settings():
+    assert model_hash(_model(batches=10)) == model_hash(_model(batches=50))
+
+
+def test_model_hash_tracks_the_model():
+    reference = model_hash(_model())
+
+    assert model_hash(_model(particles=2000)) != reference
+    assert model_hash(_model(radius=20.)) != reference
+
+
+def _write_statepoint(path, batch, particles=1000):
+    with h5py.File(path, 'w') as f:
+        f['n_particles'] = particles
+        f['run_mode'] = 'fixed source'
+        f['current_batch'] = batch
+        f.create_group('tallies')
+
+
+def test_latest_valid_skips_unreadable_and_foreign_statepoints(tmp_path):
+    model = SimpleNamespace(settings=SimpleNamespace(particles=1000, run_mode='fixed source', batches=20))
+
+    _write_statepoint(tmp_path / 'statepoint.05.h5', 5)
+    _write_statepoint(tmp_path / 'statepoint.10.h5', 10)
+    _write_statepoint(tmp_path / 'statepoint.15.h5', 15, particles=2000)
+    (tmp_path / 'statepoint.20.h5').write_bytes(b'truncated')
+
+    assert _latest_valid(tmp_path, model) == tmp_path / 'statepoint.10.h5'
+
+
+def test_latest_valid_without_statepoints(tmp_path):
+    model = SimpleNamespace(settings=SimpleNamespace(particles=1000, run_mode='fixed source', batches=20))
+
+    assert _latest_valid(tmp_path, model) is None
@@ -0,0 +1,280 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+h5py = pytest.importorskip('h5py')
+openmc = pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import results
+
+
+class _Tally:
+    """Tally returning a fixed dataframe"""
+
+    def __init__(self, tally_id, df, cell_filter=True):
+        self.id = tally_id
+        self._df = pd.DataFrame(df)
+        self._cell_filter = cell_filter
+
+    def get_pandas_dataframe(self):
+        return self._df.copy()
+
+    def contains_filter(self, filter_type):
+        return self._cell_filter
+
+
+class _StatePoint:
+    """Statepoint holding tallies in memory. As the tallies are not
+    openmc.Tally objects, results._tally looks them up by id."""
+
+    def __init__(self, tallies=(), time=2., batch=10):
+        self.tallies = {tally.id: tally for tally in tallies}
+        self.runtime = {'active batches': time}
+        self.current_batch = batch
+
+    def get_tally(self, id=None, name=None):
+        return self.tallies[getattr(id, 'id', id)]
+
+
+def test_tally_fom():
+    tally = _Tally(1, {'mean': [1., 2., 0., 4.], 'std. dev.': [0.1, 0.5, 0., 0.]})
+
+    df = results.tally_fom(_StatePoint([tally], time=2.), 1)
+
+    np.testing.assert_allclose(df['rel. err.'], [0.1, 0.25, np.nan, np.nan])
+    np.testing.assert_allclose(df['fom'], [50., 8., np.nan, np.nan])
+
+    df = results.tally_fom(_StatePoint([tally], time=2.), 1, time=4.)
+    np.testing.assert_allclose(df['fom'], [25., 4., np.nan, np.nan])
+
+
+def test_component_fom_aggregates_the_cell_bins():
+    tally = _Tally(3, {'cell': [5, 5, 6, 7], 'score': ['flux'] * 4,
+                       'mean': [1., 1., 1., 1.], 'std. dev.': [0.1, 0.2, 0.5, 0.1]})
+    ignored = _Tally(4, {'mean': [1.], 'std. dev.': [0.1]}, cell_filter=False)
+    cells = {'magnet': SimpleNamespace(id=5), 'case': SimpleNamespace(id=6)}
+
+    df = results.component_fom(_StatePoint([tally, ignored], time=1.), cells).set_index('component')
+
+    assert list(df.index) == ['magnet', 'case']
+    assert (df['tally'] == 3).all()
+    assert df.loc['magnet', 'fom_min'] == pytest.approx(25.)
+    assert df.loc['magnet', 'fom_median'] == pytest.approx((100. + 25.) / 2)
+    assert df.loc['magnet', 'rel_err_max'] == pytest.approx(0.2)
+    assert df.loc['case', 'fom_min'] == pytest.approx(4.)
+
+
+def test_component_fom_without_cell_tallies():
+    df = results.component_fom(_StatePoint(), {'magnet': SimpleNamespace(id=5)})
+
+    assert df.empty
+    assert list(df.columns) == ['tally', 'component', 'score', 'fom_min', 'fom_median', 'rel_err_max']
+
+
+def test_fom_history_sorted_by_batch():
+    statepoints = [_StatePoint([_Tally(1, {'mean': [1., 1.], 'std. dev.': [0.1, 0.2]})], time=1., batch=20),
+                   _StatePoint([_Tally(1, {'mean': [1., 1.], 'std. dev.': [0.2, 0.4]})], time=1., batch=10)]
+
+    df = results.fom_history(statepoints, 1)
+
+    assert list(df['batch']) == [10, 20]
+    np.testing.assert_allclose(df['fom_min'], [1 / 0.16, 25.])
+    np.testing.assert_allclose(df['fom_median'], [(25. + 1 / 0.16) / 2, (100. + 25.) / 2])
+
+
+def _run_statepoint(path, particles, batches, runtime=1., score_bins=(1,)):
+    """Minimal statepoint with the datasets read by merge_statepoints, from
+    the per-realization values of a tally (realization, bin, score) and of
+    the global tallies (realization, global tally)"""
+
+    tally = np.stack([batches.sum(axis=0), (batches**2).sum(axis=0)], axis=-1)
+    global_batches = batches.sum(axis=(1, 2))[:, None] * [1., 2.]
+    global_tallies = np.stack([np.zeros(2), global_batches.sum(axis=0), (global_batches**2).sum(axis=0)], axis=-1)
+
+    with h5py.File(path, 'w') as f:
+        f['n_particles'] = particles
+        f['n_realizations'] = len(batches)
+        f['n_batches'] = len(batches)
+        f['current_batch'] = len(batches)
+        f['tallies/tally 1/results'] = tally
+        f['tallies/tally 1/n_realizations'] = len(batches)
+        f['tallies/tally 1/score_bins'] = np.array(score_bins)
+        f['global_tallies'] = global_tallies
+        f['runtime/total'] = runtime
+        f['runtime/active batches'] = runtime / 2
+
+    return path
+
+
+def _mean_std_dev(sum_, sum_sq, n):
+    """Mean and standard deviation of the mean as computed by openmc"""
+
+    mean = sum_ / n
+    return mean, np.sqrt((sum_sq / n - mean**2) / (n - 1))
+
+
+def test_merge_statepoints_weights_the_runs_by_histories(tmp_path):
+    rng = np.random.default_rng(1)
+    batches = [rng.random((4, 3, 2)), 2. + rng.random((6, 3, 2))]
+    paths = [_run_statepoint(tmp_path / 'a.h5', 100, batches[0], 2.),
+             _run_statepoint(tmp_path / 'b.h5', 300, batches[1], 4.)]
+
+    merged = results.merge_statepoints(paths, tmp_path / 'merged.h5', chunk_size=2)
+
+    # 400 and 1800 histories
+    weights = np.array([400., 1800.]) / 2200.
+    expected_mean = sum(w * b.mean(axis=0) for w, b in zip(weights, batches))
+    expected_std_dev = np.sqrt(sum(w**2 * b.var(axis=0, ddof=1) / len(b) for w, b in zip(weights, batches)))
+
+    with h5py.File(merged, 'r') as f:
+        tally = f['tallies/tally 1/results'][()]
+        mean, std_dev = _mean_std_dev(tally[..., 0], tally[..., 1], 10)
+        np.testing.assert_allclose(mean, expected_mean)
+        np.testing.assert_allclose(std_dev, expected_std_dev)
+
+        global_batches = [b.sum(axis=(1, 2))[:, None] * [1., 2.] for b in batches]
+        gt = f['global_tallies'][()]
+        mean, std_dev = _mean_std_dev(gt[:, 1], gt[:, 2], 10)
+        np.testing.assert_allclose(mean, sum(w * g.mean(axis=0) for w, g in zip(weights, global_batches)))
+        np.testing.assert_allclose(std_dev, np.sqrt(sum(w**2 * g.var(axis=0, ddof=1) / len(g)
+                                                        for w, g in zip(weights, global_batches))))
+
+        assert f['n_realizations'][()] == 10
+        assert f['tallies/tally 1/n_realizations'][()] == 10
+        assert f['n_particles'][()] == 220
+        assert f['runtime/total'][()] == pytest.approx(6.)
+
+
+def test_merge_statepoints_identical_runs(tmp_path):
+    batches = np.random.default_rng(2).random((5, 3, 2))
+
+    paths = [_run_statepoint(tmp_path / f'{i}.h5', 100, batches) for i in range(3)]
+    merged = results.merge_statepoints(paths, tmp_path / 'merged.h5')
+
+    with h5py.File(merged, 'r') as f:
+        tally = f['tallies/tally 1/results'][()]
+        mean, std_dev = _mean_std_dev(tally[..., 0], tally[..., 1], 15)
+        np.testing.assert_allclose(mean, batches.mean(axis=0))
+        # three independent runs with the same variance
+        np.testing.assert_allclose(std_dev, np.sqrt(batches.var(axis=0, ddof=1) / 5 / 3))
+        assert f['n_realizations'][()] == 15
+
+
+def test_merge_statepoints_rejects_different_tallies(tmp_path):
+    rng = np.random.default_rng(3)
+    paths = [_run_statepoint(tmp_path / 'a.h5', 100, rng.random((4, 3, 2))),
+             _run_statepoint(tmp_path / 'b.h5', 100, rng.random((4, 5, 2)))]
+
+    with pytest.raises(ValueError):
+        results.merge_statepoints(paths, tmp_path / 'merged.h5')
+    assert not (tmp_path / 'merged.h5').exists()
+
+    paths[1] = _run_statepoint(tmp_path / 'b.h5', 100, rng.random((4, 3, 2)), score_bins=(2,))
+    with pytest.raises(ValueError):
+        results.merge_statepoints(paths, tmp_path / 'merged.h5')
+
+
+def test_merge_statepoints_needs_two_realizations(tmp_path):
+    rng = np.random.default_rng(4)
+    paths = [_run_statepoint(tmp_path / 'a.h5', 100, rng.random((4, 3, 2))),
+             _run_statepoint(tmp_path / 'b.h5', 100, rng.random((1, 3, 2)))]
+
+    with pytest.raises(ValueError):
+        results.merge_statepoints(paths, tmp_path / 'merged.h5')
+
+
+class _HeatingTally:
+    """Heating tally with a particle filter and a cell filter"""
+
+    def __init__(self, tally_id, particles, cell_ids, mean, std_dev):
+        self.id = tally_id
+        self.filters = [SimpleNamespace(bins=list(particles)), SimpleNamespace(bins=list(cell_ids))]
+        self._filters = {openmc.ParticleFilter: self.filters[0], openmc.CellFilter: self.filters[1]}
+        self._data = {'mean': np.asarray(mean)[..., None, None], 'std_dev': np.asarray(std_dev)[..., None, None]}
+
+    def find_filter(self, filter_type):
+        return self._filters[filter_type]
+
+    def get_reshaped_data(self, value='mean'):
+        return self._data[value]
+
+
+def _heating_statepoint():
+    # eV per source particle, (particle, cell)
+    mean = [[1e6, 2e6, 3e6], [4e6, 0., 1e6]]
+    std_dev = [[3e4, 0., 0.], [4e4, 0., 0.]]
+
+    return _StatePoint([_HeatingTally(5, ['neutron', 'photon'], [11, 12, 13], mean, std_dev)])
+
+
+def test_component_heating_normalization():
+    cells = {'magnet': SimpleNamespace(id=12, volume=None), 'shield': SimpleNamespace(id=11, volume=None),
+             'other': SimpleNamespace(id=99, volume=None)}
+
+    df = results.component_heating(_heating_statepoint(), cells, tally=5, volumes={'magnet': 10., 'shield': 5.},
+                                   fusion_power=1e9)
+
+    # W per eV per source particle
+    norm = results.source_rate(1e9) * 1.60218e-19
+    assert list(df.index) == ['magnet', 'shield']
+    np.testing.assert_allclose(df['neutron [W]'], [2e6 * norm, 1e6 * norm])
+    np.testing.assert_allclose(df['photon [W]'], [0., 4e6 * norm])
+    np.testing.assert_allclose(df['total [W]'], [2e6 * norm, 5e6 * norm])
+    np.testing.assert_allclose(df['std. dev. [W]'], [0., 5e4 * norm])
+    np.testing.assert_allclose(df['W/cm3'], [2e6 * norm / 10., 5e6 * norm / 5.])
+
+
+def test_component_heating_uses_the_cell_volumes():
+    cells = {'magnet': SimpleNamespace(id=12, volume=10.), 'shield': SimpleNamespace(id=11, volume=5.)}
+
+    df = results.component_heating(_heating_statepoint(), cells, tally=5)
+
+    np.testing.assert_allclose(df['W/cm3'], df['total [W]'] / [10., 5.])
+
+
+def test_component_heating_requires_the_volumes():
+    cells = {'magnet': SimpleNamespace(id=12, volume=None), 'shield': SimpleNamespace(id=11, volume=5.)}
+
+    with pytest.raises(ValueError, match='magnet'):
+        results.component_heating(_heating_statepoint(), cells, tally=5)
+
+
+class _SummedTally:
+    """Tally summed over its cell or surface bins, with one bin per score"""
+
+    def __init__(self, tally_id, mean, std_dev):
+        self.id = tally_id
+        self._mean = dict(mean)
+        self._std_dev = dict(std_dev)
+
+    def summation(self, filter_type=None, remove_filter=False):
+        return self
+
+    def get_slice(self, scores=()):
+        return SimpleNamespace(mean=np.array([self._mean[score] for score in scores]),
+                               std_dev=np.array([self._std_dev[score] for score in scores]))
+
+    @property
+    def mean(self):
+        return np.array(list(self._mean.values()))
+
+    @property
+    def std_dev(self):
+        return np.array(list(self._std_dev.values()))
+
+
+def test_breeding_performance():
+    breeding = _SummedTally(6, {'H3-production': 1.1, 'heating': 2 * results.neutron_energy},
+                            {'H3-production': 0.01, 'heating': 0.1 * results.neutron_energy})
+    leakage = _SummedTally(7, {'current': 0.05}, {'current': 0.002})
+
+    performance = results.breeding_performance(_StatePoint([breeding, leakage]), tally=6, leakage=7)
+
+    assert performance['tbr'] == pytest.approx(1.1)
+    assert performance['tbr_std_dev'] == pytest.approx(0.01)
+    assert performance['energy_multiplication'] == pytest.approx(2.)
+    assert performance['energy_multiplication_std_dev'] == pytest.approx(0.1)
+    assert performance['leakage'] == pytest.approx(0.05)
+    assert performance['leakage_std_dev'] == pytest.approx(0.002)
@@ -0,0 +1,49 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import spectra
+
+
+def test_overlap_matrix_columns_sum_to_one():
+    matrix = spectra.overlap_matrix([1., 10., 100., 1000.], [1., 5., 100., 1000.]).toarray()
+
+    assert matrix.shape == (3, 3)
+    np.testing.assert_allclose(matrix.sum(axis=0), 1.)
+
+
+def test_rebin_conserves_the_total():
+    source = np.geomspace(1e-2, 2e7, 41)
+    target = [1e-2, 0.625, 1e5, 2e7]
+    flux = np.random.default_rng(1).random((2, 5, 40))
+
+    rebinned = spectra.rebin(flux, source, target)
+
+    assert rebinned.shape == (2, 5, 3)
+    np.testing.assert_allclose(rebinned.sum(axis=-1), flux.sum(axis=-1))
+
+
+def test_rebin_splits_flat_spectra():
+    # flat in energy: halves of the energy range
+    np.testing.assert_allclose(spectra.rebin([1.], [0., 2.], [0., 1., 2.], lethargy=False), [0.5, 0.5])
+    # flat in lethargy: halves of the lethargy range
+    np.testing.assert_allclose(spectra.rebin([1.], [1., 100.], [1., 10., 100.]), [0.5, 0.5])
+
+
+def test_rebin_rejects_mismatched_groups():
+    with pytest.raises(ValueError):
+        spectra.rebin(np.ones(3), [1., 2., 3.], [1., 3.])
+
+
+def test_group_structure_rejects_decreasing_boundaries():
+    with pytest.raises(ValueError):
+        spectra.group_structure([10., 1.])
+
+
+def test_fast_fraction_splits_a_group_at_the_threshold():
+    # flat in energy: 0.5 of the [0, 2e5] group lies above 1e5
+    fraction = spectra.fast_fraction([[1., 1.], [2., 0.]], [0., 2e5, 1e6], threshold=1e5, lethargy=False)
+
+    np.testing.assert_allclose(fraction, [0.75, 0.5])
@@ -0,0 +1,23 @@
+import pytest
+
+openmc = pytest.importorskip('openmc')
+
+from tokamak_radiation_environment import tallies
+
+
+def test_leakage_tally_scores_the_vacuum_boundaries():
+    sphere = openmc.Sphere(r=1000., boundary_type='vacuum')
+    plane = openmc.XPlane(x0=0., boundary_type='vacuum')
+    sector_plane = openmc.YPlane(y0=0., boundary_type='reflective')
+
+    tally = tallies.leakage_tally(-sphere & +plane & +sector_plane, tally_id=7)
+
+    surface_filter, particle_filter = tally.filters
+    assert set(surface_filter.bins) == {sphere.id, plane.id}
+    assert list(particle_filter.bins) == ['neutron']
+    assert list(tally.scores) == ['current']
+
+
+def test_leakage_tally_needs_a_vacuum_boundary():
+    with pytest.raises(ValueError):
+        tallies.leakage_tally(-openmc.Sphere(r=1000.))